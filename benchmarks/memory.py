@@ -0,0 +1,48 @@
+"""Bytes allocated per application, donation and pet.
+
+run from the repository root with: python -m benchmarks.memory [count]
+"""
+import gc
+import sys
+import tracemalloc
+from datetime import date
+from typing import Callable
+
+from src.classes import Address, Application, Donation, Form, Pet, Question
+
+
+def measure(label: str, count: int, create: Callable[[int], object]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+
+    for i in range(count):
+        create(i)
+
+    gc.collect()
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{label:<12} {(after - before) / count:>10.1f} bytes")
+
+
+def main(count: int) -> None:
+    form = Form("benchmark", [Question(f"Question number {i}?",
+                                       ["a", "b", "c", "d"], "a")
+                              for i in range(10)])
+    answers: list[str] = ["a", "b", "c", "d", "a", "b", "c", "d", "a", "b"]
+
+    address = Address("Street", "District", "1", 12345, "City", "State")
+
+    print(f"{count} objects each")
+    measure("application", count,
+            lambda i: Application(f"adopter{i}", "benchmark", form, answers))
+    measure("donation", count,
+            lambda i: Donation(f"adopter{i}", "shelter", 10.0, date(2024, 1, 1)))
+    measure("pet", count,
+            lambda i: Pet(f"pet{i}", "shelter", "dog", date(2020, 1, 1),
+                          address, "a calm dog", "labrador", "black"))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -105,6 +105,11 @@ from rich.console import Console
 import initial_info
 from src.ui.clean import clear_screen
 from src.ui.header import header
+from src.ui.suggester import suggest
+from src.ui.completer import ask_name
+from src.feedback_adapter import feedback_log
+from src.wal import write_ahead_log
+from src.pipeline import default_pipeline
 from src.ui.menus.adopter_menu import AdopterMenu
 from src.ui.menus.shelter_menu import ShelterMenu
 
@@ -179,18 +184,19 @@ def sign_up(user_type: str) -> User:
 
 def login(user_type: str) -> Adopter | Shelter | None:
     console.print()
-    username: str = questionary.text("Type your username: ").ask()
+    user_class = Adopter if user_type == "Adopter" else Shelter
+    username: str = ask_name("Type your username: ", user_class.prefixes)
 
     # EMPTY FIELD CHECK
     if not username.strip():
         raise EmptyFieldError("Username cannot be empty.")
 
-    if user_type == "Adopter":
-        if not Adopter.username_available(username):
-            return Adopter.login(username)
-    elif user_type == "Shelter":
-        if not Shelter.username_available(username):
-            return Shelter.login(username)
+    if not user_class.username_available(username):
+        return user_class.login(username)
+
+    suggestion: str | None = suggest(user_class.names, username, console)
+    if suggestion is not None:
+        return user_class.login(suggestion)
 
     console.print("User not found.\n", style="red")
     questionary.press_any_key_to_continue().ask()
@@ -198,9 +204,6 @@ def login(user_type: str) -> Adopter | Shelter | None:
 
 
 def main():
-    with open("feedback_log.txt", "w") as f:
-        f.truncate(0)
-
     user = welcome()
     if not user:
         return
@@ -214,8 +217,18 @@ def main():
 
 
 if __name__ == "__main__":
-    initial_info.create_data()
+    # one time setup, main() runs again after every logout
+    # the previous log is kept as a rotated segment instead of erased
+    feedback_log.rotate()
+
+    # the sample data is only loaded into an empty store
+    if not write_ahead_log.open():
+        initial_info.create_data()
     main()
+
+    # delayed approvals and denials still waiting when the user leaves run
+    # now, their failures were already reported
+    default_pipeline.shutdown()
 terMenu = ShelterMenu(user, console)
         shelter_menu.show_menu()
 
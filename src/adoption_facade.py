@@ -1,15 +1,26 @@
-import time
 from src.mediator import ConcreteAdoptionMediator
+from src.pipeline import Pipeline, default_pipeline
 from rich.console import Console
 
 # FACADE PATTERN
 class AdoptionFacade:
+    # seconds the approval waits in the background before it's applied
+    PROCESSING_DELAY: float = 3
 
-    def __init__(self):
+    def __init__(self, pipeline: Pipeline = default_pipeline):
         self.console = Console()
-        self.mediator = ConcreteAdoptionMediator()
+        self.pipeline = pipeline
+        self.mediator = ConcreteAdoptionMediator(pipeline)
+
+    def process_application(self, application, feedback: str | dict[str, str] = ""):
+        """approves the application and denies the other ones for the same
+        pet (see ConcreteAdoptionMediator.approve_and_deny_rest)"""
+
+        # runs in the background, after the delay; a bad template or an
+        # application that's already being reviewed fails right here
+        future = self.mediator.queue_approval(application, feedback,
+                                              delay=self.PROCESSING_DELAY)
 
-    def process_application(self, application):
         pet_name = application.pet
         adopter = application.applicant
         score = application.score
@@ -19,6 +30,5 @@ class AdoptionFacade:
         self.console.print(f"> Applicant: {adopter}")
         self.console.print(f"> Pet: {pet_name}")
         self.console.print(f"> Compatibility score: {score:.2f}\n")
-        time.sleep(3)
 
-        self.mediator.approve_application(application)
+        return future
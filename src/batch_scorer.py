@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING, Any, Iterable
+
+import numpy as np
+
+from src.exceptions import InvalidFormError
+
+if TYPE_CHECKING:
+    from src.classes import FormVersion
+
+
+# BATCH SCORING WITH NUMPY
+def encode(version: 'FormVersion', answers: Iterable[list[str]]) -> np.ndarray:
+    """(N, Q) matrix with the option index of every answer"""
+
+    rows: list[bytes] = []
+    for row in answers:
+        if len(row) != len(version):
+            raise InvalidFormError(f"{len(row)} answers for {len(version)} questions")
+
+        rows.append(bytes(question.index(answer)
+                          for question, answer in zip(version, row)))
+
+    return stack(rows, len(version))
+
+
+def stack(codes: list[bytes], questions: int) -> np.ndarray:
+    """(N, Q) matrix from the packed answers of N applications"""
+
+    return np.frombuffer(b"".join(codes), dtype=np.uint8).reshape(len(codes), questions)
+
+
+def score_matrix(version: 'FormVersion', matrix: np.ndarray) -> np.ndarray:
+    """fraction of preferred answers in each row, in a single pass"""
+
+    if not len(version):
+        raise InvalidFormError("can't score a form without questions")
+
+    preferred = np.frombuffer(version.preferred, dtype=np.uint8)
+    return (matrix == preferred).mean(axis=1)
+
+
+def distribution(scores: Iterable[float]) -> dict[str, Any]:
+    """summary of a batch of scores, with how many got each score"""
+
+    scores = np.fromiter(scores, dtype=np.float64)
+    if not len(scores):
+        return {"count": 0, "mean": 0.0, "min": 0.0, "max": 0.0, "scores": {}}
+
+    values, counts = np.unique(scores, return_counts=True)
+    return {
+        "count": int(len(scores)),
+        "mean": float(scores.mean()),
+        "min": float(values[0]),
+        "max": float(values[-1]),
+        "scores": {float(value): int(n) for value, n in zip(values, counts)}
+    }
@@ -0,0 +1,112 @@
+import logging
+import threading
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+# ONE CHANGE TO ONE MODEL
+class ChangeEvent:
+    """`field` is None when the entity was just created, and `new` then
+    holds the values it was created with.
+
+    Collections report one item at a time: a field ending in "+" or "-"
+    (e.g. "likes+") means `new` was added to or removed from it, so an
+    event doesn't grow with the collection."""
+
+    __slots__ = ("seq", "entity", "key", "field", "old", "new")
+
+    def __init__(self, seq: int, entity: str, key: str,
+                 field: str | None, old: Any, new: Any):
+        self.seq: int = seq
+        self.entity: str = entity
+        self.key: str = key
+        self.field: str | None = field
+        self.old: Any = old
+        self.new: Any = new
+
+    @property
+    def created(self) -> bool:
+        return self.field is None
+
+    def __repr__(self) -> str:
+        if self.created:
+            return f"#{self.seq} {self.entity}[{self.key}] created {self.new!r}"
+        return f"#{self.seq} {self.entity}[{self.key}].{self.field}: {self.old!r} -> {self.new!r}"
+
+
+# CHANGE DATA CAPTURE FOR THE MODELS
+class ChangeStream:
+    """Models report every creation and every change of a field here, and
+    subscribers get them as numbered events, so they can keep up with the
+    models incrementally instead of rescanning Model.data.
+
+    Events are numbered and delivered in the same order, also when models
+    change in more than one thread. A subscriber may change models
+    itself, its events are delivered after the current one. A subscriber
+    that raises is logged and skipped, the others still get the event."""
+
+    def __init__(self):
+        self.__seq: Iterator[int] = count(1)
+        self.__last: int = 0
+        self.__lock = threading.RLock()
+
+        # entity -> listeners, None are the listeners of every entity
+        self.__listeners: dict[str | None, list[Callable[[ChangeEvent], None]]] = {}
+
+        self.__queue: deque[ChangeEvent] = deque()
+        self.__delivering: bool = False
+
+    @property
+    def last(self) -> int:
+        """sequence number of the last event, 0 before any"""
+
+        return self.__last
+
+    def subscribe(self, listener: Callable[[ChangeEvent], None],
+                  entity: str | None = None) -> None:
+        """listens to the events of one entity (class name, e.g. "Pet"),
+        or of all of them"""
+
+        with self.__lock:
+            self.__listeners.setdefault(entity, []).append(listener)
+
+    def unsubscribe(self, listener: Callable[[ChangeEvent], None],
+                    entity: str | None = None) -> None:
+        with self.__lock:
+            listeners = self.__listeners.get(entity, [])
+            if listener in listeners:
+                listeners.remove(listener)
+
+    def emit(self, entity: str, key: str, field: str | None,
+             old: Any = None, new: Any = None) -> ChangeEvent:
+        with self.__lock:
+            self.__last = next(self.__seq)
+            event = ChangeEvent(self.__last, entity, key, field, old, new)
+            self.__queue.append(event)
+
+            # a listener changing a model queues its event for this loop
+            if not self.__delivering:
+                self.__deliver()
+
+        return event
+
+    def __deliver(self) -> None:
+        self.__delivering = True
+        try:
+            while self.__queue:
+                event: ChangeEvent = self.__queue.popleft()
+                for listener in (self.__listeners.get(event.entity, [])
+                                 + self.__listeners.get(None, [])):
+                    try:
+                        listener(event)
+                    except Exception:
+                        logger.exception("change listener %r failed on %r", listener, event)
+        finally:
+            self.__delivering = False
+
+
+# every model reports to the same stream
+changes: ChangeStream = ChangeStream()
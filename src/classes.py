@@ -5,15 +5,29 @@ from abc import ABC, abstractmethod
 from typing_extensions import Self
 from typing_extensions import override
 from dateutil import relativedelta
-from typing import Any, TYPE_CHECKING
-from copy import deepcopy
+from typing import Any, Callable, Iterable, Iterator, TYPE_CHECKING
+from itertools import count
+from operator import eq
+import heapq
+import weakref
 from rich.console import Console
-import time
 
 from src.prototype import Prototype
 from src.ui.name_validator import NameValidator
-from src.observer import AdopterObserver, ShelterObserver
-from src.exceptions import InvalidAddressError, InvalidPostalCodeError
+from src.observer import AdopterObserver, ShelterObserver, notification_bus
+from src.exceptions import InvalidAddressError, InvalidPostalCodeError, InvalidAnswerError
+from src.exceptions import ApplicationAlreadyExistsError
+from src.query.index import PetIndex
+from src.query.columnar import PetColumns
+from src.query.cache import ResultCache
+from src.query.percolator import Percolator
+from src.search.text_index import TextIndex
+from src.search.fuzzy import FuzzyIndex
+from src.search.trie import PrefixTrie
+from src import batch_scorer
+from src.review_queue import ReviewQueue
+from src.inbox import Inbox
+from src.changes import changes
 
 console = Console()
 
@@ -21,6 +35,8 @@ console = Console()
 
 # STATES FOR APLICATION
 class ApplicationState(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def approve(self, application: "Application"):
         pass
@@ -34,14 +50,59 @@ class ApplicationState(ABC):
         pass
 
 class Model(ABC):
+    __slots__ = ()
+
+    # FULL TEXT SEARCH OVER POSTS AND PET/SHELTER DESCRIPTIONS
+    text_index: TextIndex = TextIndex()
+
     def __init_subclass__(cls):
         cls.data: dict[str, Self] = {}
+        # typo tolerant lookup over the keys of data
+        cls.names: FuzzyIndex = FuzzyIndex()
+        # prefix lookup over the same keys, for autocompletion
+        cls.prefixes: PrefixTrie = PrefixTrie()
         return super().__init_subclass__()
 
     @classmethod
     def __contains__(cls, item: str) -> bool:
         return item in cls.data.keys()
 
+    @property
+    @abstractmethod
+    def key(self) -> str:
+        """key of the model in data"""
+        pass
+
+    def _record(self, field: str | None, old: Any = None, new: Any = None) -> None:
+        """reports a creation (field None) or a changed field to the change stream"""
+
+        changes.emit(type(self).__name__, self.key, field, old, new)
+
+    # RESTORING (see src.wal)
+    @classmethod
+    @abstractmethod
+    def _create(cls, key: str, values: dict[str, Any]) -> Self:
+        """builds the model again from the values of its creation event"""
+        pass
+
+    @abstractmethod
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        """(field, value) events that rebuild the model as it is now, the
+        first one being its creation"""
+        pass
+
+    def _apply(self, field: str, value: Any) -> None:
+        """sets a field to the new value of one of its change events;
+        applying the same event twice must change nothing"""
+
+        if not field.startswith("profile."):
+            raise ValueError(f"{type(self).__name__} has no field '{field}'")
+
+        field = field.removeprefix("profile.")
+        if field == "birth":
+            value = date.fromisoformat(value)
+        setattr(self.profile, field, value)
+
     @abstractmethod
     def formatted_list(self) -> list[str]:
         """returns all info in a formated list"""
@@ -66,7 +127,31 @@ class User(Model, ABC):
         self.__username: str = username
         self.profile: Profile = Profile(name)
         self.allowed_post_types: list[str] = ["forum", "comment"]
+        self.inbox: Inbox = Inbox()
+        self.profile.on_change = self._profile_changed
+
         self.data[username] = self
+        self.names.add(username)
+        self.prefixes.insert(username)
+        self._record(None, new={"name": name})
+
+    def _profile_changed(self, field: str, old: Any, new: Any) -> None:
+        self._record(f"profile.{field}", old, new)
+
+    @classmethod
+    def _create(cls, key: str, values: dict[str, Any]) -> Self:
+        return cls(key, values["name"])
+
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        yield None, {"name": self.profile.name}
+
+        for field, value in self.profile.values().items():
+            if field != "name" and value is not None:
+                yield f"profile.{field}", value
+
+    @property
+    def key(self) -> str:
+        return self.__username
 
     @property
     def username(self) -> str:
@@ -93,6 +178,8 @@ class UserFactory:
             raise ValueError(f"Unknown user type: {user_type}")
 
 class Profile:
+    __slots__ = ("__name", "__birth", "__address", "__description", "on_change")
+
     def __init__(self, name: str, birth: date | None = None,
                  address: Address | None = None,
                  desc: str | None = None):
@@ -101,6 +188,23 @@ class Profile:
         self.__address: Address | None = address
         self.__description: str | None = desc
 
+        # called with (field, old, new) whenever a setter changes the profile
+        self.on_change: Callable[[str, Any, Any], None] | None = None
+
+    def _changed(self, field: str, old: Any, new: Any) -> None:
+        if self.on_change:
+            self.on_change(field, old, new)
+
+    def values(self) -> dict[str, Any]:
+        """the profile's own fields, not the ones derived from them"""
+
+        return {
+            "name": self.__name,
+            "birth": self.birth,
+            "address": self.__address,
+            "description": self.__description
+        }
+
     def dictionary(self) -> dict[str, int | str | None]:
         return {
             "name": self.name,
@@ -116,7 +220,9 @@ class Profile:
     @name.setter
     def name(self, new_name: str):
         if len(new_name) > 0:
+            old: str = self.__name
             self.__name = new_name
+            self._changed("name", old, new_name)
 
     @property
     def birth(self) -> str | None:
@@ -137,7 +243,9 @@ class Profile:
     @birth.setter
     def birth(self, new_birth: date):
         if isinstance(new_birth, date) and new_birth <= date.today():
+            old: str | None = self.birth
             self.__birth = new_birth
+            self._changed("birth", old, self.birth)
 
     @property
     def address(self) -> Address | None:
@@ -151,7 +259,9 @@ class Profile:
     @address.setter
     def address(self, new_address: Address):
         if isinstance(new_address, Address):
+            old: Address | None = self.__address
             self.__address = new_address
+            self._changed("address", old, new_address)
 
     @property
     def city(self) -> str | None:
@@ -180,7 +290,9 @@ class Profile:
     @description.setter
     def description(self, new_desc: str):
         if len(new_desc) > 0:
+            old: str | None = self.__description
             self.__description = new_desc
+            self._changed("description", old, new_desc)
 
     def as_list(self) -> list[str]:
         info: list[str] = [self.__name]
@@ -219,6 +331,9 @@ class Profile:
 
 
 class Address:
+    __slots__ = ("__street", "__district", "__number", "__postal_code",
+                 "__city", "__state")
+
     def __init__(self, street: str, district: str, number: str,
                  postal_code: int, city: str, state: str):
 
@@ -244,6 +359,18 @@ class Address:
     def state(self) -> str:
         return self.__state
 
+    def values(self) -> dict[str, Any]:
+        """the constructor's arguments"""
+
+        return {
+            "street": self.__street,
+            "district": self.__district,
+            "number": self.__number,
+            "postal_code": self.__postal_code,
+            "city": self.__city,
+            "state": self.__state
+        }
+
     @override
     def __str__(self) -> str:
         return (f"{self.__street}, {self.__number}, {self.__district} - "
@@ -257,12 +384,18 @@ class Adopter(User):
         self.allowed_post_types.append("success story")
         self.__pets: list[str] = []
 
+        # the bus only keeps a weak reference, the adopter keeps the observer
+        self.observer: AdopterObserver = AdopterObserver(self)
+        notification_bus.subscribe(("adopter", username), self.observer)
+
     def formatted_list(self) -> list[str]:
         return self.profile.formatted_list()
 
 
 
 class Answer:
+    __slots__ = ("__question", "__user_option", "__is_preferred")
+
     def __init__(self, question: Question, user_option: str):
         if user_option not in question:
             raise Exception(
@@ -288,30 +421,34 @@ class Answer:
 
 
 class ApprovedState(ApplicationState):
+    __slots__ = ()
+
     def approve(self, application: "Application"):
         print("Application already approved")
     
     def deny(self, application: "Application", feedback: str = ""):
         print("This application has already been approved. It cannot be denied.")
-        time.sleep(3)
         return
     
     def name(self) -> str:
         return "approved"
 
 class DeniedState(ApplicationState):
+    __slots__ = ()
+
     def approve(self, application: "Application"):
         print("This application has already been denied. It cannot be approved.")
     
     def deny(self, application: "Application", feedback: str = ""):
         print("Application already denied")
-        time.sleep(3)
         return
     
     def name(self) -> str:
         return "denied"
 
 class InReviewState(ApplicationState):
+    __slots__ = ()
+
     def approve(self, application: "Application"):
         application.state = ApprovedState()
 
@@ -325,33 +462,173 @@ class InReviewState(ApplicationState):
 
 
 class Application(Model):
+    # SECONDARY INDEXES: pet -> {applicant: app} and applicant -> {pet: app}
+    __by_pet: dict[str, dict[str, 'Application']] = {}
+    __by_applicant: dict[str, dict[str, 'Application']] = {}
+
+    # IN REVIEW APPLICATIONS BY SCORE, per pet and per shelter
+    __review_by_pet: dict[str, ReviewQueue] = {}
+    __review_by_shelter: dict[str, ReviewQueue] = {}
+    __last_submitted: int = -1
+
+    __slots__ = ("__applicant", "__pet", "__version", "__answers", "__score",
+                 "__submitted", "__state", "__feedback", "__pending")
+
     def __init__(self, applicant: str, pet: str, pet_form: Form, answers: list[str]):
         if len(answers) != len(pet_form):
             raise Exception(f"{len(answers)} answers for {len(pet_form)} questions")
 
-        
-        if applicant in [apps.__applicant for apps in Application.get_apps_pet(pet)]:
-            raise Exception(f"{applicant} already applied to adopt {pet}")
+        version: FormVersion = pet_form.version
+        codes: bytes = bytes(question.index(answer)
+                             for question, answer in zip(version, answers))
 
-        self.__applicant: str = applicant
-        self.__pet: str = pet
-        self.__answers: list[Answer] = []
-        self.feedback: str = ""
+        self.__setup(applicant, pet, version, codes,
+                     sum(map(eq, codes, version.preferred)) / len(version))
 
-        right_answers: int = 0
-        for index, question in enumerate(pet_form):
-            answer = Answer(question, answers[index])
-            self.__answers.append(answer)
-            right_answers += 1 if answer else 0
+    def __setup(self, applicant: str, pet: str, version: FormVersion,
+                codes: bytes, score: float, submitted: int | None = None) -> None:
+        if applicant in Application.__by_pet.get(pet, {}):
+            raise ApplicationAlreadyExistsError(f"{applicant} already applied to adopt {pet}")
 
-        self.__score: float = right_answers / len(pet_form)
+        self.__applicant: str = applicant
+        self.__pet: str = pet
+        self.__feedback: str = ""
+        # "approval" or "denial" while a background job for it is queued,
+        # not part of the logged state
+        self.__pending: str | None = None
+
+        # answers are kept as one byte per question (the chosen option's
+        # index), along with the form version they answered
+        self.__version: FormVersion = version
+        self.__answers: bytes = codes
+        self.__score: float = score
+        # restored applications keep their place, new ones come after them
+        if submitted is None:
+            submitted = Application.__last_submitted + 1
+        Application.__last_submitted = max(Application.__last_submitted, submitted)
+        self.__submitted: int = submitted
 
         # INITIALIZING APPLICATION IN "InReviewState"
-        self.state: ApplicationState = InReviewState()
+        self.__state: ApplicationState | None = None
+        self.state = InReviewState()
 
         self.data[f"{pet}-{applicant}"] = self
+        Application.__by_pet.setdefault(pet, {})[applicant] = self
+        Application.__by_applicant.setdefault(applicant, {})[pet] = self
+
+        self._record(None, new={"applicant": applicant, "pet": pet,
+                                "version": version, "answers": codes,
+                                "score": score, "submitted": self.__submitted})
+
+    # BATCH SCORING
+    @classmethod
+    def submit_many(cls, pet: str, pet_form: Form,
+                    submissions: list[tuple[str, list[str]]]) -> list['Application']:
+        """files many (applicant, answers) to one pet, scoring them all in
+        one NumPy pass
+
+        the whole batch is checked before any of it is filed, so a bad
+        submission leaves nothing half applied"""
+
+        applied: dict[str, Application] = cls.__by_pet.get(pet, {})
+        seen: set[str] = set()
+        for applicant, _ in submissions:
+            if applicant in applied or applicant in seen:
+                raise ApplicationAlreadyExistsError(f"{applicant} already applied to adopt {pet}")
+            seen.add(applicant)
+
+        version: FormVersion = pet_form.version
+        matrix = batch_scorer.encode(version, [answers for _, answers in submissions])
+        scores = batch_scorer.score_matrix(version, matrix)
+
+        apps: list[Application] = []
+        for (applicant, _), codes, score in zip(submissions, matrix, scores.tolist()):
+            app: Application = cls.__new__(cls)
+            app.__setup(applicant, pet, version, codes.tobytes(), score)
+            apps.append(app)
+
+        return apps
+
+    @classmethod
+    def rescore(cls, pet: str) -> dict[str, Any]:
+        """scores the pet's applications again against its current form
+        and returns the new score distribution
+
+        only applications to the same questions and options (e.g. before
+        a preferred answer changed) are re-scored, the others answered a
+        different form and keep their score"""
+
+        version: FormVersion = Pet.data[pet].form.version
+        apps: list[Application] = [
+            app for app in cls.get_apps_pet(pet)
+            if app.__version.layout == version.layout]
+
+        if apps:
+            matrix = batch_scorer.stack([app.__answers for app in apps], len(version))
+            scores = batch_scorer.score_matrix(version, matrix)
+
+            for app, score in zip(apps, scores.tolist()):
+                # queued by score, so it's taken out while the score changes
+                queued: bool = isinstance(app.state, InReviewState)
+                if queued:
+                    app.__dequeue()
+
+                old: FormVersion = app.__version
+                app.__version = version
+                if old is not version:
+                    app._record("version", old, version)
+
+                if score != app.__score:
+                    app._record("score", app.__score, score)
+                app.__score = score
+
+                if queued:
+                    app.__enqueue()
+
+        return batch_scorer.distribution([app.score for app in cls.get_apps_pet(pet)])
+
+    @classmethod
+    def _create(cls, key: str, values: dict[str, Any]) -> 'Application':
+        app: Application = cls.__new__(cls)
+        app.__setup(values["applicant"], values["pet"], values["version"],
+                    values["answers"], values["score"], values["submitted"])
+        return app
+
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        yield None, {"applicant": self.__applicant, "pet": self.__pet,
+                     "version": self.__version,
+                     "answers": self.__answers, "score": self.__score,
+                     "submitted": self.__submitted}
+
+        if not isinstance(self.__state, InReviewState):
+            yield "state", self.__state.name()
+        if self.__feedback:
+            yield "feedback", self.__feedback
+
+    def _apply(self, field: str, value: Any) -> None:
+        if field == "state":
+            states: dict[str, type[ApplicationState]] = {
+                "in review": InReviewState, "approved": ApprovedState, "denied": DeniedState}
+            self.state = states[value]()
+        elif field == "feedback":
+            self.__feedback = value
+        elif field == "version":
+            self.__version = value
+        elif field == "score":
+            queued: bool = isinstance(self.__state, InReviewState)
+            if queued:
+                self.__dequeue()
+            self.__score = value
+            if queued:
+                self.__enqueue()
+        else:
+            Model._apply(self, field, value)
 
     # Getters
+    @property
+    def key(self) -> str:
+        return f"{self.__pet}-{self.__applicant}"
+
     @property
     def applicant(self) -> str:
         return self.__applicant
@@ -364,9 +641,96 @@ class Application(Model):
     def score(self) -> float:
         return self.__score
 
+    @property
+    def form_version(self) -> int:
+        """id of the FormVersion this application was scored against"""
+
+        return self.__version.id
+
+    @property
+    def answers(self) -> list[str]:
+        return [question.options[option] for question, option
+                in zip(self.__version, self.__answers)]
+
+    @property
+    def submitted(self) -> int:
+        """order in which the application was submitted"""
+
+        return self.__submitted
+
+    @property
+    def state(self) -> ApplicationState:
+        return self.__state
+
+    @state.setter
+    def state(self, new_state: ApplicationState) -> None:
+        old: ApplicationState | None = self.__state
+        was_in_review: bool = isinstance(old, InReviewState)
+        self.__state = new_state
+
+        if isinstance(new_state, InReviewState) and not was_in_review:
+            self.__enqueue()
+        elif was_in_review and not isinstance(new_state, InReviewState):
+            self.__dequeue()
+
+        # the first state is part of the creation
+        if old is not None:
+            self._record("state", old.name(), new_state.name())
+
+    @property
+    def feedback(self) -> str:
+        return self.__feedback
+
+    @feedback.setter
+    def feedback(self, new_feedback: str) -> None:
+        old: str = self.__feedback
+        self.__feedback = new_feedback
+        self._record("feedback", old, new_feedback)
+
     @property
     def status(self) -> str:
         return self.state.name()
+
+    @property
+    def pending(self) -> str | None:
+        """the queued action ("approval" or "denial") that will review this
+        application, None when there's none"""
+
+        return self.__pending
+
+    @pending.setter
+    def pending(self, action: str | None) -> None:
+        self.__pending = action
+
+    # REVIEW QUEUES
+    @classmethod
+    def review_queue(cls, pet: str) -> ReviewQueue:
+        """in review applications to a pet, best first"""
+
+        return cls.__review_by_pet.setdefault(pet, ReviewQueue())
+
+    @classmethod
+    def shelter_review_queue(cls, shelter: str) -> ReviewQueue:
+        """in review applications to all pets of a shelter, best first"""
+
+        return cls.__review_by_shelter.setdefault(shelter, ReviewQueue())
+
+    def __queues(self) -> list[ReviewQueue]:
+        queues: list[ReviewQueue] = [Application.review_queue(self.__pet)]
+
+        pet: Pet | None = Pet.data.get(self.__pet)
+        if pet is not None:
+            queues.append(Application.shelter_review_queue(pet.shelter))
+
+        return queues
+
+    def __enqueue(self) -> None:
+        for queue in self.__queues():
+            queue.add(self)
+
+    def __dequeue(self) -> None:
+        for queue in self.__queues():
+            queue.remove(self)
     
     # ACTIONS FOR STATE
     def approve(self) -> None:
@@ -383,12 +747,13 @@ class Application(Model):
 
     def formatted_list(self) -> list[str]:
         application_info: list[str] = [f"{self}", ""]
-        for answer in self.__answers:
-            application_info.append(f"{answer}")
+        for question, option in zip(self.__version, self.__answers):
+            application_info.append(f"{Answer(question, question.options[option])}")
             application_info.append("")
 
         application_info.append(f"Score: {self.__score * 100:.2f}%")
-        application_info.append(f"Status: {self.state.name().upper()}")
+        application_info.append(f"Status: {self.state.name().upper()}"
+                                + (f" (PENDING {self.__pending.upper()})" if self.__pending else ""))
 
         if self.state.name() == "denied" and self.feedback:
             application_info.append(f"Feedback: {self.feedback}")
@@ -398,28 +763,91 @@ class Application(Model):
     # GETTERS FOR MEDIATOR
     @classmethod
     def get_apps_pet(cls, pet: str) -> list['Application']:
-        return [app for app in cls.data.values() if app.__pet == pet]
+        return list(cls.__by_pet.get(pet, {}).values())
 
     @classmethod
     def get_apps_applicant(cls, applicant: str) -> list['Application']:
-        return [app for app in cls.data.values() if app.__applicant == applicant]
+        return list(cls.__by_applicant.get(applicant, {}).values())
     
 
 
 
 
+# LEDGER FOR DONATIONS
+class DonationLedger:
+    """keeps donor/receiver indexes and running totals for donations"""
+
+    def __init__(self):
+        self.__ids: Iterator[int] = count()
+        self.__by_donor: dict[str, list['Donation']] = {}
+        self.__by_receiver: dict[str, list['Donation']] = {}
+        self.__donated: dict[str, float] = {}
+        self.__received: dict[str, float] = {}
+
+    def next_id(self) -> int:
+        return next(self.__ids)
+
+    def record(self, donation: 'Donation') -> None:
+        self.__by_donor.setdefault(donation.donor, []).append(donation)
+        self.__by_receiver.setdefault(donation.receiver, []).append(donation)
+
+        self.__donated[donation.donor] = (self.__donated.get(donation.donor, 0.0)
+                                          + donation.ammount)
+        self.__received[donation.receiver] = (self.__received.get(donation.receiver, 0.0)
+                                              + donation.ammount)
+        return None
+
+    def by_donor(self, donor: str) -> list['Donation']:
+        return list(self.__by_donor.get(donor, []))
+
+    def by_receiver(self, receiver: str) -> list['Donation']:
+        return list(self.__by_receiver.get(receiver, []))
+
+    def by_user(self, user: str) -> list['Donation']:
+        """donations given or received by the user, in registration order"""
+
+        given: list['Donation'] = self.__by_donor.get(user, [])
+        received: list['Donation'] = self.__by_receiver.get(user, [])
+
+        if not given or not received:
+            return list(given or received)
+
+        merged: list['Donation'] = []
+        for don in heapq.merge(given, received, key=lambda d: d.id):
+            if not merged or merged[-1] is not don:
+                merged.append(don)
+
+        return merged
+
+    def total_donated(self, donor: str) -> float:
+        return self.__donated.get(donor, 0.0)
+
+    def total_received(self, receiver: str) -> float:
+        return self.__received.get(receiver, 0.0)
+
+    def count_donated(self, donor: str) -> int:
+        return len(self.__by_donor.get(donor, []))
+
+    def count_received(self, receiver: str) -> int:
+        return len(self.__by_receiver.get(receiver, []))
+
+
 class Donation(Model):
+    ledger: DonationLedger = DonationLedger()
+
+    __slots__ = ("__donor", "__receiver", "__ammount", "__donation_date", "__id")
+
     @classmethod
     def by_donor(cls, donor: str) -> list['Donation']:
-        return [don for don in cls.data.values() if don.__donor == donor]
+        return cls.ledger.by_donor(donor)
 
     @classmethod
     def by_receiver(cls, receiver: str) -> list['Donation']:
-        return [don for don in cls.data.values() if don.__receiver == receiver]
+        return cls.ledger.by_receiver(receiver)
 
     @classmethod
     def by_user(cls, user: str) -> list['Donation']:
-        return [don for don in cls.data.values() if don.__receiver == user or don.__donor == user]
+        return cls.ledger.by_user(user)
 
     def __init__(self, donor: str, receiver: str, ammount: float,
                  donation_date: date):
@@ -427,8 +855,32 @@ class Donation(Model):
         self.__receiver: str = receiver
         self.__ammount: float = ammount
         self.__donation_date: date = donation_date
+        self.__id: int = self.ledger.next_id()
+
+        self.data[str(self.__id)] = self
+        self.ledger.record(self)
+        self._record(None, new={"donor": donor, "receiver": receiver,
+                                "ammount": ammount, "date": self.date})
+
+    @classmethod
+    def _create(cls, key: str, values: dict[str, Any]) -> 'Donation':
+        donation = cls(values["donor"], values["receiver"], values["ammount"],
+                       date.fromisoformat(values["date"]))
+        if donation.key != key:
+            raise ValueError(f"donation {key} was restored as {donation.key}")
+        return donation
+
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        yield None, {"donor": self.__donor, "receiver": self.__receiver,
+                     "ammount": self.__ammount, "date": self.date}
+
+    @property
+    def key(self) -> str:
+        return str(self.__id)
 
-        self.data[str(len(self.data))] = self
+    @property
+    def id(self) -> int:
+        return self.__id
 
     @property
     def donor(self) -> str:
@@ -483,16 +935,47 @@ class Event(Model):
         self.__status: str = "planned"
 
         self.data[name] = self
+        self.names.add(name)
+        self.prefixes.insert(name)
+        self._record(None, new={"date": event_date.isoformat(),
+                                "location": location, "shelter": shelter})
+
+    @classmethod
+    def _create(cls, key: str, values: dict[str, Any]) -> 'Event':
+        return cls(key, date.fromisoformat(values["date"]),
+                   values["location"], values["shelter"])
+
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        yield None, {"date": self.__date.isoformat(),
+                     "location": self.__address, "shelter": self.__shelter}
+
+        if self.__status != "planned":
+            yield "status", self.__status
+
+    def _apply(self, field: str, value: Any) -> None:
+        if field == "status":
+            self.__status = value
+        else:
+            Model._apply(self, field, value)
+
+    @property
+    def key(self) -> str:
+        return self.__name
 
     @property
     def name(self) -> str:
         return self.__name
 
+    def __set_status(self, status: str) -> None:
+        old: str = self.__status
+        self.__status = status
+        self._record("status", old, status)
+
     def cancel(self):
-        self.__status = "cancelled"
+        self.__set_status("cancelled")
 
     def complete(self):
-        self.__status = "ended"
+        self.__set_status("ended")
 
     @override
     def __str__(self) -> str:
@@ -510,39 +993,173 @@ class Event(Model):
 
 # COMPOSITE PATTERN
 class FormComponent(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def formatted_list(self) -> list[str]:
         pass
 
 
+# IMMUTABLE SNAPSHOTS OF A FORM
+class FormVersion:
+    """Questions of a form at one point in time, with the index of each
+    preferred answer. Versions never change: editing a form makes a new
+    version, and applications keep the one they answered.
+
+    Equal question tuples get the same version, and new versions share
+    the (interned) question objects of the old ones. Versions are only
+    kept by the forms and applications that use them."""
+
+    __slots__ = ("__id", "__questions", "__preferred", "__weakref__")
+
+    __ids: Iterator[int] = count()
+    __versions: weakref.WeakValueDictionary[int, 'FormVersion'] = weakref.WeakValueDictionary()
+    __by_questions: weakref.WeakValueDictionary[tuple[Question, ...], 'FormVersion'] = \
+        weakref.WeakValueDictionary()
+
+    @classmethod
+    def of(cls, questions: tuple[Question, ...]) -> 'FormVersion':
+        version: FormVersion | None = cls.__by_questions.get(questions)
+        if version is None:
+            version = cls(questions)
+        return version
+
+    @classmethod
+    def get(cls, version_id: int) -> 'FormVersion':
+        """a version still in use, by id"""
+
+        return cls.__versions[version_id]
+
+    def __init__(self, questions: tuple[Question, ...]):
+        self.__id: int = next(FormVersion.__ids)
+        self.__questions: tuple[Question, ...] = questions
+        self.__preferred: bytes = bytes(q.index(q.preferred_answer) for q in questions)
+
+        FormVersion.__versions[self.__id] = self
+        FormVersion.__by_questions[questions] = self
+
+    @property
+    def id(self) -> int:
+        return self.__id
+
+    @property
+    def questions(self) -> tuple[Question, ...]:
+        return self.__questions
+
+    @property
+    def preferred(self) -> bytes:
+        return self.__preferred
+
+    @property
+    def layout(self) -> tuple[tuple[str, tuple[str, ...]], ...]:
+        """questions and options, without the preferred answers"""
+
+        return tuple((q.name, q.options) for q in self.__questions)
+
+    def __len__(self) -> int:
+        return len(self.__questions)
+
+    def __getitem__(self, index: int) -> Question:
+        return self.__questions[index]
+
+    def __iter__(self) -> Iterator[Question]:
+        return iter(self.__questions)
+
+
 # COMPOSITE PATTERN APLICATION IN FORM
 class Form(Model, Prototype, FormComponent):
-    def __init__(self, name: str, questions: list[Question] = []):
+    """A form points to its current FormVersion. Clones share it, so
+    cloning is O(1), and every edit moves the form to a new version."""
+
+    __slots__ = ("name", "__version", "on_change")
+
+    def __init__(self, name: str, questions: Iterable[Question] = (),
+                 register: bool = True):
         self.name = name
-        self.__questions: list[Question] = questions
-        self.data[name] = self
+        self.__version: FormVersion = FormVersion.of(tuple(questions))
+
+        # called with the (old, new) questions whenever the form is edited,
+        # registered forms report to the change stream, a pet's to the pet
+        self.on_change: Callable[[tuple[Question, ...], tuple[Question, ...]], None] | None = None
+
+        if register:
+            self.data[name] = self
+            self.on_change = self.__record_questions
+            self._record(None, new={"questions": self.__version.questions})
+
+    def __record_questions(self, old: tuple[Question, ...],
+                           new: tuple[Question, ...]) -> None:
+        self._record("questions", old, new)
+
+    def __set_version(self, version: FormVersion) -> None:
+        old: FormVersion = self.__version
+        self.__version = version
+
+        if self.on_change and version is not old:
+            self.on_change(old.questions, version.questions)
+
+    @classmethod
+    def _create(cls, key: str, values: dict[str, Any]) -> 'Form':
+        return cls(key, values["questions"])
 
-    def add_question(self, name: str, options: list[str], right: str):
-        if name in [q.name for q in self.__questions]:
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        yield None, {"questions": self.__version.questions}
+
+    def _apply(self, field: str, value: Any) -> None:
+        if field == "questions":
+            self.__set_version(FormVersion.of(tuple(value)))
+        else:
+            Model._apply(self, field, value)
+
+    @property
+    def key(self) -> str:
+        return self.name
+
+    @property
+    def version(self) -> FormVersion:
+        return self.__version
+
+    def add_question(self, name: str, options: Iterable[str], right: str):
+        if name in [q.name for q in self.__version]:
             raise ValueError(f"question '{name}' already exists")
 
-        self.__questions.append(Question(name, options, right))
+        self.__set_version(FormVersion.of(
+            self.__version.questions + (Question(name, options, right),)))
+
+    def set_preferred(self, name: str, answer: str) -> None:
+        """changes the preferred answer of a question, in a new version"""
+
+        questions: list[Question] = list(self.__version)
+        for index, question in enumerate(questions):
+            if question.name == name:
+                question.index(answer)
+                questions[index] = Question(name, question.options, answer)
+                self.__set_version(FormVersion.of(tuple(questions)))
+                return None
+
+        raise ValueError(f"question '{name}' doesn't exist")
 
     def clone(self) -> "Form":
-        return deepcopy(self)
+        form: Form = Form.__new__(Form)
+        form.name = self.name
+        form.__version = self.__version
+        form.on_change = None
+        return form
 
     def __len__(self) -> int:
-        return len(self.__questions)
+        return len(self.__version)
 
     def __getitem__(self, index: int) -> Question:
-        return self.__questions[index]
+        return self.__version[index]
 
     def __delitem__(self, index: int) -> None:
-        del self.__questions[index]
+        questions: list[Question] = list(self.__version)
+        del questions[index]
+        self.__set_version(FormVersion.of(tuple(questions)))
         return None
 
     def __iter__(self):
-        return iter(self.__questions)
+        return iter(self.__version)
 
     def __str__(self) -> str:
         return f"Adoption Application Form with {len(self)} questions"
@@ -550,7 +1167,7 @@ class Form(Model, Prototype, FormComponent):
     def formatted_list(self) -> list[str]:
         form: list[str] = ["Adoption Application Form", ""]
 
-        for q in self.__questions:
+        for q in self.__version:
             form.extend(q.formatted_list())
             form.append("")
 
@@ -558,6 +1175,8 @@ class Form(Model, Prototype, FormComponent):
     
     
 class PetProfile(Profile):
+    __slots__ = ("__breed", "__color")
+
     def __init__(self, name: str,
                  birth: date | None = None,
                  address: Address | None = None,
@@ -568,6 +1187,14 @@ class PetProfile(Profile):
         self.__breed: str | None = breed
         self.__color: str | None = color
 
+    def values(self) -> dict[str, Any]:
+        values: dict[str, Any] = Profile.values(self)
+        values.update({
+            "breed": self.__breed,
+            "color": self.__color
+        })
+        return values
+
     def dictionary(self) -> dict[str, int | str | None]:
         d = Profile.dictionary(self)
         d.update({
@@ -585,7 +1212,9 @@ class PetProfile(Profile):
     @breed.setter
     def breed(self, new_breed: str):
         if len(new_breed) > 0:
+            old: str | None = self.__breed
             self.__breed = new_breed
+            self._changed("breed", old, new_breed)
 
     @property
     def color(self) -> str | None:
@@ -596,7 +1225,9 @@ class PetProfile(Profile):
     @color.setter
     def color(self, new_color: str):
         if len(new_color) > 0:
+            old: str | None = self.__color
             self.__color = new_color
+            self._changed("color", old, new_color)
 
     @override
     def as_list(self) -> list[str]:
@@ -625,6 +1256,19 @@ class PetProfile(Profile):
 
 
 class Pet(Model):
+    index: PetIndex = PetIndex()
+    columns: PetColumns = PetColumns(index)
+    search_cache: ResultCache = ResultCache(128)
+
+    # adopters' saved searches, checked whenever a pet is indexed
+    saved_searches: Percolator = Percolator(
+        index,
+        lambda search, name: notification_bus.publish(
+            f"{name} matches your saved search {search.name}", ("adopter", search.owner)))
+
+    # options of the confirmation question, shared by every standard form
+    CONFIRMATION: tuple[str, ...] = ("Yes", "No")
+
     @classmethod
     def by_shelter(cls, shelter: str) -> list['Pet']:
         return [pet for pet in cls.data.values() if pet.__shelter == shelter]
@@ -636,20 +1280,52 @@ class Pet(Model):
                  breed: str | None = None,
                  color: str | None = None):
 
+        self.__key: str = name
         self.__shelter: str = shelter
         self.__pet_type: str = pet_type
-        self.profile: PetProfile = PetProfile(name, birth, address,
-                                              desc, breed, color)
         self.__status: str = "rescued"
-        self.__form: Form = Form("standard",
-                                 [Question(
-                                     f"Are you sure you want to adopt {name}?",
-                                     ["Yes", "No"],
-                                     "Yes")])
+        self.__profile: PetProfile | None = None
+        self.profile = PetProfile(name, birth, address, desc, breed, color)
+        self.__form: Form | None = None
         self.__applications: int = 0
-        self.tutor: Adopter | None = None
+        self.__tutor: Adopter | None = None
 
         self.data[name] = self
+        self.names.add(name)
+        self.prefixes.insert(name)
+        Pet.index.add(name, self.index_row())
+        self.__index_description()
+        self._record(None, new={"shelter": shelter, "pet_type": pet_type,
+                                "profile": self.profile.values()})
+
+    def index_row(self) -> dict[str, Any]:
+        """values kept by Pet.index for this pet"""
+
+        return {
+            "pet_type": self.__pet_type,
+            "shelter": self.__shelter,
+            "status": self.__status,
+            "birth": self.profile.birth,
+            "city": self.profile.city,
+            "state": self.profile.state,
+            "breed": self.profile.breed,
+            "color": self.profile.color
+        }
+
+    def __reindex(self, field: str = "") -> None:
+        if self.__key not in Pet.index:
+            return None
+
+        Pet.index.update(self.__key, self.index_row())
+
+        if field in ("", "description"):
+            self.__index_description()
+
+    def __index_description(self) -> None:
+        if self.profile.description:
+            self.text_index.add(("pet", self.__key), self.profile.description)
+        else:
+            self.text_index.remove(("pet", self.__key))
 
     def dictionary(self) -> dict[str, Any]:
         pet_info: dict[str, Any] = {
@@ -662,30 +1338,140 @@ class Pet(Model):
 
         return pet_info
 
+    @classmethod
+    def _create(cls, key: str, values: dict[str, Any]) -> 'Pet':
+        pet = cls(key, values["shelter"], values["pet_type"])
+        pet._apply("profile", values["profile"])
+        return pet
+
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        yield None, {"shelter": self.__shelter, "pet_type": self.__pet_type,
+                     "profile": self.profile.values()}
+
+        if self.__status != "rescued":
+            yield "status", self.__status
+        if self.__tutor is not None:
+            yield "tutor", self.__tutor.username
+        if self.__form is not None:
+            yield "form", self.__form.version.questions
+        if self.__applications:
+            yield "applications", self.__applications
+
+    def _apply(self, field: str, value: Any) -> None:
+        if field == "profile":
+            birth: str | None = value["birth"]
+            self.profile = PetProfile(value["name"],
+                                      date.fromisoformat(birth) if birth else None,
+                                      value["address"], value["description"],
+                                      value["breed"], value["color"])
+        elif field == "status":
+            self.__status = value
+            self.__reindex()
+        elif field == "tutor":
+            self.__tutor = Adopter.data.get(value) if value else None
+        elif field == "form":
+            self.form = Form("standard", value, register=False)
+        elif field == "applications":
+            self.__applications = value
+        else:
+            Model._apply(self, field, value)
+
+    @property
+    def key(self) -> str:
+        return self.__key
+
+    @property
+    def shelter(self) -> str:
+        return self.__shelter
+
+    @property
+    def applications(self) -> int:
+        """how many applications were filed to adopt this pet"""
+
+        return self.__applications
+
+    @property
+    def tutor(self) -> Adopter | None:
+        return self.__tutor
+
+    @tutor.setter
+    def tutor(self, new_tutor: Adopter | None) -> None:
+        old: Adopter | None = self.__tutor
+        self.__tutor = new_tutor
+        self._record("tutor",
+                     old.username if old else None,
+                     new_tutor.username if new_tutor else None)
+
+    @property
+    def profile(self) -> PetProfile:
+        return self.__profile
+
+    @profile.setter
+    def profile(self, new_profile: PetProfile):
+        old: PetProfile | None = self.__profile
+        if old is not None:
+            old.on_change = None
+
+        self.__profile = new_profile
+        new_profile.on_change = self.__profile_changed
+        self.__reindex()
+
+        # the first profile is part of the creation
+        if old is not None:
+            self._record("profile", old.values(), new_profile.values())
+
+    def __profile_changed(self, field: str, old: Any, new: Any) -> None:
+        self._record(f"profile.{field}", old, new)
+        self.__reindex(field)
+
     @property
     def form(self) -> Form:
+        # built on first use, most pets get the default form assigned instead
+        if self.__form is None:
+            self.__form = Form("standard",
+                               [Question(f"Are you sure you want to adopt {self.__key}?",
+                                         Pet.CONFIRMATION, "Yes")],
+                               register=False)
+            self.__form.on_change = self.__form_changed
+
         return self.__form
     
     @form.setter
     def form(self, new_form: Form):
+        old: Form | None = self.__form
+        if old is not None:
+            old.on_change = None
+
         self.__form = new_form
+        new_form.on_change = self.__form_changed
+        self._record("form",
+                     old.version.questions if old else None,
+                     new_form.version.questions)
 
+    def __form_changed(self, old: tuple[Question, ...],
+                       new: tuple[Question, ...]) -> None:
+        self._record("form", old, new)
 
-    def add_application(self) -> None:
-        self.__applications += 1
+
+    def add_application(self, count: int = 1) -> None:
+        self.__applications += count
+        self._record("applications", self.__applications - count, self.__applications)
         return None
 
     def is_adopted(self) -> bool:
         return self.__status == "adopted"
 
     def was_adopted(self) -> None:
+        old: str = self.__status
         self.__status = "adopted"
+        self.__reindex()
+        self._record("status", old, self.__status)
 
     def add_template_question(self, question: str,
-                              options: list[str],
+                              options: Iterable[str],
                               answer: str) -> None:
 
-        self.__form.add_question(question, options, answer)
+        self.form.add_question(question, options, answer)
         return None
 
     # OVERRIDE FOR POLYMORPHISM
@@ -761,6 +1547,51 @@ class Post(Model):
         self.__likes: list[str] = []
 
         self.data[title] = self
+        self.__index_text()
+        self._record(None, new={"author": author.username, "post_type": post_type,
+                                "content": content})
+
+    def __index_text(self) -> None:
+        self.text_index.add(("post", self.__title),
+                            f"{self.__title}\n{self.__content}")
+
+    @classmethod
+    def _create(cls, key: str, values: dict[str, Any]) -> 'Post':
+        author: User = Adopter.data.get(values["author"]) or Shelter.data[values["author"]]
+        return cls(author, values["post_type"], key, values["content"])
+
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        yield None, {"author": self.__author.username, "post_type": self.__post_type,
+                     "content": self.__content}
+
+        if self.__comments:
+            yield "comments", tuple(c.title for c in self.__comments)
+        if self.__likes:
+            yield "likes", tuple(self.__likes)
+
+    def _apply(self, field: str, value: Any) -> None:
+        if field == "content":
+            self.content = value
+        elif field == "comments":
+            self.__comments = [Post.data[title] for title in value]
+        elif field == "comments+":
+            # already there when the snapshot was taken after the comment
+            if all(comment.title != value for comment in self.__comments):
+                self.__comments.append(Post.data[value])
+        elif field == "likes":
+            self.__likes = list(value)
+        elif field == "likes+":
+            if value not in self.__likes:
+                self.__likes.append(value)
+        elif field == "likes-":
+            if value in self.__likes:
+                self.__likes.remove(value)
+        else:
+            Model._apply(self, field, value)
+
+    @property
+    def key(self) -> str:
+        return self.__title
 
     @property
     def author(self) -> str:
@@ -779,7 +1610,10 @@ class Post(Model):
         if len(new_content) == 0:
             raise ValueError("New content can't be empty")
 
+        old: str = self.__content
         self.__content = new_content
+        self.__index_text()
+        self._record("content", old, new_content)
 
     @property
     def comments(self) -> list['Post']:
@@ -787,6 +1621,7 @@ class Post(Model):
 
     def add_comment(self, new_comment: 'Post') -> None:
         self.__comments.append(new_comment)
+        self._record("comments+", new=new_comment.title)
 
         return None
 
@@ -804,11 +1639,13 @@ class Post(Model):
             raise ValueError("this user already liked this post")
 
         self.__likes.append(liker)
+        self._record("likes+", new=liker)
         return None
 
     def dislike(self, liker: str) -> None:
         if self.user_liked(liker):
             self.__likes.remove(liker)
+            self._record("likes-", new=liker)
             return None
 
         raise ValueError("this user did not liked this post")
@@ -849,23 +1686,50 @@ class Post(Model):
 
 # COMPOSITE PATTERN APLICATION IN QUESTION
 class Question(Prototype, FormComponent):
-    def __init__(self, name: str, options: list[str], preferred_answer: str):
+    """Questions are immutable and interned: building a question equal to
+    an existing one returns the existing object, so forms share them.
+    A question nothing refers to anymore leaves the table."""
+
+    __slots__ = ("__name", "__options", "__preferred_answer", "__weakref__")
+
+    __interned: weakref.WeakValueDictionary[tuple[str, tuple[str, ...], str], 'Question'] = \
+        weakref.WeakValueDictionary()
+
+    # answers are packed one byte per question, see FormVersion and Application
+    MAX_OPTIONS: int = 256
+
+    def __new__(cls, name: str, options: Iterable[str], preferred_answer: str):
         if len(name) < 5:
             raise ValueError("question is too short")
 
         if name[-1] != "?":
             name = name + "?"
 
-        self.__name: str = name
-        self.__options: list[str] = options
-        self.__preferred_answer: str = preferred_answer
+        key = (name, tuple(options), preferred_answer)
+        if len(key[1]) > cls.MAX_OPTIONS:
+            raise InvalidAnswerError(
+                f"a question can't have more than {cls.MAX_OPTIONS} options")
+        if preferred_answer not in key[1]:
+            raise InvalidAnswerError(
+                f"{preferred_answer} is not a valid option for this question")
+
+        question: Question | None = cls.__interned.get(key)
+
+        if question is None:
+            question = super().__new__(cls)
+            question.__name = name
+            question.__options = key[1]
+            question.__preferred_answer = preferred_answer
+            cls.__interned[key] = question
+
+        return question
 
     @property
     def name(self) -> str:
         return self.__name
 
     @property
-    def options(self) -> list[str]:
+    def options(self) -> tuple[str, ...]:
         return self.__options
 
     @property
@@ -873,7 +1737,23 @@ class Question(Prototype, FormComponent):
         return self.__preferred_answer
 
     def clone(self) -> "Question":
-        return deepcopy(self)
+        # immutable, so the flyweight itself is the copy
+        return self
+
+    def __copy__(self) -> "Question":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "Question":
+        return self
+
+    def index(self, option: str) -> int:
+        """position of the option, as stored by applications"""
+
+        if option not in self.__options:
+            raise InvalidAnswerError(
+                f"{option} is not a valid option for this question")
+
+        return self.__options.index(option)
 
     def formatted_list(self) -> list[str]:
         question_info: list[str] = [f"> {self.__name}"]
@@ -898,6 +1778,31 @@ class Shelter(User):
         self.__allowed_pet_types: list[str] = []
         self.allowed_post_types.append("educational")
 
+        self.observer: ShelterObserver = ShelterObserver(self)
+        notification_bus.subscribe(("shelter", username), self.observer)
+
+    @override
+    def _profile_changed(self, field: str, old: Any, new: Any) -> None:
+        User._profile_changed(self, field, old, new)
+        if field == "description":
+            self.text_index.add(("shelter", self.username),
+                                self.profile.description)
+
+    def _snapshot(self) -> Iterator[tuple[str | None, Any]]:
+        yield from User._snapshot(self)
+
+        if self.__allowed_pet_types:
+            yield "allowed_pet_types", tuple(self.__allowed_pet_types)
+
+    def _apply(self, field: str, value: Any) -> None:
+        if field == "allowed_pet_types":
+            self.__allowed_pet_types = list(value)
+        elif field == "allowed_pet_types+":
+            if value not in self.__allowed_pet_types:
+                self.__allowed_pet_types.append(value)
+        else:
+            User._apply(self, field, value)
+
     @property
     def allowed_pet_types(self) -> str:
         return ", ".join(self.__allowed_pet_types)
@@ -907,6 +1812,7 @@ class Shelter(User):
             raise ValueError("pet type can't be empty")
 
         self.__allowed_pet_types.append(pet_type)
+        self._record("allowed_pet_types+", new=pet_type)
         return None
 
     def is_allowed(self, pet_type: str) -> bool:
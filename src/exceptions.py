@@ -65,3 +65,10 @@ class OperationNotAllowedError(Exception):
 class DuplicatePetNameError(Exception):
     """Raised when a shelter tries to register a pet with a name that already exists."""
     pass
+
+
+# EXCEPTIONS ABOUT QUERIES
+
+class InvalidQueryError(Exception):
+    """Raised when a query spec has unknown fields or invalid conditions."""
+    pass
@@ -1,10 +1,23 @@
+import atexit
+import gzip
+import os
+import shutil
+import threading
 from abc import ABC, abstractmethod
+from typing import TextIO
 
 class FeedbackSender(ABC):
     @abstractmethod
     def send_feedback(self, adopter: str, pet: str, feedback: str):
         pass
 
+    def send_many(self, records: list[tuple[str, str, str]]):
+        """sends (adopter, pet, feedback) records, one by one unless the
+        sender can batch them"""
+
+        for adopter, pet, feedback in records:
+            self.send_feedback(adopter, pet, feedback)
+
 # Printa o feedback com a formatação desejada no terminal
 class ConsoleFeedbackAdapter(FeedbackSender):
     def send_feedback(self, adopter: str, pet: str, feedback: str):
@@ -16,3 +29,163 @@ class FileFeedbackAdapter(FeedbackSender):
     def send_feedback(self, adopter: str, pet: str, feedback: str):
         with open("feedback_log.txt", "a") as f:
             f.write(f"{adopter} - {pet}: {feedback}\n")
+
+    def send_many(self, records: list[tuple[str, str, str]]):
+        with open("feedback_log.txt", "a") as f:
+            f.write("".join(f"{adopter} - {pet}: {feedback}\n"
+                            for adopter, pet, feedback in records))
+
+
+# Envia o mesmo feedback para vários destinos
+class CompositeFeedbackSender(FeedbackSender):
+    def __init__(self, senders: list[FeedbackSender]):
+        self.senders: list[FeedbackSender] = senders
+
+    def send_feedback(self, adopter: str, pet: str, feedback: str):
+        for sender in self.senders:
+            sender.send_feedback(adopter, pet, feedback)
+
+    def send_many(self, records: list[tuple[str, str, str]]):
+        for sender in self.senders:
+            sender.send_many(records)
+
+
+# Guarda o feedback em memória e grava no arquivo em lotes, numa thread
+class BufferedFileFeedbackAdapter(FeedbackSender):
+    """Records are buffered and written by a background thread when
+    `batch_size` of them are waiting or every `interval` seconds, with one
+    write per batch on a file kept open. When the file grows past
+    `max_bytes` it's rotated to `<path>.<n>` (gzipped if `compress`).
+    Everything left is flushed on close(), which runs at exit."""
+
+    def __init__(self, path: str = "feedback_log.txt", batch_size: int = 64,
+                 interval: float = 1.0, max_bytes: int = 1_000_000,
+                 compress: bool = False):
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.interval: float = interval
+        self.max_bytes: int = max_bytes
+        self.compress: bool = compress
+
+        self.__buffer: list[str] = []
+        self.__lock = threading.Lock()
+        self.__wake = threading.Condition(self.__lock)
+        self.__file_lock = threading.Lock()
+        self.__file: TextIO | None = None
+        self.__size: int = 0
+
+        self.__thread: threading.Thread | None = None
+        self.__closed: bool = False
+
+    def send_feedback(self, adopter: str, pet: str, feedback: str):
+        self.send_many([(adopter, pet, feedback)])
+
+    def send_many(self, records: list[tuple[str, str, str]]):
+        with self.__lock:
+            self.__buffer.extend(f"{adopter} - {pet}: {feedback}\n"
+                                 for adopter, pet, feedback in records)
+            self.__start()
+
+            if len(self.__buffer) >= self.batch_size:
+                self.__wake.notify()
+
+    def __start(self) -> None:
+        if self.__thread is None:
+            self.__closed = False
+            self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                             name="feedback-writer")
+            self.__thread.start()
+            atexit.unregister(self.close)
+            atexit.register(self.close)
+
+    def __run(self) -> None:
+        while True:
+            with self.__lock:
+                if len(self.__buffer) < self.batch_size and not self.__closed:
+                    self.__wake.wait(self.interval)
+                closed: bool = self.__closed
+
+            self.flush()
+            if closed:
+                return None
+
+    def flush(self) -> None:
+        """writes everything buffered so far"""
+
+        with self.__lock:
+            lines, self.__buffer = self.__buffer, []
+
+        if not lines:
+            return None
+
+        data: str = "".join(lines)
+        with self.__file_lock:
+            if self.__file is None:
+                self.__file = open(self.path, "a")
+                self.__size = self.__file.tell()
+
+            self.__file.write(data)
+            self.__file.flush()
+            self.__size += len(data.encode())
+
+            if self.__size >= self.max_bytes:
+                self.__rotate()
+
+        return None
+
+    def rotate(self) -> None:
+        """moves the current log to a new segment, if it has anything"""
+
+        self.flush()
+        with self.__file_lock:
+            self.__rotate()
+
+    def __rotate(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return None
+
+        segment: str = f"{self.path}.{self.__next_segment()}"
+        os.replace(self.path, segment)
+
+        if self.compress:
+            with open(segment, "rb") as source, gzip.open(f"{segment}.gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(segment)
+
+        return None
+
+    def __next_segment(self) -> int:
+        prefix: str = os.path.basename(self.path) + "."
+        numbers: list[int] = [0]
+
+        for name in os.listdir(os.path.dirname(self.path) or "."):
+            number: str = name[len(prefix):].split(".")[0]
+            if name.startswith(prefix) and number.isdigit():
+                numbers.append(int(number))
+
+        return max(numbers) + 1
+
+    def close(self) -> None:
+        """stops the writer thread after a last flush"""
+
+        with self.__lock:
+            self.__closed = True
+            self.__wake.notify()
+            thread, self.__thread = self.__thread, None
+
+        if thread is not None:
+            thread.join()
+
+        self.flush()
+        with self.__file_lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+
+# shared by every mediator, so there's only one writer for the log
+feedback_log: BufferedFileFeedbackAdapter = BufferedFileFeedbackAdapter()
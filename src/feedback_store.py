@@ -0,0 +1,173 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable
+
+from src.feedback_adapter import FeedbackSender
+
+
+# APPEND ONLY FEEDBACK HISTORY
+class FeedbackStore(FeedbackSender):
+    """Every feedback is appended as one JSON line to `path`, and its byte
+    offset is appended to `<path>.idx` with the adopter and the pet. The
+    index is loaded once into adopter -> offsets and pet -> offsets, so a
+    history lookup only reads the lines it returns.
+
+    Feedback is never removed. If the index is behind the data file (e.g.
+    the program stopped between both writes), the missing tail is indexed
+    again when the store is opened, after dropping an index line cut short
+    by a crash."""
+
+    def __init__(self, path: str = "feedback_history.jsonl",
+                 clock: Callable[[], datetime] = datetime.now):
+        self.path: str = path
+        self.index_path: str = f"{path}.idx"
+        self.clock: Callable[[], datetime] = clock
+
+        self.__lock = threading.Lock()
+        self.__loaded: bool = False
+        self.__end: int = 0
+        self.__by_adopter: dict[str, list[int]] = {}
+        self.__by_pet: dict[str, list[int]] = {}
+
+    # WRITES
+    def send_feedback(self, adopter: str, pet: str, feedback: str):
+        self.send_many([(adopter, pet, feedback)])
+
+    def send_many(self, records: list[tuple[str, str, str]]):
+        with self.__lock:
+            self.__load()
+
+            entries: list[tuple[str, str, int]] = []
+            at: str = self.clock().isoformat(timespec="seconds")
+
+            # data first, so the index never points past the end of it
+            with open(self.path, "ab") as data:
+                lines: list[bytes] = []
+                offset: int = data.tell()
+                if offset != self.__end:
+                    # a line cut short by a crash is ended before writing
+                    lines.append(b"\n")
+                    offset += 1
+
+                for adopter, pet, feedback in records:
+                    line = json.dumps({"adopter": adopter, "pet": pet,
+                                       "feedback": feedback, "at": at}) + "\n"
+                    lines.append(line.encode())
+                    entries.append((adopter, pet, offset))
+                    offset += len(lines[-1])
+
+                data.write(b"".join(lines))
+
+            self.__append_index(entries)
+
+            self.__end = offset
+            for adopter, pet, start in entries:
+                self.__remember(adopter, pet, start)
+
+    def __append_index(self, entries: list[tuple[str, str, int]]) -> None:
+        with open(self.index_path, "a") as index:
+            index.write("".join(json.dumps(entry) + "\n" for entry in entries))
+
+    def __remember(self, adopter: str, pet: str, offset: int) -> None:
+        self.__by_adopter.setdefault(adopter, []).append(offset)
+        self.__by_pet.setdefault(pet, []).append(offset)
+
+    # LOADING
+    def __load(self) -> None:
+        if self.__loaded:
+            return None
+
+        last: int | None = None
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb+") as index:
+                while line := index.readline():
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("line cut short")
+                        adopter, pet, offset = json.loads(line)
+                    except ValueError:
+                        # a line cut short by a crash: new lines can't be
+                        # appended to it, and the tail gets reindexed
+                        index.truncate(index.tell() - len(line))
+                        break
+                    self.__remember(adopter, pet, offset)
+                    last = offset
+
+        self.__end = self.__end_of(last)
+        self.__reindex_tail()
+        self.__loaded = True
+        return None
+
+    def __end_of(self, offset: int | None) -> int:
+        """offset right after the data line starting at offset (indexed
+        lines are always complete), 0 when there's none"""
+
+        if offset is None or not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, "rb") as data:
+            data.seek(offset)
+            return offset + len(data.readline())
+
+    def __reindex_tail(self) -> None:
+        if not os.path.exists(self.path):
+            self.__end = 0
+            return None
+
+        missing: list[tuple[str, str, int]] = []
+        with open(self.path, "rb") as data:
+            data.seek(self.__end)
+
+            while True:
+                offset: int = data.tell()
+                line: bytes = data.readline()
+                if not line.endswith(b"\n"):
+                    break
+
+                try:
+                    record: dict[str, Any] = json.loads(line)
+                except ValueError:
+                    continue
+                missing.append((record["adopter"], record["pet"], offset))
+
+            self.__end = offset
+
+        if missing:
+            self.__append_index(missing)
+            for adopter, pet, offset in missing:
+                self.__remember(adopter, pet, offset)
+
+        return None
+
+    # LOOKUPS
+    def __read(self, offsets: list[int]) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        if not offsets:
+            return records
+
+        with open(self.path, "rb") as data:
+            for offset in offsets:
+                data.seek(offset)
+                records.append(json.loads(data.readline()))
+
+        return records
+
+    def by_adopter(self, adopter: str) -> list[dict[str, Any]]:
+        """every feedback the adopter got, oldest first"""
+
+        with self.__lock:
+            self.__load()
+            return self.__read(list(self.__by_adopter.get(adopter, [])))
+
+    def by_pet(self, pet: str) -> list[dict[str, Any]]:
+        """every feedback given about the pet, oldest first"""
+
+        with self.__lock:
+            self.__load()
+            return self.__read(list(self.__by_pet.get(pet, [])))
+
+
+# history shared by every mediator, kept across restarts
+feedback_history: FeedbackStore = FeedbackStore()
@@ -0,0 +1,50 @@
+from collections import deque
+from datetime import datetime
+from typing import Callable
+
+
+# PER USER NOTIFICATION INBOX
+class Inbox:
+    """Keeps the last `capacity` messages of a user in a ring buffer, so
+    older ones are dropped instead of growing forever. Messages are
+    numbered as they arrive, which makes the unread count a subtraction
+    instead of a scan.
+
+    Notifications are published from the UI thread (background jobs run
+    there too, see Pipeline), so delivering and reading need no lock."""
+
+    def __init__(self, capacity: int = 100,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.clock: Callable[[], datetime] = clock
+
+        self.__messages: deque[tuple[int, str, str]] = deque(maxlen=capacity)
+        self.__received: int = 0
+        self.__read: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__messages)
+
+    @property
+    def unread(self) -> int:
+        # unread messages pushed out of the buffer don't count anymore
+        return min(self.__received - self.__read, len(self.__messages))
+
+    def deliver(self, message: str) -> None:
+        self.__received += 1
+        at: str = self.clock().isoformat(sep=" ", timespec="minutes")
+        self.__messages.append((self.__received, at, message))
+
+    def drain(self, limit: int = 10) -> list[tuple[str, str]]:
+        """up to limit unread (time, message) pairs, oldest first, which
+        are then marked as read"""
+
+        unread: int = self.unread
+        start: int = len(self.__messages) - unread
+
+        page: list[tuple[int, str, str]] = [
+            self.__messages[i] for i in range(start, start + min(limit, unread))]
+
+        if page:
+            self.__read = page[-1][0]
+
+        return [(at, message) for _, at, message in page]
@@ -1,10 +1,16 @@
+from concurrent.futures import Future
+from string import Template
+from typing import Any, Callable
+
 from src.classes import Pet, Adopter, Shelter, Application
 from src.ui.name_validator import NameValidator
 import questionary
-import time
 
-from src.observer import AdopterObserver, ShelterObserver, ApplicationNotifier
-from src.feedback_adapter import ConsoleFeedbackAdapter, FileFeedbackAdapter
+from src.observer import AdopterObserver, notification_bus
+from src.feedback_adapter import ConsoleFeedbackAdapter, feedback_log
+from src.feedback_adapter import CompositeFeedbackSender
+from src.feedback_store import feedback_history
+from src.pipeline import Pipeline, default_pipeline
 
 class AdoptionMediator:
     def create_application(self, applicant: str, pet: str, answers: list[str]) -> Application:
@@ -18,40 +24,49 @@ class AdoptionMediator:
 
 
 class ConcreteAdoptionMediator(AdoptionMediator, AdopterObserver):
-    def __init__(self):
+    # seconds a denial waits in the background before its feedback is sent
+    FEEDBACK_DELAY: float = 5
+
+    def __init__(self, pipeline: Pipeline = default_pipeline):
+        self.pipeline = pipeline
         self.pets = Pet.data
         self.adopters = Adopter.data
         self.shelters = Shelter.data
         self.applications = Application.data
-        self.notifier = ApplicationNotifier()
+        self.notifier = notification_bus
 
         #ADAPTER PATTERN
-        # Registra o feedback em um arquivo .txt
-        self.feedback_sender = FileFeedbackAdapter()
+        # Registra o feedback em um arquivo .txt, em lotes, e no histórico
+        self.feedback_sender = CompositeFeedbackSender([feedback_log, feedback_history])
 
     def create_application(self, applicant: str, pet: str, answers: list[str]):
+        return self.create_applications(pet, [(applicant, answers)])[0]
+
+    def create_applications(self, pet: str,
+                            submissions: list[tuple[str, list[str]]]) -> list[Application]:
+        """files many (applicant, answers) to one pet, scored in one batch
+        (see Application.submit_many)"""
+
         pet_obj = self.pets.get(pet)
-        adopter = self.adopters.get(applicant)
-        
-        if not pet_obj or not adopter:
+        adopters = [self.adopters.get(applicant) for applicant, _ in submissions]
+
+        if not pet_obj or not all(adopters):
             raise ValueError("Pet or adopter not found!")
-        
-        # CREATING THE APPLICATION
-        app = Application(applicant, pet, pet_obj.form, answers)
+
+        # CREATING THE APPLICATIONS
+        apps: list[Application] = Application.submit_many(pet, pet_obj.form, submissions)
 
         # UPDATING PET
-        pet_obj.add_application()
+        pet_obj.add_application(len(apps))
 
         # NOTIFYING SHELTER
-        adopter_obs = AdopterObserver(adopter, pet_obj, app.status)
-        shelter_obs = ShelterObserver(pet_obj.shelter, pet_obj)
+        for app, adopter in zip(apps, adopters):
+            self.notifier.publish(f"New application to {pet_obj.profile.name}. User: {adopter.profile.name}",
+                                  ("shelter", pet_obj.shelter), ("pet", pet))
+            self.notifier.publish(f"Your application to adopt {pet_obj.profile.name} is in review.",
+                                  ("adopter", app.applicant), ("application", app.key))
 
-        self.notifier.attach(adopter_obs)
-        self.notifier.attach(shelter_obs)
-        self.notifier.notify(f"New application to {pet_obj.profile.name}. User: {adopter.profile.name}")
-        
-        
-        return app
+        return apps
     
     def approve_application(self, application: Application):
         pet_obj = self.pets.get(application.pet)
@@ -60,20 +75,114 @@ class ConcreteAdoptionMediator(AdoptionMediator, AdopterObserver):
         if not pet_obj or not adopter:
             raise ValueError("Pet or adopter not found")
         
+        # the state only prints when it can't approve
         application.approve()
+        if application.status != "approved":
+            raise ValueError(f"{application} can't be approved, it's {application.status}")
+
         pet_obj.tutor = adopter
         pet_obj.was_adopted()
 
-        self.notifier.notify(f"Your application to adopt {pet_obj.profile.name} was Approved! Congratulations!")
-        
-        print(f"{adopter.profile.name}'s application to adopt {pet_obj.profile.name} APPROVED!\n")
-        print("\nThis means all other applications must be denied. Let's give the other applicants some feedback!\n")
+        self.notifier.publish(f"Your application to adopt {pet_obj.profile.name} was Approved! Congratulations!",
+                              ("adopter", application.applicant),
+                              ("application", f"{application.pet}-{application.applicant}"))
+        self.notifier.publish(f"{adopter.profile.name}'s application to adopt {pet_obj.profile.name} was approved.",
+                              ("shelter", pet_obj.shelter), ("pet", application.pet))
+
+    def approve_and_deny_rest(self, application: Application,
+                              feedback: str | dict[str, str] = "") -> list[Application]:
+        """approves one application and denies every other application in
+        review for the same pet, writing all the feedback at once
+
+        feedback is either a template for everyone ($adopter and $pet are
+        replaced) or a map of applicant -> feedback"""
+
+        self.check_feedback(feedback)
+
+        # applications with a denial of their own queued are left to it
+        rest: list[Application] = [app for app in Application.review_queue(application.pet)
+                                   if app is not application and not app.pending]
+
+        self.approve_application(application)
+
+        records: list[tuple[str, str, str]] = []
+        for app in rest:
+            if isinstance(feedback, dict):
+                text: str = feedback.get(app.applicant, "")
+            else:
+                text = Template(feedback).safe_substitute(adopter=app.applicant, pet=app.pet)
 
+            app.deny(text)
+            records.append((app.applicant, app.pet, text))
+
+        # ONE WRITE AND ONE BURST OF NOTIFICATIONS FOR THE WHOLE BATCH
+        self.feedback_sender.send_many(records)
+        for applicant, pet, _ in records:
+            self.notifier.publish(f"Your application to adopt {pet} was denied.",
+                                  ("adopter", applicant), ("application", f"{pet}-{applicant}"))
+
+        return rest
+
+
+    @staticmethod
+    def check_feedback(feedback: str | dict[str, str]) -> None:
+        """raises ValueError unless feedback is a template or a map of
+        applicant -> feedback (e.g. None from a cancelled prompt)"""
+
+        if isinstance(feedback, str):
+            return None
+
+        if isinstance(feedback, dict) and all(
+                isinstance(applicant, str) and isinstance(text, str)
+                for applicant, text in feedback.items()):
+            return None
+
+        raise ValueError(f"invalid feedback for the denied applications: {feedback!r}")
+
+    # QUEUED REVIEWS
+    def queue_approval(self, application: Application,
+                       feedback: str | dict[str, str] = "", delay: float = 0.0) -> Future:
+        """approve_and_deny_rest in the background, after the delay
+
+        until it runs, the application and the ones it will deny are
+        pending, so they can't be approved or denied again"""
+
+        self.check_feedback(feedback)
+
+        queue: list[Application] = list(Application.review_queue(application.pet))
+        if any(app.pending == "approval" for app in queue):
+            raise ValueError(f"an application to adopt {application.pet} is already being approved")
+
+        rest: list[Application] = [app for app in queue
+                                   if app is not application and not app.pending]
+
+        return self.__schedule([(application, "approval")] + [(app, "denial") for app in rest],
+                               self.approve_and_deny_rest, application, feedback, delay=delay)
 
     def deny_application(self, application: Application, feedback: str = "") -> None:
-        application.deny(feedback)
+        self.__schedule([(application, "denial")], self.__deny, application, feedback,
+                        delay=self.FEEDBACK_DELAY)
+        print("Processing Feedback in the background...")
+
+    def __schedule(self, pending: list[tuple[Application, str]],
+                   job: Callable[..., Any], *args: Any, delay: float) -> Future:
+        for app, _ in pending:
+            if app.pending:
+                raise ValueError(f"{app} is already pending {app.pending}")
+            if app.status != "in review":
+                raise ValueError(f"{app} was already {app.status}")
 
+        for app, action in pending:
+            app.pending = action
+
+        def run() -> Any:
+            for app, _ in pending:
+                app.pending = None
+            return job(*args)
+
+        return self.pipeline.submit(run, delay=delay)
+
+    def __deny(self, application: Application, feedback: str) -> None:
+        application.deny(feedback)
         self.feedback_sender.send_feedback(application.applicant, application.pet, feedback)
-        print("Processing Feedback. Please wait a few seconds...")
-        time.sleep(5)
         
@@ -1,43 +1,77 @@
+import weakref
 from abc import ABC, abstractmethod
 
 class Observer(ABC):
 
     @abstractmethod
-    def update(self):
+    def update(self, message: str):
         pass
 
 
-class ApplicationNotifier:
+# TOPIC ROUTED NOTIFICATIONS
+class NotificationBus:
+    """Observers subscribe to topics like ("adopter", username) or
+    ("pet", name), and a message only reaches the subscribers of the
+    topics it's published to. Observers are held by weak reference, so a
+    subscription ends when whoever owns the observer lets it go."""
+
     def __init__(self):
-        self._observers: list[Observer] = []
+        self.__topics: dict[tuple[str, str], weakref.WeakSet[Observer]] = {}
+
+    def subscribe(self, topic: tuple[str, str], observer: Observer):
+        self.__topics.setdefault(topic, weakref.WeakSet()).add(observer)
+
+    def unsubscribe(self, topic: tuple[str, str], observer: Observer):
+        subscribers = self.__topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(observer)
+            if not subscribers:
+                del self.__topics[topic]
+
+    def subscribers(self, topic: tuple[str, str]) -> int:
+        return len(self.__topics.get(topic, ()))
 
-    def attach(self, observer: Observer):
-        self._observers.append(observer)
+    def publish(self, message: str, *topics: tuple[str, str]) -> int:
+        """sends the message once to every subscriber of any of the topics,
+        returns how many got it"""
 
-    def detach(self, observer: Observer):
-        self._observers.remove(observer)
+        reached: set[int] = set()
 
-    def notify(self, message: str):
-        for observer in self._observers:
-            observer.update(message)
+        for topic in topics:
+            subscribers = self.__topics.get(topic)
+            if subscribers is None:
+                continue
+
+            if not subscribers:
+                # every observer of the topic is gone
+                del self.__topics[topic]
+                continue
+
+            for observer in list(subscribers):
+                if id(observer) not in reached:
+                    reached.add(id(observer))
+                    observer.update(message)
+
+        return len(reached)
 
 
 class AdopterObserver(Observer):
-    def __init__(self, adopter, pet, status: str):
+    def __init__(self, adopter):
         self.adopter = adopter
-        self.pet = pet
-        self.status = status
 
     #NOTIFYING THE APPLICANT ABOUT THE ADOPTION PROCCESS
     def update(self, message: str):
-        print(f"The status of your application to adopt {self.pet.name} has changed to {self.status}")
+        self.adopter.inbox.deliver(message)
 
 
 class ShelterObserver(Observer):
-    def __init__(self, shelter, pet):
+    def __init__(self, shelter):
         self.shelter = shelter
-        self.pet = pet
 
     # NOTIFYING THE SHELTER ABOUT NEW APPLICATIONS
     def update(self, message: str):
-        print(f"New application to adopt {self.pet.name}")
+        self.shelter.inbox.deliver(message)
+
+
+# shared by the mediators and the users
+notification_bus: NotificationBus = NotificationBus()
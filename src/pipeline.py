@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def log_failure(future: Future) -> None:
+    error: BaseException | None = future.exception()
+    if error is not None:
+        logger.error("background job failed: %s", error, exc_info=error)
+
+
+# DEFERRED PROCESSING FOR ADOPTION ACTIONS
+class Pipeline:
+    """Defers jobs, which run in the order they were submitted.
+
+    A job can ask for a delay, meaning it won't run before `delay` seconds
+    (by the pipeline's clock) after it was submitted. Jobs submitted
+    together wait together, so 50 delayed denials cost one delay. Nobody
+    sleeps through a delay: jobs run when the thread that owns the models
+    (the UI loop) calls run_due(), so a job never changes the models while
+    that thread is reading them. join() runs everything left, sleeping
+    until each job is due, and shutdown() runs it right away. The sleep and clock functions are injectable,
+    e.g. `sleep=lambda s: None` makes every delay take no time.
+
+    `report` is called with the future of every finished job, failures
+    are logged by default."""
+
+    def __init__(self, sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic,
+                 report: Callable[[Future], None] = log_failure):
+        self.sleep: Callable[[float], None] = sleep
+        self.clock: Callable[[], float] = clock
+        self.report: Callable[[Future], None] = report
+
+        self.__lock = threading.Lock()
+        self.__queue: deque[tuple[float, Callable[..., Any], tuple, Future]] = deque()
+
+    def __len__(self) -> int:
+        return len(self.__queue)
+
+    def submit(self, job: Callable[..., Any], *args: Any, delay: float = 0.0) -> Future:
+        future: Future = Future()
+        future.add_done_callback(self.report)
+
+        with self.__lock:
+            self.__queue.append((self.clock() + delay, job, args, future))
+        return future
+
+    def __next(self, due_only: bool) -> tuple[float, Callable[..., Any], tuple, Future] | None:
+        with self.__lock:
+            if not self.__queue:
+                return None
+            if due_only and self.__queue[0][0] > self.clock():
+                # the jobs after it keep their order, so they wait too
+                return None
+            return self.__queue.popleft()
+
+    @staticmethod
+    def __run(job: Callable[..., Any], args: tuple, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return None
+
+        try:
+            result: Any = job(*args)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+        return None
+
+    def run_due(self) -> int:
+        """runs the jobs whose delay is over, returns how many ran"""
+
+        ran: int = 0
+        while (entry := self.__next(due_only=True)) is not None:
+            _, job, args, future = entry
+            self.__run(job, args, future)
+            ran += 1
+
+        return ran
+
+    def join(self) -> None:
+        """runs every job submitted so far, waiting for their delays, and
+        raises the first error"""
+
+        futures: list[Future] = []
+        while (entry := self.__next(due_only=False)) is not None:
+            due, job, args, future = entry
+
+            remaining: float = due - self.clock()
+            if remaining > 0:
+                self.sleep(remaining)
+
+            self.__run(job, args, future)
+            futures.append(future)
+
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        """runs every job left right away, without waiting for their delays;
+        failures are only reported"""
+
+        while (entry := self.__next(due_only=False)) is not None:
+            _, job, args, future = entry
+            self.__run(job, args, future)
+
+
+# shared by the facade and the mediator, so their jobs keep their order
+default_pipeline: Pipeline = Pipeline()
@@ -2,6 +2,8 @@ from abc import abstractmethod, ABC
 from copy import deepcopy
 
 class Prototype(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def clone(self):
         pass
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from typing import Hashable
+
+
+# LRU CACHE FOR QUERY RESULTS
+class ResultCache:
+    """Keeps the results of the last searches. Every entry remembers the
+    version it was computed against and is dropped when read with another
+    version, so any change to the registry invalidates it."""
+
+    def __init__(self, capacity: int = 128):
+        if capacity <= 0:
+            raise ValueError("cache capacity must be positive")
+
+        self.__capacity: int = capacity
+        self.__entries: OrderedDict[Hashable, tuple[Hashable, list[str]]] = OrderedDict()
+
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__invalidations: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: Hashable, version: Hashable) -> list[str] | None:
+        entry = self.__entries.get(key)
+
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        if entry[0] != version:
+            del self.__entries[key]
+            self.__invalidations += 1
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return list(entry[1])
+
+    def put(self, key: Hashable, version: Hashable, result: list[str]) -> None:
+        self.__entries[key] = (version, list(result))
+        self.__entries.move_to_end(key)
+
+        if len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+        return None
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        return None
+
+    def stats(self) -> dict[str, int | float]:
+        lookups: int = self.__hits + self.__misses
+
+        return {
+            "capacity": self.__capacity,
+            "size": len(self.__entries),
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "invalidations": self.__invalidations,
+            "hit_rate": self.__hits / lookups if lookups else 0.0
+        }
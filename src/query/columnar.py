@@ -0,0 +1,225 @@
+from calendar import isleap
+from datetime import date
+from math import ceil, floor
+from typing import Any
+
+import numpy as np
+
+from src.query.index import PetIndex
+from src.query.plan import Predicate, QueryPlan, RangePredicate
+
+
+# COLUMNAR SNAPSHOT OF THE PET INDEX
+class PetColumns:
+    """Keeps one NumPy array per indexed pet attribute, using the same row
+    numbers as PetIndex. Categorical columns are dictionary-encoded (code -1
+    means no value) and births are a datetime64 column (NaT means no birth).
+    The arrays are updated in place as the index changes."""
+
+    CATEGORIES: list[str] = ["pet_type", "shelter", "status",
+                             "city", "state", "breed", "color"]
+
+    def __init__(self, index: PetIndex):
+        self.__size: int = 0
+        self.__names: list[str | None] = []
+        self.__alive: np.ndarray = np.zeros(0, dtype=bool)
+        self.__births: np.ndarray = np.zeros(0, dtype="datetime64[D]")
+        self.__codes: dict[str, np.ndarray] = {
+            key: np.zeros(0, dtype=np.int32) for key in self.CATEGORIES}
+
+        # DICTIONARIES: value -> code and code -> value
+        self.__encoding: dict[str, dict[str, int]] = {key: {} for key in self.CATEGORIES}
+        self.__decoding: dict[str, list[str]] = {key: [] for key in self.CATEGORIES}
+
+        for row, name, values in index.rows():
+            self.apply(row, name, None, values)
+
+        index.subscribe(self.apply)
+
+    def __len__(self) -> int:
+        return int(self.__alive[:self.__size].sum())
+
+    def __grow(self, rows: int) -> None:
+        capacity: int = max(16, 2 * len(self.__alive), rows)
+
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.__size] = self.__alive[:self.__size]
+        self.__alive = alive
+
+        births = np.full(capacity, np.datetime64("NaT"), dtype="datetime64[D]")
+        births[:self.__size] = self.__births[:self.__size]
+        self.__births = births
+
+        for key, column in self.__codes.items():
+            codes = np.full(capacity, -1, dtype=np.int32)
+            codes[:self.__size] = column[:self.__size]
+            self.__codes[key] = codes
+
+    def __encode(self, key: str, value: Any) -> int:
+        if value is None:
+            return -1
+
+        encoding = self.__encoding[key]
+        value = str(value)
+        if value not in encoding:
+            encoding[value] = len(encoding)
+            self.__decoding[key].append(value)
+
+        return encoding[value]
+
+    def apply(self, row: int, name: str, old: dict[str, Any] | None,
+              values: dict[str, Any] | None) -> None:
+        """writes one index change into the columns"""
+
+        if row >= len(self.__alive):
+            self.__grow(row + 1)
+
+        while len(self.__names) <= row:
+            self.__names.append(None)
+
+        self.__size = max(self.__size, row + 1)
+
+        if values is None:
+            self.__alive[row] = False
+            self.__names[row] = None
+            return None
+
+        self.__alive[row] = True
+        self.__names[row] = name
+        for key in self.CATEGORIES:
+            self.__codes[key][row] = self.__encode(key, values.get(key))
+
+        birth: str | None = values.get("birth")
+        self.__births[row] = np.datetime64(birth) if birth else np.datetime64("NaT")
+        return None
+
+    # VECTORIZED AGE
+    def ages(self, today: date | None = None) -> np.ndarray:
+        """age in full years of every row, -1 where there's no birth"""
+
+        today = today or date.today()
+        births = self.__births[:self.__size]
+        missing = np.isnat(births)
+
+        months = births.astype("datetime64[M]")
+        years = births.astype("datetime64[Y]").astype(np.int64) + 1970
+        month = months.astype(np.int64) % 12 + 1
+        day = (births - months).astype(np.int64) + 1
+
+        # like relativedelta, a 29/02 birthday is on 28/02 in common years
+        if not isleap(today.year):
+            day[(month == 2) & (day == 29)] = 28
+
+        # one year less if the birthday didn't happen yet this year
+        before = (month > today.month) | ((month == today.month) & (day > today.day))
+        ages = today.year - years - before.astype(np.int64)
+
+        ages[missing] = -1
+        return ages
+
+    # PREDICATES
+    def __category_mask(self, key: str, wanted: list[str], null: bool) -> np.ndarray:
+        column = self.__codes[key][:self.__size]
+        codes = [self.__encoding[key][value] for value in wanted
+                 if value in self.__encoding[key]]
+
+        mask = np.isin(column, codes)
+        if null:
+            mask |= column == -1
+
+        return mask
+
+    def __mask(self, predicate: Predicate | RangePredicate) -> np.ndarray:
+        key: str = predicate.key
+
+        if key == "age":
+            # ages become birth bounds, so no age is computed per row
+            births = self.__births[:self.__size]
+            today = date.today()
+
+            if isinstance(predicate, RangePredicate):
+                mask = ~np.isnat(births)
+                if predicate.high is not None:
+                    oldest = PetIndex.birth_range(floor(predicate.high), today)[0]
+                    mask &= births > np.datetime64(oldest)
+                if predicate.low is not None:
+                    youngest = PetIndex.birth_range(ceil(predicate.low), today)[1]
+                    mask &= births <= np.datetime64(youngest)
+            else:
+                mask = np.zeros(self.__size, dtype=bool)
+                for value in predicate.values:
+                    oldest, youngest = PetIndex.birth_range(int(value), today)
+                    mask |= (births > np.datetime64(oldest)) & (births <= np.datetime64(youngest))
+
+            if predicate.null:
+                mask |= np.isnat(births)
+            return mask
+
+        if key == "birth" and isinstance(predicate, Predicate):
+            births = self.__births[:self.__size]
+            mask = np.isin(births, np.array(sorted(predicate.values), dtype="datetime64[D]"))
+            if predicate.null:
+                mask |= np.isnat(births)
+            return mask
+
+        if key not in self.__codes:
+            return np.full(self.__size, predicate.null)
+
+        if isinstance(predicate, RangePredicate):
+            wanted: list[str] = []
+            for value in self.__decoding[key]:
+                try:
+                    number = float(value)
+                except ValueError:
+                    continue
+                if ((predicate.low is None or number >= predicate.low)
+                        and (predicate.high is None or number <= predicate.high)):
+                    wanted.append(value)
+
+            return self.__category_mask(key, wanted, predicate.null)
+
+        return self.__category_mask(key, list(predicate.values), predicate.null)
+
+    # SORT KEYS
+    def __sort_key(self, key: str, descending: bool) -> np.ndarray:
+        """integer key where the smallest comes first and missing values last"""
+
+        if key in ("age", "birth"):
+            days = self.__births[:self.__size].astype(np.int64)
+            missing = np.isnat(self.__births[:self.__size])
+            # the youngest pets have the latest births
+            if (key == "age") != descending:
+                days = -days
+            days[missing] = np.iinfo(np.int64).max
+            return days
+
+        if key not in self.__codes:
+            return np.zeros(self.__size, dtype=np.int64)
+
+        values = self.__decoding[key]
+        rank = np.empty(len(values) + 1, dtype=np.int64)
+        rank[np.argsort(np.array(values, dtype=str), kind="stable")] = np.arange(len(values))
+        if descending:
+            rank[:len(values)] = len(values) - 1 - rank[:len(values)]
+        rank[len(values)] = len(values)
+
+        # code -1 picks the last slot, which is kept for missing values
+        return rank[self.__codes[key][:self.__size]]
+
+    def execute(self, plan: QueryPlan) -> list[str]:
+        """runs a compiled plan with NumPy instead of bitmaps"""
+
+        mask = self.__alive[:self.__size].copy()
+
+        for predicate in plan.predicates:
+            mask &= self.__mask(predicate)
+
+        rows = np.flatnonzero(mask)
+
+        if plan.sort:
+            keys = [self.__sort_key(key, descending)[rows]
+                    for key, descending in reversed(plan.sort)]
+            rows = rows[np.lexsort(keys)]
+
+        end: int | None = None if plan.limit is None else plan.offset + plan.limit
+        return [self.__names[row] for row in rows[plan.offset:end].tolist()]
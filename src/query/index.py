@@ -0,0 +1,404 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from math import ceil, floor
+from typing import Any, Callable, Iterable, Iterator
+
+from dateutil import relativedelta
+
+
+def bits_to_rows(bits: int) -> Iterator[int]:
+    """yields the position of every set bit, lowest first"""
+
+    digits: str = bin(bits)[:1:-1]
+    row: int = digits.find("1")
+
+    while row != -1:
+        yield row
+        row = digits.find("1", row + 1)
+
+
+def rows_to_bits(rows: list[int]) -> int:
+    """builds the bitmap of many rows at once, in a single pass"""
+
+    buffer = bytearray((max(rows) >> 3) + 1)
+    for row in rows:
+        buffer[row >> 3] |= 1 << (row & 7)
+
+    return int.from_bytes(buffer, "little")
+
+
+def bucket(value: Any) -> str | None:
+    """values are indexed by their string form, None is its own bucket"""
+
+    return None if value is None else str(value)
+
+
+# INVERTED INDEX WITH BITMAPS
+class InvertedIndex:
+    """Every item gets a row number and every (key, value) pair keeps a
+    bitmap (a python int) with the rows that hold that value.
+
+    Setting a bit copies the whole int, so new rows wait in a pending list
+    and are merged into the bitmap in one pass the next time it's read."""
+
+    def __init__(self, keys: Iterable[str]):
+        self.__keys: list[str] = list(keys)
+        self.__rows: dict[str, int] = {}
+        self.__names: list[str | None] = []
+        self.__values: list[dict[str, Any]] = []
+        self.__postings: dict[str, dict[str | None, int]] = {
+            key: {} for key in self.__keys}
+        self.__pending: dict[str, dict[str | None, list[int]]] = {
+            key: {} for key in self.__keys}
+        self.__removed: int = 0
+
+        # FACETS: rows per value and the distinct values kept sorted
+        self.__counts: dict[str, dict[str | None, int]] = {
+            key: {} for key in self.__keys}
+        self.__sorted: dict[str, list[str]] = {key: [] for key in self.__keys}
+
+        # called with (row, name, old, new) after every change, see subscribe
+        self.__listeners: list[Callable[[int, str, dict[str, Any] | None,
+                                         dict[str, Any] | None], None]] = []
+
+        # bumped on every change, so cached results can tell they're stale
+        self.__version: int = 0
+
+    @classmethod
+    def from_items(cls, items: list[dict[str, Any]]) -> 'InvertedIndex':
+        keys: dict[str, None] = {}
+        for item in items:
+            keys.update({key: None for key in item if key != "name"})
+
+        index = cls(keys)
+        for item in items:
+            index.add(item["name"], item)
+
+        return index
+
+    # keys whose values are whole numbers, e.g. ages
+    WHOLE_KEYS: frozenset[str] = frozenset()
+
+    @property
+    def keys(self) -> list[str]:
+        return self.__keys
+
+    @property
+    def query_keys(self) -> list[str]:
+        """keys a query can filter and sort by"""
+
+        return self.__keys
+
+    @property
+    def version(self) -> int:
+        return self.__version
+
+    @property
+    def all(self) -> int:
+        """bitmap with every indexed row"""
+
+        return ((1 << len(self.__names)) - 1) ^ self.__removed
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__rows
+
+    def subscribe(self, listener: Callable[[int, str, dict[str, Any] | None,
+                                            dict[str, Any] | None], None]) -> None:
+        """`listener(row, name, old, new)` is called after every change with
+        the item's values before and after it: old is None for a new item,
+        new is None for a removed one"""
+
+        self.__listeners.append(listener)
+        return None
+
+    def rows(self) -> Iterator[tuple[int, str, dict[str, Any]]]:
+        """(row, name, values) of every indexed item"""
+
+        for name, row in self.__rows.items():
+            yield row, name, self.__values[row]
+
+    def __publish(self, row: int, name: str, old: dict[str, Any] | None,
+                  new: dict[str, Any] | None) -> None:
+        self.__version += 1
+        for listener in self.__listeners:
+            listener(row, name, old, new)
+
+    # UPDATES
+    def add(self, name: str, values: dict[str, Any]) -> None:
+        if name in self.__rows:
+            return self.update(name, values)
+
+        row: int = len(self.__names)
+        self.__rows[name] = row
+        self.__names.append(name)
+        self.__values.append({})
+
+        self.__write(row, values)
+        self.__publish(row, name, None, self.__values[row])
+        return None
+
+    def update(self, name: str, values: dict[str, Any]) -> None:
+        row: int = self.__rows[name]
+        old: dict[str, Any] = dict(self.__values[row])
+        self.__write(row, values)
+        self.__publish(row, name, old, self.__values[row])
+        return None
+
+    def remove(self, name: str) -> None:
+        row: int = self.__rows.pop(name)
+        old: dict[str, Any] = self.__values[row]
+
+        for key, value in old.items():
+            self.__unset(key, bucket(value), row)
+
+        self.__names[row] = None
+        self.__values[row] = {}
+        self.__removed |= 1 << row
+
+        self.__publish(row, name, old, None)
+        return None
+
+    def __write(self, row: int, values: dict[str, Any]) -> None:
+        current: dict[str, Any] = self.__values[row]
+
+        for key in self.__keys:
+            new_value: Any = values.get(key)
+
+            if key in current:
+                if current[key] == new_value:
+                    continue
+                self.__unset(key, bucket(current[key]), row)
+
+            self.__set(key, bucket(new_value), row)
+            current[key] = new_value
+
+    def __set(self, key: str, value: str | None, row: int) -> None:
+        self.__pending[key].setdefault(value, []).append(row)
+
+        counts = self.__counts[key]
+        counts[value] = counts.get(value, 0) + 1
+
+        if counts[value] == 1 and value is not None:
+            insort(self.__sorted[key], value)
+
+    def __unset(self, key: str, value: str | None, row: int) -> None:
+        self.__flush(key, value)
+        postings = self.__postings[key]
+        postings[value] ^= 1 << row
+
+        counts = self.__counts[key]
+        counts[value] -= 1
+
+        if not counts[value]:
+            del postings[value]
+            del counts[value]
+
+            if value is not None:
+                values = self.__sorted[key]
+                del values[bisect_left(values, value)]
+
+    def __flush(self, key: str, value: str | None) -> None:
+        rows: list[int] | None = self.__pending[key].pop(value, None)
+
+        if rows:
+            postings = self.__postings[key]
+            postings[value] = postings.get(value, 0) | rows_to_bits(rows)
+
+    # LOOKUPS
+    def row_values(self, name: str) -> dict[str, Any]:
+        return self.__values[self.__rows[name]]
+
+    def value_of(self, key: str, values: dict[str, Any]) -> Any:
+        """value of a key for one item, given its indexed values"""
+
+        return values.get(key)
+
+    def buckets(self, key: str) -> dict[str | None, int]:
+        """value -> bitmap for one key (None is the bucket of missing values)"""
+
+        if key not in self.__postings:
+            return {}
+
+        for value in list(self.__pending[key]):
+            self.__flush(key, value)
+
+        return self.__postings[key]
+
+    def sorted_values(self, key: str) -> list[str]:
+        """distinct non-null values of a key, in order"""
+
+        return self.__sorted.get(key, [])
+
+    def facets(self) -> dict[str, list[tuple[str, int]]]:
+        """sorted (value, rows) pairs for each key with any non-null value"""
+
+        return {key: [(value, self.__counts[key][value]) for value in values]
+                for key, values in self.__sorted.items() if values}
+
+    def missing(self, key: str) -> int:
+        """rows without a value for the key"""
+
+        if key not in self.__counts:
+            return len(self)
+        return self.__counts[key].get(None, 0)
+
+    def options(self) -> dict[str, list[str]]:
+        """all non-null values for each key"""
+
+        return {key: [value for value, _ in values]
+                for key, values in self.facets().items()}
+
+    def bitmap(self, key: str, values: Iterable[str | None]) -> int:
+        """union of the rows holding any of the values (None for no value)"""
+
+        values = list(values)
+        if key not in self.__postings:
+            return self.all if None in values else 0
+
+        postings = self.buckets(key)
+        bits: int = 0
+        for value in values:
+            bits |= postings.get(value, 0)
+
+        return bits
+
+    def match(self, criteria: dict[str, list[str | None]]) -> int:
+        """intersection of the bitmaps of every criterion"""
+
+        bits: int = self.all
+        for key, values in criteria.items():
+            bits &= self.bitmap(key, values)
+            if not bits:
+                break
+
+        return bits
+
+    def range_bitmap(self, key: str, low: float | None, high: float | None) -> int:
+        """rows whose numeric value is between low and high (inclusive)"""
+
+        postings = self.buckets(key)
+        bits: int = 0
+        for value in self.sorted_values(key):
+            try:
+                number = float(value)
+            except ValueError:
+                continue
+
+            if (low is None or number >= low) and (high is None or number <= high):
+                bits |= postings[value]
+
+        return bits
+
+    def sort_field(self, key: str) -> tuple[str, bool]:
+        """(stored key, reversed) used to sort by key"""
+
+        return key, False
+
+    def names(self, bits: int) -> list[str]:
+        return [self.__names[row] for row in bits_to_rows(bits)]
+
+    def names_of(self, rows: Iterable[int]) -> list[str]:
+        return [self.__names[row] for row in rows]
+
+
+# PET INDEX: AGE IS DERIVED FROM THE INDEXED BIRTH DATE
+class PetIndex(InvertedIndex):
+    KEYS: list[str] = ["pet_type", "shelter", "status", "birth",
+                       "city", "state", "breed", "color"]
+
+    WHOLE_KEYS: frozenset[str] = frozenset(["age"])
+
+    def __init__(self):
+        InvertedIndex.__init__(self, self.KEYS)
+
+    @property
+    def query_keys(self) -> list[str]:
+        return self.KEYS + ["age"]
+
+    @staticmethod
+    def age_of(birth: str, today: date) -> int:
+        return relativedelta.relativedelta(today, date.fromisoformat(birth)).years
+
+    @staticmethod
+    def birth_range(age: int, today: date) -> tuple[str, str]:
+        """(exclusive, inclusive) iso bounds of the births with that age"""
+
+        oldest = today - relativedelta.relativedelta(years=age + 1)
+        youngest = today - relativedelta.relativedelta(years=age)
+        return oldest.isoformat(), youngest.isoformat()
+
+    def facets(self) -> dict[str, list[tuple[str, int]]]:
+        facets = InvertedIndex.facets(self)
+        births: list[tuple[str, int]] = facets.pop("birth", [])
+
+        if births:
+            today = date.today()
+            ages: dict[int, int] = {}
+            for birth, rows in births:
+                age: int = self.age_of(birth, today)
+                ages[age] = ages.get(age, 0) + rows
+
+            facets["age"] = [(str(age), ages[age]) for age in sorted(ages)]
+
+        return facets
+
+    def missing(self, key: str) -> int:
+        return InvertedIndex.missing(self, "birth" if key == "age" else key)
+
+    def value_of(self, key: str, values: dict[str, Any]) -> Any:
+        if key != "age":
+            return InvertedIndex.value_of(self, key, values)
+
+        birth: str | None = values.get("birth")
+        return None if birth is None else self.age_of(birth, date.today())
+
+    def bitmap(self, key: str, values: Iterable[str | None]) -> int:
+        if key != "age":
+            return InvertedIndex.bitmap(self, key, values)
+
+        values = list(values)
+        today = date.today()
+
+        bits: int = self.buckets("birth").get(None, 0) if None in values else 0
+        for value in values:
+            if value is not None:
+                bits |= self.__births(*self.birth_range(int(value), today))
+
+        return bits
+
+    def range_bitmap(self, key: str, low: float | None, high: float | None) -> int:
+        if key != "age":
+            return InvertedIndex.range_bitmap(self, key, low, high)
+
+        today = date.today()
+        oldest: str | None = None
+        youngest: str | None = None
+
+        if high is not None:
+            oldest = self.birth_range(floor(high), today)[0]
+        if low is not None:
+            youngest = self.birth_range(ceil(low), today)[1]
+
+        return self.__births(oldest, youngest)
+
+    def sort_field(self, key: str) -> tuple[str, bool]:
+        # the youngest pets have the latest births
+        return ("birth", True) if key == "age" else (key, False)
+
+    def __births(self, oldest: str | None, youngest: str | None) -> int:
+        """rows born after oldest (exclusive) and up to youngest (inclusive)"""
+
+        births = self.buckets("birth")
+        ordered: list[str] = self.sorted_values("birth")
+
+        start: int = 0 if oldest is None else bisect_right(ordered, oldest)
+        end: int = len(ordered) if youngest is None else bisect_right(ordered, youngest)
+
+        bits: int = 0
+        for birth in ordered[start:end]:
+            bits |= births[birth]
+
+        return bits
@@ -0,0 +1,144 @@
+from itertools import count
+from typing import Any, Callable, Iterator
+
+from src.query.index import InvertedIndex, bucket
+from src.query.plan import Predicate, QueryPlan, compile_query
+
+
+# SAVED SEARCH
+class SavedSearch:
+    def __init__(self, search_id: int, owner: str, name: str,
+                 spec: dict[str, Any], plan: QueryPlan):
+        self.id: int = search_id
+        self.owner: str = owner
+        self.name: str = name
+        self.spec: dict[str, Any] = spec
+        self.plan: QueryPlan = plan
+
+    def __str__(self) -> str:
+        return f"'{self.name}' by @{self.owner}"
+
+
+# STANDING QUERIES, MATCHED AGAINST ITEMS AS THEY CHANGE
+class Percolator:
+    """Saved searches indexed the other way around: instead of running
+    every search when an item changes, each search is filed under one
+    (key, value) it requires (the membership predicate matching the fewest
+    items when it's saved), and a changed item only checks the searches
+    filed under its new values. Searches without such a predicate (e.g.
+    only ranges) are checked for every item.
+
+    `notify(search, name)` is called when an item starts matching a
+    search. Only transitions are notified: the index hands over the old
+    and the new values of a changed item, so nothing is kept per match,
+    and a search none of whose keys changed is skipped."""
+
+    def __init__(self, index: InvertedIndex,
+                 notify: Callable[[SavedSearch, str], None]):
+        self.__index: InvertedIndex = index
+        self.__notify: Callable[[SavedSearch, str], None] = notify
+        self.__ids: Iterator[int] = count()
+
+        self.__searches: dict[int, SavedSearch] = {}
+        self.__by_value: dict[tuple[str, str], set[int]] = {}
+        self.__anchor_keys: dict[str, int] = {}
+        self.__unanchored: set[int] = set()
+        # the predicate each search was filed under, counts change later
+        self.__anchors: dict[int, Predicate] = {}
+
+        index.subscribe(self.percolate)
+
+    def __len__(self) -> int:
+        return len(self.__searches)
+
+    def __anchor(self, plan: QueryPlan) -> Predicate | None:
+        """the membership predicate matching the fewest items right now"""
+
+        anchors = [p for p in plan.predicates
+                   if isinstance(p, Predicate) and p.values and not p.null]
+        return min(anchors, key=lambda p: p.bitmap(self.__index).bit_count(), default=None)
+
+    def save(self, owner: str, spec: dict[str, Any], name: str = "") -> SavedSearch:
+        """files a criteria spec (see plan.normalize); items matching it
+        right now don't trigger notifications"""
+
+        plan: QueryPlan = compile_query(spec, self.__index)
+        search_id: int = next(self.__ids)
+        search = SavedSearch(search_id, owner, name or f"search {search_id}", spec, plan)
+        self.__searches[search_id] = search
+
+        anchor: Predicate | None = self.__anchor(plan)
+        if anchor is None:
+            self.__unanchored.add(search_id)
+        else:
+            self.__anchors[search_id] = anchor
+            self.__anchor_keys[anchor.key] = self.__anchor_keys.get(anchor.key, 0) + 1
+            for value in anchor.values:
+                self.__by_value.setdefault((anchor.key, value), set()).add(search_id)
+
+        return search
+
+    def remove(self, search_id: int) -> None:
+        self.__searches.pop(search_id)
+
+        anchor: Predicate | None = self.__anchors.pop(search_id, None)
+        if anchor is None:
+            self.__unanchored.discard(search_id)
+            return None
+
+        self.__anchor_keys[anchor.key] -= 1
+        if not self.__anchor_keys[anchor.key]:
+            del self.__anchor_keys[anchor.key]
+
+        for value in anchor.values:
+            ids = self.__by_value[(anchor.key, value)]
+            ids.discard(search_id)
+            if not ids:
+                del self.__by_value[(anchor.key, value)]
+
+        return None
+
+    def of_owner(self, owner: str) -> list[SavedSearch]:
+        return [search for search in self.__searches.values() if search.owner == owner]
+
+    def candidates(self, values: dict[str, Any]) -> set[int]:
+        """searches that could match an item with these indexed values"""
+
+        found: set[int] = set(self.__unanchored)
+        for key in self.__anchor_keys:
+            value = bucket(self.__index.value_of(key, values))
+            found.update(self.__by_value.get((key, value), ()))
+
+        return found
+
+    def __started(self, plan: QueryPlan, old: dict[str, Any] | None,
+                  new: dict[str, Any]) -> bool:
+        """whether an item matches a search with its new values but didn't
+        with the old ones; predicates on unchanged keys agree on both, so
+        only the changed ones are evaluated against the old values"""
+
+        if old is None:
+            return plan.matches(self.__index, new)
+
+        changed = [predicate for predicate in plan.predicates
+                   if self.__index.value_of(predicate.key, old)
+                   != self.__index.value_of(predicate.key, new)]
+
+        return (bool(changed)
+                and not all(predicate.matches(self.__index, old) for predicate in changed)
+                and plan.matches(self.__index, new))
+
+    def percolate(self, row: int, name: str, old: dict[str, Any] | None,
+                  new: dict[str, Any] | None) -> None:
+        """index listener: checks a new or changed item against the
+        searches it could match now"""
+
+        if new is None:
+            return None
+
+        for search_id in self.candidates(new):
+            search: SavedSearch = self.__searches[search_id]
+            if self.__started(search.plan, old, new):
+                self.__notify(search, name)
+
+        return None
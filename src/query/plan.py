@@ -0,0 +1,282 @@
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Hashable
+
+from src.exceptions import InvalidQueryError
+from src.query.index import InvertedIndex, bits_to_rows, bucket
+
+
+# PREDICATES
+class Predicate:
+    """rows whose value for key is one of values (None included if null)"""
+
+    def __init__(self, key: str, values: frozenset[str], null: bool):
+        self.key: str = key
+        self.values: frozenset[str] = values
+        self.null: bool = null
+
+    def bitmap(self, index: InvertedIndex) -> int:
+        wanted: list[str | None] = list(self.values)
+        if self.null:
+            wanted.append(None)
+
+        return index.bitmap(self.key, wanted)
+
+    def matches(self, index: InvertedIndex, values: dict[str, Any]) -> bool:
+        value = index.value_of(self.key, values)
+        if value is None:
+            return self.null
+
+        return bucket(value) in self.values
+
+    def __repr__(self) -> str:
+        return f"{self.key} in {sorted(self.values)}{' or null' if self.null else ''}"
+
+
+class RangePredicate:
+    """rows whose value for key is between low and high (both inclusive)"""
+
+    def __init__(self, key: str, low: float | None, high: float | None, null: bool):
+        self.key: str = key
+        self.low: float | None = low
+        self.high: float | None = high
+        self.null: bool = null
+
+    def bitmap(self, index: InvertedIndex) -> int:
+        bits: int = index.range_bitmap(self.key, self.low, self.high)
+        if self.null:
+            bits |= index.bitmap(self.key, [None])
+
+        return bits
+
+    def matches(self, index: InvertedIndex, values: dict[str, Any]) -> bool:
+        value = index.value_of(self.key, values)
+        if value is None:
+            return self.null
+
+        try:
+            number = float(value)
+        except ValueError:
+            return False
+
+        return ((self.low is None or number >= self.low)
+                and (self.high is None or number <= self.high))
+
+    def __repr__(self) -> str:
+        return f"{self.low} <= {self.key} <= {self.high}{' or null' if self.null else ''}"
+
+
+# COMPILED PLAN
+class QueryPlan:
+    def __init__(self, predicates: list[Predicate | RangePredicate],
+                 sort: list[tuple[str, bool]], limit: int | None, offset: int):
+        # membership predicates are plain bitmap lookups, so they go first
+        self.predicates: list[Predicate | RangePredicate] = sorted(
+            predicates, key=lambda p: isinstance(p, RangePredicate))
+        self.sort: list[tuple[str, bool]] = sort
+        self.limit: int | None = limit
+        self.offset: int = offset
+
+    def bitmap(self, index: InvertedIndex) -> int:
+        bits: int = index.all
+        for predicate in self.predicates:
+            bits &= predicate.bitmap(index)
+            if not bits:
+                break
+
+        return bits
+
+    def matches(self, index: InvertedIndex, values: dict[str, Any]) -> bool:
+        """whether a single item (its indexed values) passes every predicate"""
+
+        return all(predicate.matches(index, values) for predicate in self.predicates)
+
+    def count(self, index: InvertedIndex) -> int:
+        return self.bitmap(index).bit_count()
+
+    def execute(self, index: InvertedIndex) -> list[str]:
+        """names of the matching items, sorted and paginated"""
+
+        bits: int = self.bitmap(index)
+        end: int | None = None if self.limit is None else self.offset + self.limit
+
+        if not self.sort:
+            return index.names_of(islice(bits_to_rows(bits), self.offset, end))
+
+        names: list[str] = index.names(bits)
+        for key, descending in reversed(self.sort):
+            field, flipped = index.sort_field(key)
+            reverse: bool = descending != flipped
+
+            def sort_key(name: str, field: str = field, reverse: bool = reverse):
+                value = index.row_values(name).get(field)
+                # missing values always go last
+                return (value is not None, value) if reverse else (value is None, value)
+
+            names.sort(key=sort_key, reverse=reverse)
+
+        return names[self.offset:end]
+
+    def __repr__(self) -> str:
+        return (f"QueryPlan(where={self.predicates}, sort={self.sort}, "
+                + f"limit={self.limit}, offset={self.offset})")
+
+
+# SPEC NORMALIZATION
+def _values(key: str, raw: Any) -> tuple[frozenset[str], bool]:
+    if isinstance(raw, (list, tuple, set, frozenset)):
+        return (frozenset(bucket(v) for v in raw if v is not None),
+                any(v is None for v in raw))
+
+    if isinstance(raw, dict):
+        raise InvalidQueryError(f"nested condition for '{key}' is not allowed")
+
+    return (frozenset() if raw is None else frozenset([bucket(raw)]),
+            raw is None)
+
+
+def _number(key: str, raw: Any) -> float | None:
+    if raw is None:
+        return None
+
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        raise InvalidQueryError(f"range bound for '{key}' must be a number")
+
+
+def _count(name: str, raw: Any) -> int:
+    # bools are ints, but a limit of True is a mistake
+    if not isinstance(raw, int) or isinstance(raw, bool):
+        raise InvalidQueryError(f"{name} must be a whole number")
+    if raw < 0:
+        raise InvalidQueryError(f"{name} can't be negative")
+
+    return raw
+
+
+def _sort(raw: Any) -> list[tuple[str, bool]]:
+    if not isinstance(raw, (list, tuple)):
+        raise InvalidQueryError("sort must be a list of field names")
+
+    sort: list[tuple[str, bool]] = []
+    for key in raw:
+        if not isinstance(key, str) or not key.lstrip("-"):
+            raise InvalidQueryError(f"can't sort by {key!r}")
+        sort.append((key[1:], True) if key.startswith("-") else (key, False))
+
+    return sort
+
+
+def _check(where: list[tuple], sort: list[tuple[str, bool]], index: InvertedIndex) -> None:
+    """keys the index can't query, and values it can't read"""
+
+    keys: set[str] = set(index.query_keys)
+    for condition in where:
+        key: str = condition[1]
+        if key not in keys:
+            raise InvalidQueryError(f"'{key}' can't be searched")
+
+        if condition[0] == "in" and key in index.WHOLE_KEYS:
+            for value in condition[2]:
+                try:
+                    int(value)
+                except ValueError:
+                    raise InvalidQueryError(f"'{key}' must be a whole number, not {value!r}")
+
+    for key, _ in sort:
+        if key not in keys:
+            raise InvalidQueryError(f"can't sort by '{key}'")
+
+
+def normalize(spec: dict[str, Any], index: InvertedIndex | None = None) -> tuple[Hashable, ...]:
+    """turns a criteria spec into a hashable key, keys and values are
+    checked against the index when one is given
+
+    spec = {
+        "where": {
+            "pet_type": "dog",                          # equality
+            "breed": ["labrador", "pug"],               # set membership
+            "color": None,                              # only missing values
+            "city": {"in": ["Maceio"], "null": True},   # membership or missing
+            "age": {"min": 1, "max": 5}                 # range
+        },
+        "sort": ["age", "-breed"],
+        "limit": 10,
+        "offset": 0
+    }
+    """
+
+    if not isinstance(spec, dict):
+        raise InvalidQueryError("a query must be a dict")
+
+    unknown = set(spec) - {"where", "sort", "limit", "offset"}
+    if unknown:
+        raise InvalidQueryError(f"unknown query fields: {', '.join(sorted(map(str, unknown)))}")
+
+    conditions: Any = spec.get("where") or {}
+    if not isinstance(conditions, dict):
+        raise InvalidQueryError("where must map keys to conditions")
+    if not all(isinstance(key, str) for key in conditions):
+        raise InvalidQueryError("where keys must be strings")
+
+    where: list[tuple] = []
+    for key, condition in sorted(conditions.items()):
+        if not isinstance(condition, dict):
+            values, null = _values(key, condition)
+            where.append(("in", key, values, null))
+            continue
+
+        extra = set(condition) - {"in", "null", "min", "max"}
+        if extra:
+            raise InvalidQueryError(f"unknown condition for '{key}': {', '.join(sorted(extra))}")
+
+        null: bool = bool(condition.get("null", False))
+
+        if "in" in condition:
+            values, in_null = _values(key, condition["in"])
+            where.append(("in", key, values, null or in_null))
+
+        if "min" in condition or "max" in condition:
+            where.append(("range", key,
+                          _number(key, condition.get("min")),
+                          _number(key, condition.get("max")), null))
+
+        if set(condition) == {"null"}:
+            where.append(("in", key, frozenset(), null))
+
+    sort: list[tuple[str, bool]] = _sort(spec.get("sort") or [])
+
+    limit: int | None = spec.get("limit")
+    if limit is not None:
+        limit = _count("limit", limit)
+    offset: int = _count("offset", spec.get("offset") or 0)
+
+    if index is not None:
+        _check(where, sort, index)
+
+    return tuple(where), tuple(sort), limit, offset
+
+
+@lru_cache(maxsize=256)
+def compile_normalized(key: tuple[Hashable, ...]) -> QueryPlan:
+    where, sort, limit, offset = key
+
+    predicates: list[Predicate | RangePredicate] = []
+    for condition in where:
+        if condition[0] == "in":
+            predicates.append(Predicate(*condition[1:]))
+        else:
+            predicates.append(RangePredicate(*condition[1:]))
+
+    return QueryPlan(predicates, list(sort), limit, offset)
+
+
+def compile_query(spec: dict[str, Any], index: InvertedIndex | None = None) -> QueryPlan:
+    """compiles a criteria spec, reusing the plan of an equal spec"""
+
+    return compile_normalized(normalize(spec, index))
+
+
+def search(index: InvertedIndex, spec: dict[str, Any]) -> list[str]:
+    return compile_query(spec, index).execute(index)
@@ -1,35 +1,42 @@
+from datetime import date
 from typing import Any
 import questionary
 
+from src.query.columnar import PetColumns
+from src.query.index import InvertedIndex
+from src.query.cache import ResultCache
+from src.query.plan import compile_normalized, normalize
+
 
 class Query:
-    def __init__(self, items: list[dict[str, Any]]):
-        self.items: list[dict[str, Any]] = items
+    def __init__(self, items: list[dict[str, Any]] | None = None,
+                 index: InvertedIndex | None = None,
+                 columns: PetColumns | None = None,
+                 cache: ResultCache | None = None):
+        self.items: list[dict[str, Any]] = items or []
+        self.index: InvertedIndex = (index if index is not None
+                                     else InvertedIndex.from_items(self.items))
+
+        # when given, plans run vectorized over the columns of the same index
+        self.columns: PetColumns | None = columns
+        self.cache: ResultCache | None = cache
 
     def get_options(self) -> dict[str, list[str]]:
         """Gets all options"""
-        options: dict[str, list[str]] = {}
-
-        for dictionary in self.items:
-            for key, value in dictionary.items():
-                if value is not None and key != "name":
-                    value_str = str(value)
-                    if key not in options:
-                        options[key] = []
-                    if value_str not in options[key]:
-                        options[key].append(value_str)
-
-        return options
+        return self.index.options()
 
     def make_form(self) -> list[dict[str, str | list]]:
-        options = self.get_options()
         criteria_dicts: list[dict[str, str | list]] = []
 
-        for key, values in options.items():
-            sorted_values = sorted(values)
-            
-            choices = [f"[Include pets without {key}]"] + sorted_values
-            
+        # FACETS COME SORTED AND COUNTED FROM THE INDEX
+        for key, values in self.index.facets().items():
+            without: str = f"[Include pets without {key}]"
+
+            choices = [{"name": f"{without} ({self.index.missing(key)})",
+                        "value": without}]
+            choices.extend({"name": f"{value} ({count})", "value": value}
+                           for value, count in values)
+
             criteria_dicts.append({
                 "type": "checkbox",
                 "name": key,
@@ -48,36 +55,48 @@ class Query:
         criteria = questionary.prompt(form)
         return criteria or {}
 
+    @staticmethod
+    def spec_from_answers(answers: dict[str, list[str]]) -> dict[str, Any]:
+        """turns the checkbox answers into a criteria spec"""
+
+        where: dict[str, list[str | None]] = {}
+        for key, selected_values in answers.items():
+            actual_values: list[str | None] = [
+                v for v in selected_values if not v.startswith("[Include")]
+
+            # only the "without" box marked still matches every item
+            if not actual_values:
+                continue
+
+            if f"[Include pets without {key}]" in selected_values:
+                actual_values.append(None)
+
+            where[key] = actual_values
+
+        return {"where": where}
+
+    def search(self, spec: dict[str, Any]) -> list[str]:
+        """non-interactive search, see src.query.plan for the spec format"""
+
+        key = normalize(spec, self.index)
+        # ages depend on the day, so results are only valid on the same day
+        version = (self.index.version, date.today())
+
+        if self.cache is not None:
+            cached = self.cache.get(key, version)
+            if cached is not None:
+                return cached
+
+        plan = compile_normalized(key)
+        if self.columns is not None:
+            results = self.columns.execute(plan)
+        else:
+            results = plan.execute(self.index)
+
+        if self.cache is not None:
+            self.cache.put(key, version, results)
+
+        return results
+
     def filter_items(self) -> list[str]:
-        user_criterias = self.get_user_criteria()
-        
-        active_criterias = {k: v for k, v in user_criterias.items() if v}
-        
-        if not active_criterias:
-            return [item['name'] for item in self.items]
-        
-        filtered_items = []
-        
-        for item in self.items:
-            matches_all = True
-            
-            for key, selected_values in active_criterias.items():
-                include_none = f"[Include pets without {key}]" in selected_values
-                
-                actual_values = [v for v in selected_values if not v.startswith("[Include")]
-                
-                item_value = item.get(key)
-                
-                if item_value is None:
-                    if not include_none:
-                        matches_all = False
-                        break
-                else:
-                    if actual_values and str(item_value) not in actual_values:
-                        matches_all = False
-                        break
-            
-            if matches_all:
-                filtered_items.append(item['name'])
-        
-        return filtered_items
+        return self.search(self.spec_from_answers(self.get_user_criteria()))
@@ -0,0 +1,53 @@
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from src.classes import Application
+
+
+# QUEUE OF APPLICATIONS WAITING FOR REVIEW
+class ReviewQueue:
+    """In review applications, best score first and then the earliest
+    submitted. Entries are kept sorted, so adding or removing one is a
+    bisect and reading a page never scans the other applications."""
+
+    def __init__(self):
+        self.__entries: list[tuple[float, int, Application]] = []
+
+    @staticmethod
+    def key(app: 'Application') -> tuple[float, int]:
+        return -app.score, app.submitted
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __iter__(self) -> Iterator['Application']:
+        return (app for _, _, app in self.__entries)
+
+    def add(self, app: 'Application') -> None:
+        # submission numbers are unique, so applications are never compared
+        insort(self.__entries, (*self.key(app), app))
+        return None
+
+    def remove(self, app: 'Application') -> None:
+        # a (score, submission) pair sorts right before its own entry
+        position: int = bisect_left(self.__entries, self.key(app))
+        if position < len(self.__entries) and self.__entries[position][2] is app:
+            del self.__entries[position]
+        return None
+
+    def top(self, k: int) -> list['Application']:
+        return [app for _, _, app in self.__entries[:k]]
+
+    def page(self, limit: int, after: 'Application | None' = None) -> list['Application']:
+        """up to limit applications ranked after the given one
+
+        the position comes from the score and submission of `after`, so
+        pages stay right even if it was reviewed in the meantime"""
+
+        start: int = 0
+        if after is not None:
+            score, submitted = self.key(after)
+            start = bisect_left(self.__entries, (score, submitted + 1))
+
+        return [app for _, _, app in self.__entries[start:start + limit]]
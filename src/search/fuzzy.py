@@ -0,0 +1,147 @@
+from collections import Counter
+from math import ceil, floor
+from typing import Iterator
+
+
+def trigrams(name: str) -> set[str]:
+    padded: str = f"  {name.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(first: set[str], second: set[str]) -> float:
+    """jaccard similarity of two trigram sets"""
+
+    shared: int = len(first & second)
+    return shared / (len(first) + len(second) - shared)
+
+
+# FUZZY INDEX FOR TYPO TOLERANT LOOKUPS
+class FuzzyIndex:
+    """Finds registered names close to a misspelled one.
+
+    Single typos (a missing, extra, swapped or wrong character) are found
+    by looking up every variant of the query one edit away, which is a few
+    hundred dict lookups no matter how many names there are. Only when none
+    of them exist, names are ranked by trigram similarity. Trigram postings
+    are split by name size and only the rarest trigrams of the query are
+    scanned, since a similar name must share at least one of them. That
+    ranking reads at most MAX_SCANNED postings and compares at most
+    MAX_COMPARED names, so its cost doesn't grow with the index, at the
+    price of missing some matches among many similar names."""
+
+    # work bounds of a ranking by trigrams: postings read, and names
+    # compared with the query
+    MAX_SCANNED: int = 20_000
+    MAX_COMPARED: int = 300
+
+    def __init__(self):
+        self.__lower: dict[str, list[str]] = {}
+        self.__alphabet: set[str] = set()
+
+        self.__names: list[str] = []
+        self.__postings: dict[int, dict[str, list[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__lower.get(name.lower(), [])
+
+    def add(self, name: str) -> None:
+        if name in self:
+            return None
+
+        self.__lower.setdefault(name.lower(), []).append(name)
+        self.__alphabet.update(name.lower())
+
+        grams: set[str] = trigrams(name)
+        by_gram = self.__postings.setdefault(len(grams), {})
+        for gram in grams:
+            by_gram.setdefault(gram, []).append(len(self.__names))
+
+        self.__names.append(name)
+        return None
+
+    def __one_edit(self, word: str) -> Iterator[str]:
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+
+        for left, right in splits:
+            if right:
+                yield left + right[1:]
+            if len(right) > 1:
+                yield left + right[1] + right[0] + right[2:]
+            for char in self.__alphabet:
+                yield left + char + right
+                if right:
+                    yield left + char + right[1:]
+
+    def __close(self, query: str) -> list[str]:
+        """names equal to the query up to case, or one edit away"""
+
+        word: str = query.lower()
+        found: dict[str, None] = {}
+
+        for variant in [word, *self.__one_edit(word)]:
+            for name in self.__lower.get(variant, []):
+                found[name] = None
+
+        return list(found)
+
+    def __similar(self, grams: set[str], threshold: float) -> list[str]:
+        size: int = len(grams)
+        found: list[str] = []
+
+        # names about as long as the query first, they are the likeliest
+        # matches when the work bounds run out
+        sizes = sorted(range(ceil(size * threshold), floor(size / threshold) + 1),
+                       key=lambda other_size: abs(other_size - size))
+        scanned: int = self.MAX_SCANNED
+        compared: int = self.MAX_COMPARED
+
+        for other_size in sizes:
+            by_gram = self.__postings.get(other_size)
+            if not by_gram:
+                continue
+
+            # jaccard >= threshold means sharing at least `needed` trigrams,
+            # so a match shows up in one of the (size - needed + 1) rarest
+            needed: int = ceil(threshold * (size + other_size) / (1 + threshold))
+            if needed > min(size, other_size):
+                continue
+
+            rarest = sorted(grams, key=lambda gram: len(by_gram.get(gram, ())))
+            candidates: Counter[int] = Counter()
+            for gram in rarest[:size - needed + 1]:
+                postings: list[int] = by_gram.get(gram, [])
+                candidates.update(postings[:scanned])
+                scanned -= min(len(postings), scanned)
+                if not scanned:
+                    break
+
+            # the ones sharing the most rare trigrams are compared first
+            for name_id, _ in candidates.most_common(compared):
+                name: str = self.__names[name_id]
+                if similarity(grams, trigrams(name)) >= threshold:
+                    found.append(name)
+            compared -= min(len(candidates), compared)
+
+            if not scanned or not compared:
+                break
+
+        return found
+
+    def search(self, query: str | None, k: int = 5,
+               threshold: float = 0.3) -> list[tuple[str, float]]:
+        """up to k (name, trigram similarity) pairs, best first; nothing
+        for a blank query"""
+
+        query = (query or "").strip()
+        if not query:
+            return []
+
+        grams: set[str] = trigrams(query)
+        names: list[str] = self.__close(query) or self.__similar(grams, threshold)
+
+        scored = [(name, similarity(grams, trigrams(name))) for name in names]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:k]
@@ -0,0 +1,95 @@
+import heapq
+import math
+import re
+from typing import Hashable, Iterable
+
+TOKEN = re.compile(r"\w+")
+
+STOP_WORDS: set[str] = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to",
+    "was", "were", "will", "with"
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN.findall(text.lower())
+            if token not in STOP_WORDS]
+
+
+# FULL TEXT INDEX WITH BM25 RANKING
+class TextIndex:
+    """Inverted index of terms. Documents are identified by a (kind, key)
+    tuple, e.g. ("post", title) or ("pet", name), and are replaced
+    whenever they are indexed again."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1: float = k1
+        self.b: float = b
+
+        self.__postings: dict[str, dict[tuple[str, Hashable], int]] = {}
+        self.__terms: dict[tuple[str, Hashable], dict[str, int]] = {}
+        self.__lengths: dict[tuple[str, Hashable], int] = {}
+        self.__total_length: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__terms)
+
+    def __contains__(self, doc: tuple[str, Hashable]) -> bool:
+        return doc in self.__terms
+
+    def add(self, doc: tuple[str, Hashable], text: str) -> None:
+        if doc in self.__terms:
+            self.remove(doc)
+
+        counts: dict[str, int] = {}
+        tokens: list[str] = tokenize(text)
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        for term, frequency in counts.items():
+            self.__postings.setdefault(term, {})[doc] = frequency
+
+        self.__terms[doc] = counts
+        self.__lengths[doc] = len(tokens)
+        self.__total_length += len(tokens)
+        return None
+
+    def remove(self, doc: tuple[str, Hashable]) -> None:
+        for term in self.__terms.pop(doc, {}):
+            postings = self.__postings[term]
+            del postings[doc]
+            if not postings:
+                del self.__postings[term]
+
+        self.__total_length -= self.__lengths.pop(doc, 0)
+        return None
+
+    def search(self, query: str, k: int = 10,
+               kinds: Iterable[str] | None = None) -> list[tuple[tuple[str, Hashable], float]]:
+        """top k (doc, score) pairs, best first"""
+
+        if not self.__terms:
+            return []
+
+        wanted: set[str] | None = set(kinds) if kinds is not None else None
+        documents: int = len(self.__terms)
+        average: float = self.__total_length / documents or 1.0
+
+        scores: dict[tuple[str, Hashable], float] = {}
+        for term in set(tokenize(query)):
+            postings = self.__postings.get(term)
+            if not postings:
+                continue
+
+            idf: float = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+
+            for doc, frequency in postings.items():
+                if wanted is not None and doc[0] not in wanted:
+                    continue
+
+                norm: float = self.k1 * (1 - self.b + self.b * self.__lengths[doc] / average)
+                scores[doc] = (scores.get(doc, 0.0)
+                               + idf * frequency * (self.k1 + 1) / (frequency + norm))
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
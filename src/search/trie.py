@@ -0,0 +1,118 @@
+from itertools import islice
+from typing import Iterator
+
+
+class _Node:
+    # a registry can hold 100k+ names, so nodes are kept as small as possible
+    __slots__ = ("label", "children", "names")
+
+    def __init__(self, label: str):
+        self.label: str = label
+        self.children: dict[str, _Node] | None = None
+        self.names: list[str] | None = None
+
+
+# PREFIX TRIE FOR AUTOCOMPLETION
+class PrefixTrie:
+    """Registered names by their lowercased characters, for completing
+    what was typed so far.
+
+    Chains of single children are merged into one edge (a radix tree), so
+    there are at most two nodes per name. Completions are walked in
+    alphabetical order and stop as soon as the limit is reached, so they
+    never touch the rest of the registry."""
+
+    def __init__(self):
+        self.__root: _Node = _Node("")
+        self.__size: int = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __contains__(self, name: str) -> bool:
+        node, exact = self.__find(name.lower())
+        return exact and name in (node.names or [])
+
+    def insert(self, name: str) -> None:
+        key: str = name.lower()
+        node: _Node = self.__root
+        start: int = 0
+
+        while start < len(key):
+            if node.children is None:
+                node.children = {}
+
+            child: _Node | None = node.children.get(key[start])
+            if child is None:
+                leaf = _Node(key[start:])
+                leaf.names = [name]
+                node.children[key[start]] = leaf
+                self.__size += 1
+                return None
+
+            label: str = child.label
+            shared: int = 0
+            while (shared < len(label) and start + shared < len(key)
+                   and label[shared] == key[start + shared]):
+                shared += 1
+
+            if shared < len(label):
+                # the key leaves the edge halfway, so it's split in two
+                middle = _Node(label[:shared])
+                child.label = label[shared:]
+                middle.children = {child.label[0]: child}
+                node.children[key[start]] = middle
+                child = middle
+
+            node = child
+            start += shared
+
+        if node.names is None:
+            node.names = []
+        if name not in node.names:
+            node.names.append(name)
+            self.__size += 1
+
+        return None
+
+    def __find(self, prefix: str) -> tuple[_Node | None, bool]:
+        """(node below which every name starts with prefix, whether the
+        prefix ends exactly at that node rather than halfway into its edge)"""
+
+        node: _Node = self.__root
+        start: int = 0
+
+        while start < len(prefix):
+            child: _Node | None = (node.children or {}).get(prefix[start])
+            if child is None:
+                return None, False
+
+            rest: str = prefix[start:]
+            if rest.startswith(child.label):
+                node = child
+                start += len(child.label)
+            elif child.label.startswith(rest):
+                return child, False
+            else:
+                return None, False
+
+        return node, True
+
+    def __walk(self, node: _Node) -> Iterator[str]:
+        stack: list[_Node] = [node]
+
+        while stack:
+            node = stack.pop()
+            if node.names:
+                yield from sorted(node.names)
+            if node.children:
+                stack.extend(node.children[char] for char in sorted(node.children, reverse=True))
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """up to limit names starting with prefix (ignoring case), in order"""
+
+        node, _ = self.__find(prefix.lower())
+        if node is None:
+            return []
+
+        return list(islice(self.__walk(node), limit))
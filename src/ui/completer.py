@@ -0,0 +1,37 @@
+from typing import Callable, Iterable
+
+import questionary
+from prompt_toolkit.completion import CompleteEvent, Completer, Completion
+from prompt_toolkit.document import Document
+
+from src.search.trie import PrefixTrie
+
+
+class TrieCompleter(Completer):
+    """completes the typed text with names from a prefix trie, only the
+    first `limit` matches are looked up and rendered"""
+
+    def __init__(self, trie: PrefixTrie, limit: int = 10,
+                 meta: Callable[[str], str] | None = None):
+        self.trie: PrefixTrie = trie
+        self.limit: int = limit
+        self.meta: Callable[[str], str] | None = meta
+
+    def get_completions(self, document: Document,
+                        complete_event: CompleteEvent) -> Iterable[Completion]:
+        typed: str = document.text_before_cursor
+
+        for name in self.trie.complete(typed, self.limit):
+            yield Completion(name, start_position=-len(typed),
+                             display_meta=self.meta(name) if self.meta else None)
+
+
+def ask_name(message: str, trie: PrefixTrie, validate=None,
+             meta: Callable[[str], str] | None = None) -> str:
+    """text prompt that suggests registered names while typing"""
+
+    return questionary.autocomplete(message,
+                                    choices=[],
+                                    completer=TrieCompleter(trie, meta=meta),
+                                    validate=validate,
+                                    qmark=">>").ask()
@@ -1,16 +1,19 @@
 from datetime import date
-from typing import Any
 import questionary
 from rich.console import Console
 from rich.panel import Panel
 
 from src.classes import Adopter, Application, Donation, Shelter, Pet, Form
 from src.query.query import Query
+from src.feedback_store import feedback_history
+from src.mediator import ConcreteAdoptionMediator
 
 from src.exceptions import InvalidDonationAmountError, ApplicationAlreadyExistsError
 
 from src.ui.lister import Lister
 from src.ui.name_validator import NameValidator
+from src.ui.suggester import suggest
+from src.ui.completer import ask_name
 
 from src.ui.menus.menu import Menu
 from src.ui.menus.social_menu import SocialMenu
@@ -21,6 +24,7 @@ class AdopterMenu(Menu):
     def __init__(self, user: Adopter, console: Console):
         Menu.__init__(self, user, console)
         self.name = "adopter menu"
+        self.mediator = ConcreteAdoptionMediator()
 
         self.actions.update({
             "Search Pets": {
@@ -39,6 +43,10 @@ class AdopterMenu(Menu):
                 "func": self.show_applications,
                 "args": []},
 
+            "View Feedback History": {
+                "func": self.show_feedback_history,
+                "args": []},
+
             "Donate to a Shelter": {
                 "func": self.donate,
                 "args": []}
@@ -49,12 +57,10 @@ class AdopterMenu(Menu):
 
     def donate(self):
         self.console.print()
-        shelters = [f"{shelter}" for shelter in Shelter.data.values()]
-
-        self.console.print()
-        name: str = questionary.select("Which shelter do you want to donate to?",
-                                       choices=shelters).ask()
-        name = name.split(" - ")[0][1:]
+        name: str = ask_name("Which shelter do you want to donate to? (type its username)",
+                             Shelter.prefixes,
+                             validate=lambda text: Shelter.__contains__(text) or "Shelter not found",
+                             meta=lambda username: Shelter.data[username].name)
 
         try:
             ammount: str = questionary.text(
@@ -75,13 +81,16 @@ class AdopterMenu(Menu):
 
     def get_pet_by_name(self):
         self.console.print()
-        name: str = questionary.text("Type the pet's name:",
-                                     validate=NameValidator,
-                                     qmark=">>").ask()
+        name: str = ask_name("Type the pet's name:", Pet.prefixes,
+                             validate=NameValidator)
 
         if Pet.__contains__(name):
             return Pet.data[name]
 
+        suggestion: str | None = suggest(Pet.names, name, self.console)
+        if suggestion is not None:
+            return Pet.data[suggestion]
+
         self.console.print("\nPet not found\n")
         questionary.press_any_key_to_continue().ask()
 
@@ -122,8 +131,8 @@ class AdopterMenu(Menu):
         answers_dict: dict[str, str] = questionary.prompt(questions_dict)
         answers_list: list[str] = list(answers_dict.values())
 
-        ap = Application(self.user.username, pet.profile.name,
-                         pet.form, answers_list)
+        ap = self.mediator.create_application(self.user.username, pet.profile.name,
+                                              answers_list)
 
         self.console.print("\nApplication submitted!")
         self.console.print(f"  > {ap}\n")
@@ -138,18 +147,33 @@ class AdopterMenu(Menu):
         Lister(f"{self.user.name}'s Adoption Applications",
                apps, self.console).detailed_list()
 
-    def filter_pets(self):
-        pets: list[dict[str, Any]] = [pet.dictionary()
-                                      for pet in Pet.data.values()]
+    def show_feedback_history(self):
+        history = feedback_history.by_adopter(self.user.username)
+
+        self.console.print()
+        if not history:
+            self.console.print("You haven't received any feedback yet.\n")
+
+        for record in history:
+            self.console.print(f"[bold]{record['pet']}[/] ({record['at']}): {record['feedback']}")
+
+        self.console.print()
+        questionary.press_any_key_to_continue().ask()
 
+    def filter_pets(self):
         self.console.print(
             "\nTo filter pets, mark the desired characteristics.\n")
 
-        filtered_names: list[str] = Query(pets).filter_items()
+        query = Query(index=Pet.index,
+                      columns=Pet.columns,
+                      cache=Pet.search_cache)
+        spec: dict = query.spec_from_answers(query.get_user_criteria())
+        filtered_names: list[str] = query.search(spec)
 
         if len(filtered_names) == 0:
             self.console.print("Your query had no results.")
             questionary.press_any_key_to_continue().ask()
+            self.save_search(spec)
             return
 
         fitlered_pets: list[Pet] = [Pet.data[name] for name in filtered_names]
@@ -158,8 +182,26 @@ class AdopterMenu(Menu):
             f"\nYour query provided {len(filtered_names)} results:\n")
 
         Lister("Filtered Pets", fitlered_pets, self.console).detailed_list()
+        self.save_search(spec)
         return
 
+    def save_search(self, spec: dict) -> None:
+        if not spec["where"]:
+            return None
+
+        save: bool = questionary.confirm(
+            "Save this search and get notified about new matches?").ask()
+        if not save:
+            return None
+
+        name: str = questionary.text("Name this search:",
+                                     validate=NameValidator,
+                                     qmark=">>").ask()
+        search = Pet.saved_searches.save(self.user.username, spec, name)
+        self.console.print(f"\nSearch {search.name} saved.\n")
+
+        questionary.press_any_key_to_continue().ask()
+
     def search_pet(self) -> None:
         pet: Pet | None = self.get_pet_by_name()
 
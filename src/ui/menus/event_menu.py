@@ -7,6 +7,8 @@ from src.ui.address_creator import create_address
 from src.ui.date_creator import create_date
 from src.ui.name_validator import NameValidator
 from src.ui.lister import Lister
+from src.ui.suggester import suggest
+from src.ui.completer import ask_name
 
 from src.ui.menus.menu import Menu
 
@@ -63,13 +65,16 @@ class EventMenu(Menu):
 
     def get_event_name(self) -> Event | None:
         self.console.print()
-        name: str = questionary.text("Type the event's name:",
-                                     validate=NameValidator,
-                                     qmark=">>").ask()
+        name: str = ask_name("Type the event's name:", Event.prefixes,
+                             validate=NameValidator)
 
         if Event.__contains__(name):
             return Event.data[name]
 
+        suggestion: str | None = suggest(Event.names, name, self.console)
+        if suggestion is not None:
+            return Event.data[suggestion]
+
         self.console.print("\nEvent not found.")
         questionary.press_any_key_to_continue().ask()
         return None
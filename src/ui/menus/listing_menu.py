@@ -1,9 +1,11 @@
+import questionary
 from rich.console import Console
 
-from src.classes import Event, User, Shelter, Donation, Pet
+from src.classes import Event, Model, User, Shelter, Donation, Pet
 
 from src.ui.menus.menu import Menu
 from src.ui.lister import Lister
+from src.ui.name_validator import NameValidator
 
 
 class ListingMenu(Menu):
@@ -32,6 +34,10 @@ class ListingMenu(Menu):
             "Show My Donations":
                 {"func": self.show_my_donations,
                  "args": []},
+
+            "Search Descriptions":
+                {"func": self.search_descriptions,
+                 "args": []},
         }
 
     def show_shelters(self):
@@ -44,6 +50,24 @@ class ListingMenu(Menu):
         Lister("events", Event.data.values(), self.console).detailed_list()
 
     def show_my_donations(self):
-        Lister(f"{self.user.name}'s donations",
-               Donation.by_user(self.user.username),
+        username: str = self.user.username
+        donated: float = Donation.ledger.total_donated(username)
+        received: float = Donation.ledger.total_received(username)
+
+        Lister(f"{self.user.name}'s donations "
+               + f"(donated US${donated:.2f} / received US${received:.2f})",
+               Donation.by_user(username),
                self.console).simple_list()
+
+    def search_descriptions(self):
+        self.console.print()
+        query: str = questionary.text("Search pets and shelters:",
+                                      validate=NameValidator,
+                                      qmark=">>").ask()
+
+        registries = {"pet": Pet.data, "shelter": Shelter.data}
+        results = Model.text_index.search(query, 10, kinds=registries.keys())
+        found = [registries[kind][key] for (kind, key), _ in results
+                 if key in registries[kind]]
+
+        Lister(f"results for '{query}'", found, self.console).detailed_list()
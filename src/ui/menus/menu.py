@@ -7,9 +7,12 @@ from src.classes import User
 from src.ui.profile_updater import ProfileUpdater
 from src.ui.header import header
 from src.ui.clean import clear_screen
+from src.pipeline import default_pipeline
 
 
 class Menu:
+    INBOX_PAGE_SIZE: int = 10
+
     def __init__(self, user: User, console: Console):
 
         self.name = "main menu"
@@ -25,6 +28,10 @@ class Menu:
 
             "Update Profile":
                 {"func": self.profile_updater.update_profile,
+                 "args": []},
+
+            "Inbox":
+                {"func": self.show_inbox,
                  "args": []}
         }
 
@@ -41,12 +48,30 @@ class Menu:
     def go_back(self):
         self.loop = False
 
+    def show_inbox(self):
+        self.console.print()
+        if not self.user.inbox.unread:
+            self.console.print("No new notifications.\n")
+
+        while self.user.inbox.unread:
+            for at, message in self.user.inbox.drain(self.INBOX_PAGE_SIZE):
+                self.console.print(f"[dim]{at}[/]  {message}")
+
+            self.console.print()
+            if self.user.inbox.unread and not questionary.confirm(
+                    f"{self.user.inbox.unread} more. Keep reading?").ask():
+                return
+
+        questionary.press_any_key_to_continue().ask()
+
     def show_menu(self):
         self.loop = True
         while self.loop:
 
             clear_screen()
-            self.console.print(header(self.name))
+            # background jobs run here, between actions, never during one
+            default_pipeline.run_due()
+            self.console.print(header(f"{self.name} · {self.user.inbox.unread} unread"))
             self.console.print()
             option = questionary.select("Choose an option:",
                                         choices=list(self.actions.keys())).ask()
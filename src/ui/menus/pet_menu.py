@@ -17,7 +17,10 @@ from src.ui.name_validator import NameValidator
 from src.ui.lister import Lister
 from src.ui.clean import clear_screen
 from src.ui.header import header
+from src.ui.suggester import suggest
+from src.ui.completer import ask_name
 from src.exceptions import DuplicatePetNameError, PetNotFoundError
+from src.review_queue import ReviewQueue
 
 # menus
 from src.ui.menus.menu import Menu
@@ -27,6 +30,8 @@ from src.adoption_facade import AdoptionFacade
 
 
 class PetMenu(Menu):
+    PAGE_SIZE: int = 10
+
     def __init__(self, user: User, console: Console):
         Menu.__init__(self, user, console)
         self.name = "pet menu"
@@ -57,6 +62,10 @@ class PetMenu(Menu):
                 "func": self.add_question,
                 "args": []},
 
+            "Change a Preferred Answer": {
+                "func": self.change_preferred_answer,
+                "args": []},
+
             "View Pet's Adoption Applications": {
                 "func": self.view_applications,
                 "args": []}
@@ -76,9 +85,11 @@ class PetMenu(Menu):
 
     def get_pet_name(self) -> Pet | None:
         self.console.print()
-        name: str = questionary.text("Type the pet's name:",
-                                     validate=NameValidator,
-                                     qmark=">>").ask()
+        name: str = ask_name("Type the pet's name:", Pet.prefixes,
+                             validate=NameValidator)
+        if not Pet.__contains__(name):
+            name = suggest(Pet.names, name, self.console) or name
+
         # PET NOT FOUND ERROR
         if not Pet.__contains__(name):
             raise PetNotFoundError(f"Pet named '{name}' not found in the system")
@@ -171,6 +182,31 @@ class PetMenu(Menu):
         # ADD QUESTION TO THE FORM
         pet.form.add_question(new_q.name, new_q.options, new_q.preferred_answer)
 
+    def change_preferred_answer(self):
+        pet: Pet | None = self.get_pet_name()
+        if pet is None:
+            return
+
+        self.console.print()
+        name: str = questionary.select("Which question?",
+                                       choices=[q.name for q in pet.form],
+                                       qmark=">>").ask()
+
+        question: Question = next(q for q in pet.form if q.name == name)
+        answer: str = questionary.select("Which answer should be preferred?",
+                                         choices=list(question.options),
+                                         default=question.preferred_answer,
+                                         qmark="✓").ask()
+
+        pet.form.set_preferred(name, answer)
+
+        # RE-SCORE EVERY APPLICATION IN ONE PASS
+        scores = Application.rescore(pet.profile.name)
+        self.console.print(f"\n{scores['count']} applications re-scored, "
+                           + f"average score: {scores['mean'] * 100:.2f}%\n")
+
+        questionary.press_any_key_to_continue().ask()
+
     # FACADE/MEDIATOR FOR APPROVING/DENYING APPLICATIONS
 
     def deny_app(self, app: Application) -> int:
@@ -181,21 +217,53 @@ class PetMenu(Menu):
             validate=NameValidator
         ).ask()
 
-        self.facade.mediator.deny_application(app, feedback)
-        
+        try:
+            self.facade.mediator.deny_application(app, feedback)
+        except ValueError as error:
+            self.console.print(f"\n{error}\n", style="red")
+
         return 0
 
 
-    def approve_app(self, apps: list[Application], approved_app: Application) -> int:
-        
-        self.facade.process_application(approved_app)
+    def approve_app(self, approved_app: Application) -> int:
+        # every other application still in review for this pet gets denied
+        rest: list[Application] = [app for app in Application.review_queue(approved_app.pet)
+                                   if app is not approved_app and not app.pending]
+
+        feedback: str | dict[str, str] = ""
+        if rest:
+            self.console.print(f"\n{len(rest)} other applications to adopt "
+                               + f"[bold]{approved_app.pet}[/] will be denied.")
+            feedback = self.ask_feedback(rest)
+
+            # a cancelled prompt answers None
+            if feedback is None or (isinstance(feedback, dict)
+                                    and None in feedback.values()):
+                self.console.print("\nApproval cancelled.\n")
+                return 0
 
-        for app in apps:
-            if app != approved_app and app.state.name() != "denied":
-                self.deny_app(app)
+        try:
+            self.facade.process_application(approved_app, feedback)
+        except ValueError as error:
+            self.console.print(f"\n{error}\n", style="red")
 
         return 0
 
+    def ask_feedback(self, apps: list[Application]) -> str | dict[str, str] | None:
+        same: bool = questionary.confirm(
+            "Send the same feedback to everyone?").ask()
+
+        if same:
+            return questionary.text(
+                "Why were these applications denied? ($adopter and $pet are replaced)",
+                validate=NameValidator
+            ).ask()
+
+        return {app.applicant: questionary.text(
+                    f"Why was {app.applicant}'s application denied?",
+                    validate=NameValidator).ask()
+                for app in apps}
+
 
     def next(self) -> int:
         return 1
@@ -212,7 +280,7 @@ class PetMenu(Menu):
 
             "Approve Application": {
                 "func": self.approve_app,
-                "args": [apps, current_app]},
+                "args": [current_app]},
 
             "Deny Application": {
                 "func": self.deny_app,
@@ -232,6 +300,19 @@ class PetMenu(Menu):
 
         return index + move
 
+    def review_page(self, queue: ReviewQueue,
+                    after: Application | None = None) -> list[Application]:
+        """the next applications to review, skipping the ones a queued
+        approval or denial will review"""
+
+        while page := queue.page(self.PAGE_SIZE, after=after):
+            apps: list[Application] = [app for app in page if not app.pending]
+            if apps:
+                return apps
+            after = page[-1]
+
+        return []
+
     def view_applications(self):
         pet: Pet | None = self.get_pet_name()
 
@@ -239,21 +320,34 @@ class PetMenu(Menu):
             return
 
         self.console.print()
-        apps: list[Application] = Application.get_apps_pet(pet.profile.name)
+
+        # best scores first, loaded one page at a time
+        queue = Application.review_queue(pet.profile.name)
+        apps: list[Application] = self.review_page(queue)
 
         if len(apps) == 0:
             return
 
         index: int = 0
         while index < len(apps):
-            clear_screen()
-            self.console.print(header("APPLICATIONS"))
-
-            self.console.print(
-                Panel.fit("\n".join(apps[index].formatted_list())))
-            self.console.print()
-
-            index = self.application_actions(index, apps[index], apps)
+            # approved or denied since the page was loaded, or about to be
+            if apps[index].pending or apps[index].status != "in review":
+                del apps[index]
+            else:
+                clear_screen()
+                self.console.print(header("APPLICATIONS"))
+                self.console.print(f"{len(queue)} applications in review\n")
+
+                self.console.print(
+                    Panel.fit("\n".join(apps[index].formatted_list())))
+                self.console.print()
+
+                index = self.application_actions(index, apps[index], apps)
+
+            if index == len(apps):
+                # the queue is read from the start when every loaded
+                # application was reviewed
+                apps.extend(self.review_page(queue, after=apps[-1] if apps else None))
 
         questionary.press_any_key_to_continue(
             "There are no more applications. Press any key to go back").ask()
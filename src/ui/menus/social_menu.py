@@ -1,8 +1,10 @@
+import questionary
 from rich.console import Console
 
 from src.classes import Post, User
 
 from src.ui.menus.menu import Menu
+from src.ui.name_validator import NameValidator
 from src.ui.posts_ui import PostUI
 
 
@@ -22,6 +24,10 @@ class SocialMenu(Menu):
                 {"func": self.show_posts,
                  "args": []},
 
+            "Search Posts":
+                {"func": self.search_posts,
+                 "args": []},
+
             "Add Forum Post":
                 {"func": self.social_feed.add_post,
                  "args": ["forum"]},
@@ -38,3 +44,20 @@ class SocialMenu(Menu):
     def show_posts(self):
         posts = list(Post.data.values())
         self.social_feed.show_posts(posts, True)
+
+    def search_posts(self):
+        self.console.print()
+        query: str = questionary.text("Search posts:",
+                                      validate=NameValidator,
+                                      qmark=">>").ask()
+
+        results = Post.text_index.search(query, 10, kinds=["post"])
+        posts = [Post.data[title] for (_, title), _ in results
+                 if title in Post.data]
+
+        if len(posts) == 0:
+            self.console.print("\nNo posts found.\n")
+            questionary.press_any_key_to_continue().ask()
+            return
+
+        self.social_feed.show_posts(posts, True)
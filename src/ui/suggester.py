@@ -0,0 +1,24 @@
+import questionary
+from rich.console import Console
+
+from src.search.fuzzy import FuzzyIndex
+
+NONE_OF_THESE: str = "None of these"
+
+
+def suggest(names: FuzzyIndex, name: str, console: Console) -> str | None:
+    """offers the closest registered names when a name isn't found"""
+
+    matches = names.search(name or "", 5)
+    if not matches:
+        return None
+
+    console.print()
+    choice: str = questionary.select(f"'{name}' not found. Did you mean:",
+                                     choices=[match for match, _ in matches] + [NONE_OF_THESE],
+                                     qmark=">>").ask()
+
+    if choice is None or choice == NONE_OF_THESE:
+        return None
+
+    return choice
@@ -0,0 +1,413 @@
+import atexit
+import json
+import os
+import threading
+import weakref
+from typing import Any, BinaryIO
+
+from src.changes import ChangeEvent, ChangeStream, changes
+from src.classes import (Address, Adopter, Application, Donation, Event, Form,
+                         FormVersion, Model, Pet, Post, Question, Shelter)
+
+
+# restored in this order, so every model finds the ones it refers to
+MODELS: dict[str, type[Model]] = {model.__name__: model for model in (
+    Adopter, Shelter, Form, Pet, Application, Donation, Event, Post)}
+
+
+# VALUES THAT AREN'T JSON
+def encode(value: Any) -> Any:
+    if isinstance(value, Address):
+        return {"$address": value.values()}
+    if isinstance(value, Question):
+        return {"$question": [value.name, list(value.options), value.preferred_answer]}
+    if isinstance(value, bytes):
+        return {"$bytes": value.hex()}
+
+    raise TypeError(f"can't log a {type(value).__name__}")
+
+
+def decode(obj: dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "$address" in obj:
+            return Address(**obj["$address"])
+        if "$question" in obj:
+            return Question(*obj["$question"])
+        if "$bytes" in obj:
+            return bytes.fromhex(obj["$bytes"])
+
+    return obj
+
+
+def read_lines(path: str) -> list[bytes]:
+    """complete lines of a file; a last line cut short by a crash is
+    removed, so new lines can't be appended to it"""
+
+    lines: list[bytes] = []
+    with open(path, "rb+") as file:
+        while line := file.readline():
+            if not line.endswith(b"\n"):
+                file.truncate(file.tell() - len(line))
+                break
+            lines.append(line)
+
+    return lines
+
+
+def apply(entity: str, key: str, field: str | None, value: Any) -> None:
+    """replays one logged change on the models"""
+
+    model: type[Model] = MODELS[entity]
+    if field is None:
+        # a model created while a snapshot was taken can be in both
+        if key not in model.data:
+            model._create(key, value)
+    else:
+        model.data[key]._apply(field, value)
+
+
+# DURABLE LOG OF EVERY MODEL CHANGE
+class WriteAheadLog:
+    """Every event of the change stream is appended to `path` as a JSON line
+    [lsn, entity, key, field, new value], numbered by its own log sequence
+    number, which keeps counting across restarts.
+
+    Lines are written by a background thread, one write and one fsync per
+    batch (group commit): when `batch_size` are waiting or every `interval`
+    seconds. commit() waits until everything recorded so far is on disk.
+
+    Every `snapshot_every` changes, the writer thread writes the current
+    state of the models to `<path>.snapshot` (one creation event per model,
+    followed by the fields that differ from a new one) and starts the log
+    over, so recording a change never waits for a snapshot. On
+    open(), the snapshot is loaded and only the log lines after it are
+    replayed, so startup depends on the size of the state, not of its
+    history. A line cut short by a crash is dropped.
+
+    Every form version an application answered is written once, to
+    `<path>.forms`, and log lines refer to it by number. That file only
+    grows with the distinct versions, so snapshots leave it alone."""
+
+    def __init__(self, path: str = "adoptions.wal", snapshot_every: int = 10_000,
+                 batch_size: int = 256, interval: float = 0.05,
+                 stream: ChangeStream = changes):
+        self.path: str = path
+        self.snapshot_path: str = f"{path}.snapshot"
+        self.forms_path: str = f"{path}.forms"
+        self.snapshot_every: int = snapshot_every
+        self.batch_size: int = batch_size
+        self.interval: float = interval
+        self.stream: ChangeStream = stream
+
+        self.__lock = threading.Lock()
+        self.__wake = threading.Condition(self.__lock)
+        self.__synced = threading.Condition(self.__lock)
+
+        # (lsn, line) waiting to be written
+        self.__pending: list[tuple[int, bytes]] = []
+
+        # form versions by number, as their logged questions, and the
+        # other way around; lines of new ones wait to be written
+        self.__forms: dict[int, str] = {}
+        self.__form_ids: dict[str, int] = {}
+        self.__version_ids: weakref.WeakKeyDictionary[FormVersion, int] = \
+            weakref.WeakKeyDictionary()
+        self.__pending_forms: list[bytes] = []
+        # versions decoded during open(), kept alive until the models hold them
+        self.__restored: dict[int, FormVersion] = {}
+        self.__snapshot_due: bool = False
+        self.__lsn: int = 0
+        self.__durable: int = 0
+        self.__since_snapshot: int = 0
+
+        self.__file: BinaryIO | None = None
+        self.__thread: threading.Thread | None = None
+        self.__opened: bool = False
+        self.__closed: bool = False
+
+    @property
+    def lsn(self) -> int:
+        """sequence number of the last change recorded"""
+
+        return self.__lsn
+
+    # STARTUP
+    def open(self) -> int:
+        """restores the models from the snapshot and the log, then starts
+        logging their changes; returns how many changes were restored"""
+
+        if self.__opened:
+            return 0
+
+        self.__load_forms()
+        restored: int = self.__load_snapshot()
+        tail: int = self.__replay_tail()
+        self.__restored.clear()
+
+        self.__since_snapshot = tail
+        self.__durable = self.__lsn
+        self.__opened = True
+        self.stream.subscribe(self.__record)
+
+        return restored + tail
+
+    # VALUES THAT AREN'T JSON
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, FormVersion):
+            return {"$form": self.__form_id(value)}
+
+        return encode(value)
+
+    def decode(self, obj: dict[str, Any]) -> Any:
+        if len(obj) == 1 and "$form" in obj:
+            return self.__version(obj["$form"])
+
+        return decode(obj)
+
+    def __form_id(self, version: FormVersion) -> int:
+        with self.__lock:
+            form_id: int | None = self.__version_ids.get(version)
+        if form_id is not None:
+            return form_id
+
+        # an equal version made again (after the old one was released, or
+        # in another run) gets the same number
+        questions: str = json.dumps(version.questions, default=encode)
+        with self.__lock:
+            form_id = self.__form_ids.get(questions)
+            if form_id is None:
+                form_id = len(self.__forms)
+                self.__forms[form_id] = questions
+                self.__form_ids[questions] = form_id
+                self.__pending_forms.append(
+                    f"[{form_id}, {questions}]\n".encode())
+            self.__version_ids[version] = form_id
+
+        return form_id
+
+    def __version(self, form_id: int) -> FormVersion:
+        version: FormVersion | None = self.__restored.get(form_id)
+        if version is None:
+            version = FormVersion.of(tuple(json.loads(self.__forms[form_id], object_hook=decode)))
+            self.__restored[form_id] = version
+            with self.__lock:
+                self.__version_ids[version] = form_id
+
+        return version
+
+    def __load_forms(self) -> None:
+        if not os.path.exists(self.forms_path):
+            return None
+
+        for line in read_lines(self.forms_path):
+            form_id, questions = json.loads(line)
+            self.__forms[form_id] = json.dumps(questions)
+            self.__form_ids[self.__forms[form_id]] = form_id
+
+        return None
+
+    def __load_snapshot(self) -> int:
+        if not os.path.exists(self.snapshot_path):
+            return 0
+
+        restored: int = 0
+        with open(self.snapshot_path, "rb") as snapshot:
+            self.__lsn = json.loads(snapshot.readline())["lsn"]
+
+            for line in snapshot:
+                apply(*json.loads(line, object_hook=self.decode))
+                restored += 1
+
+        return restored
+
+    def __replay_tail(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+
+        replayed: int = 0
+        for line in read_lines(self.path):
+            lsn, *change = json.loads(line, object_hook=self.decode)
+            # lines the snapshot already covers
+            if lsn <= self.__lsn:
+                continue
+
+            apply(*change)
+            self.__lsn = lsn
+            replayed += 1
+
+        return replayed
+
+    # RECORDING
+    def __record(self, event: ChangeEvent) -> None:
+        # the stream delivers one event at a time, in order
+        line: bytes = json.dumps(
+            [self.__lsn + 1, event.entity, event.key, event.field, event.new],
+            default=self.encode).encode() + b"\n"
+
+        with self.__lock:
+            self.__lsn += 1
+            self.__pending.append((self.__lsn, line))
+            self.__since_snapshot += 1
+            self.__start()
+
+            if self.__since_snapshot >= self.snapshot_every:
+                self.__snapshot_due = True
+
+            if len(self.__pending) >= self.batch_size or self.__snapshot_due:
+                self.__wake.notify()
+
+    def snapshot(self) -> None:
+        """asks the writer thread for a snapshot of the models, which
+        replaces the log written before it"""
+
+        with self.__lock:
+            self.__snapshot_due = True
+            self.__start()
+            self.__wake.notify()
+
+    def __start(self) -> None:
+        if self.__thread is None:
+            self.__closed = False
+            self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                             name="wal-writer")
+            self.__thread.start()
+            atexit.unregister(self.close)
+            atexit.register(self.close)
+
+    # WRITING
+    def __run(self) -> None:
+        while True:
+            with self.__lock:
+                if (len(self.__pending) < self.batch_size and not self.__snapshot_due
+                        and not self.__closed):
+                    self.__wake.wait(self.interval)
+                closed: bool = self.__closed
+
+            self.__write()
+            self.__take_snapshot()
+            if closed:
+                return None
+
+    def __write(self) -> None:
+        with self.__lock:
+            pending, self.__pending = self.__pending, []
+            forms, self.__pending_forms = self.__pending_forms, []
+
+        # the versions first, so no line refers to a missing one
+        self.__append_forms(forms)
+        if not pending:
+            return None
+
+        self.__append([line for _, line in pending])
+
+        with self.__lock:
+            self.__durable = pending[-1][0]
+            self.__synced.notify_all()
+
+        return None
+
+    def __take_snapshot(self) -> None:
+        # only the writer thread writes, so right now the log holds exactly
+        # the lines up to the durable lsn
+        with self.__lock:
+            if not self.__snapshot_due:
+                return None
+            self.__snapshot_due = False
+            self.__since_snapshot = 0
+            covered: int = self.__durable
+
+        # the models are read without stopping whoever changes them: a change
+        # made meanwhile is logged after `covered` and replayed on top of the
+        # snapshot, which is harmless because replaying a change is idempotent
+        creations: list[bytes] = []
+        fields: list[bytes] = []
+
+        # every model is created before any field refers to another one
+        for entity, model in MODELS.items():
+            for key, instance in list(model.data.items()):
+                for field, value in instance._snapshot():
+                    line: bytes = json.dumps([entity, key, field, value],
+                                             default=self.encode).encode() + b"\n"
+                    (creations if field is None else fields).append(line)
+
+        with self.__lock:
+            forms, self.__pending_forms = self.__pending_forms, []
+        self.__append_forms(forms)
+
+        header: bytes = json.dumps({"lsn": covered}).encode() + b"\n"
+        self.__write_snapshot(header + b"".join(creations) + b"".join(fields))
+        return None
+
+    def __append(self, lines: list[bytes]) -> None:
+        if not lines:
+            return None
+
+        if self.__file is None:
+            self.__file = open(self.path, "ab")
+
+        self.__file.write(b"".join(lines))
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        return None
+
+    def __append_forms(self, lines: list[bytes]) -> None:
+        if not lines:
+            return None
+
+        with open(self.forms_path, "ab") as forms:
+            forms.write(b"".join(lines))
+            forms.flush()
+            os.fsync(forms.fileno())
+        return None
+
+    def __write_snapshot(self, snapshot: bytes) -> None:
+        temporary: str = f"{self.snapshot_path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(snapshot)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.snapshot_path)
+
+        # the snapshot covers the whole log, so it starts over empty
+        if self.__file is not None:
+            self.__file.close()
+        self.__file = open(self.path, "wb")
+        os.fsync(self.__file.fileno())
+        return None
+
+    def commit(self) -> None:
+        """waits until every change recorded so far is on disk"""
+
+        with self.__lock:
+            target: int = self.__lsn
+            if self.__thread is None:
+                return None
+
+            self.__wake.notify()
+            while self.__durable < target:
+                self.__synced.wait()
+
+        return None
+
+    def close(self) -> None:
+        """stops logging, after writing everything left"""
+
+        self.stream.unsubscribe(self.__record)
+
+        with self.__lock:
+            self.__closed = True
+            self.__wake.notify()
+            thread, self.__thread = self.__thread, None
+
+        if thread is not None:
+            thread.join()
+
+        self.__write()
+        self.__take_snapshot()
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+# every model change of the program, kept across restarts
+write_ahead_log: WriteAheadLog = WriteAheadLog()
@@ -0,0 +1,48 @@
+import os
+import sys
+from itertools import count
+from typing import Callable, Iterator
+
+import pytest
+
+# the modules are imported as src.*, from the project folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.classes import Adopter, Pet, Shelter  # noqa: E402
+
+# models live in class level registries shared by every test, so each
+# test gets names nobody else used
+_names: Iterator[int] = count()
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """files written at relative paths (logs, histories) end up here"""
+
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def unique() -> Callable[[str], str]:
+    return lambda prefix: f"{prefix}{next(_names)}"
+
+
+@pytest.fixture
+def shelter(unique) -> Shelter:
+    shelter = Shelter(unique("shelter"), "Test Shelter")
+    shelter.add_allowed_pet_type("dog")
+    return shelter
+
+
+@pytest.fixture
+def make_pet(unique, shelter) -> Callable[..., Pet]:
+    def make(**profile) -> Pet:
+        return Pet(unique("pet"), shelter.username, "dog", **profile)
+
+    return make
+
+
+@pytest.fixture
+def make_adopter(unique) -> Callable[[], Adopter]:
+    return lambda: Adopter(unique("adopter"), "Test Adopter")
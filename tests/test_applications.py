@@ -0,0 +1,43 @@
+import pytest
+
+from src.classes import Application
+from src.exceptions import ApplicationAlreadyExistsError
+
+
+def test_applications_are_found_by_pet_and_by_applicant(make_pet, make_adopter):
+    rex, bob = make_pet(), make_pet()
+    ana, joe = make_adopter().username, make_adopter().username
+
+    ana_rex = Application(ana, rex.key, rex.form, ["Yes"])
+    ana_bob = Application(ana, bob.key, bob.form, ["No"])
+    joe_rex = Application(joe, rex.key, rex.form, ["No"])
+
+    assert Application.get_apps_pet(rex.key) == [ana_rex, joe_rex]
+    assert Application.get_apps_pet(bob.key) == [ana_bob]
+    assert Application.get_apps_applicant(ana) == [ana_rex, ana_bob]
+    assert Application.get_apps_applicant(joe) == [joe_rex]
+
+
+def test_unknown_pet_or_applicant_has_no_applications():
+    assert Application.get_apps_pet("nobody") == []
+    assert Application.get_apps_applicant("nobody") == []
+
+
+def test_second_application_to_the_same_pet_is_rejected(make_pet, make_adopter):
+    pet, ana = make_pet(), make_adopter().username
+    first = Application(ana, pet.key, pet.form, ["Yes"])
+
+    with pytest.raises(ApplicationAlreadyExistsError):
+        Application(ana, pet.key, pet.form, ["No"])
+
+    assert Application.get_apps_pet(pet.key) == [first]
+    assert Application.get_apps_applicant(ana) == [first]
+
+
+def test_returned_lists_are_copies(make_pet, make_adopter):
+    pet = make_pet()
+    Application(make_adopter().username, pet.key, pet.form, ["Yes"])
+
+    Application.get_apps_pet(pet.key).clear()
+
+    assert len(Application.get_apps_pet(pet.key)) == 1
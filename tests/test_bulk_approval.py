@@ -0,0 +1,118 @@
+import pytest
+
+from src.adoption_facade import AdoptionFacade
+from src.classes import Application
+from src.feedback_store import FeedbackStore
+from src.mediator import ConcreteAdoptionMediator
+from src.pipeline import Pipeline
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = Pipeline(sleep=lambda seconds: None)
+    yield pipeline
+    pipeline.shutdown()
+
+
+@pytest.fixture
+def mediator(pipeline):
+    mediator = ConcreteAdoptionMediator(pipeline)
+    mediator.feedback_sender = FeedbackStore("history.jsonl")
+    return mediator
+
+
+@pytest.fixture
+def applications(mediator, make_pet, make_adopter) -> list[Application]:
+    pet = make_pet()
+    return [mediator.create_application(make_adopter().username, pet.key, ["Yes"])
+            for _ in range(3)]
+
+
+def test_approves_one_and_denies_the_rest(mediator, applications):
+    chosen, *rest = applications
+
+    denied = mediator.approve_and_deny_rest(chosen, "sorry $adopter, $pet found a home")
+
+    assert set(denied) == set(rest)
+    assert chosen.status == "approved"
+    assert all(app.status == "denied" for app in rest)
+    assert rest[0].feedback == f"sorry {rest[0].applicant}, {rest[0].pet} found a home"
+
+    pet = mediator.pets[chosen.pet]
+    assert pet.is_adopted() and pet.tutor.username == chosen.applicant
+    assert len(Application.review_queue(chosen.pet)) == 0
+
+    history = mediator.feedback_sender.by_pet(chosen.pet)
+    assert sorted(r["adopter"] for r in history) == sorted(app.applicant for app in rest)
+
+
+def test_feedback_per_applicant(mediator, applications):
+    chosen, first, second = applications
+
+    mediator.approve_and_deny_rest(chosen, {first.applicant: "one"})
+
+    assert first.feedback == "one"
+    assert second.feedback == ""
+
+
+def test_denied_application_is_not_approved(mediator, applications):
+    chosen, *rest = applications
+    chosen.deny("no")
+
+    with pytest.raises(ValueError):
+        mediator.approve_and_deny_rest(chosen, "sorry")
+
+    pet = mediator.pets[chosen.pet]
+    assert not pet.is_adopted() and pet.tutor is None
+    assert all(app.status == "in review" for app in rest)
+
+
+@pytest.mark.parametrize("feedback", [None, {"someone": None}, 3])
+def test_invalid_feedback_changes_nothing(mediator, applications, feedback):
+    chosen, *rest = applications
+
+    with pytest.raises(ValueError):
+        mediator.approve_and_deny_rest(chosen, feedback)
+
+    assert all(app.status == "in review" for app in applications)
+
+
+def test_facade_rejects_feedback_before_submitting(pipeline, applications):
+    facade = AdoptionFacade(pipeline)
+
+    with pytest.raises(ValueError):
+        facade.process_application(applications[0], None)
+
+    pipeline.join()
+    assert applications[0].status == "in review"
+
+
+def test_queued_approval_marks_the_applications_pending(pipeline, mediator, applications):
+    chosen, *rest = applications
+
+    mediator.queue_approval(chosen, "sorry", delay=3)
+
+    assert chosen.pending == "approval"
+    assert all(app.pending == "denial" for app in rest)
+    assert all(app.status == "in review" for app in applications)
+    for app in applications:
+        with pytest.raises(ValueError):
+            mediator.queue_approval(app, "sorry")
+        with pytest.raises(ValueError):
+            mediator.deny_application(app, "no")
+
+    pipeline.join()
+    assert chosen.status == "approved" and chosen.pending is None
+    assert all(app.status == "denied" and app.pending is None for app in rest)
+
+
+def test_queued_denial_is_left_to_its_own_job(pipeline, mediator, applications):
+    chosen, denied, other = applications
+
+    mediator.deny_application(denied, "not this time")
+    mediator.queue_approval(chosen, "sorry")
+    assert other.pending == "denial" and denied.pending == "denial"
+
+    pipeline.join()
+    assert denied.status == "denied" and denied.feedback == "not this time"
+    assert other.status == "denied" and other.feedback == "sorry"
@@ -0,0 +1,69 @@
+import pytest
+
+from src.query.cache import ResultCache
+from src.query.index import InvertedIndex
+from src.query.query import Query
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(capacity=2)
+    cache.put("a", 0, ["x"])
+    cache.put("b", 0, ["y"])
+
+    assert cache.get("a", 0) == ["x"]
+    cache.put("c", 0, ["z"])
+
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) == ["x"] and cache.get("c", 0) == ["z"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_of_another_version_is_dropped():
+    cache = ResultCache()
+    cache.put("a", 0, ["x"])
+
+    assert cache.get("a", 1) is None
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_results_are_copied_in_and_out():
+    cache = ResultCache()
+    result = ["x"]
+    cache.put("a", 0, result)
+    result.append("y")
+    cache.get("a", 0).append("z")
+
+    assert cache.get("a", 0) == ["x"]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        ResultCache(capacity=0)
+
+
+def test_search_is_cached_until_the_index_changes():
+    index = InvertedIndex.from_items([{"name": "rex", "pet_type": "dog"}])
+    cache = ResultCache()
+    query = Query(index=index, cache=cache)
+    spec = {"where": {"pet_type": "dog"}}
+
+    assert query.search(spec) == ["rex"]
+    assert query.search(spec) == ["rex"]
+    assert cache.stats()["hits"] == 1
+
+    index.add("bob", {"pet_type": "dog"})
+
+    assert query.search(spec) == ["rex", "bob"]
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_equivalent_specs_share_an_entry():
+    index = InvertedIndex.from_items([{"name": "rex", "pet_type": "dog", "breed": "pug"}])
+    cache = ResultCache()
+    query = Query(index=index, cache=cache)
+
+    query.search({"where": {"pet_type": "dog", "breed": ["pug"]}})
+    query.search({"where": {"breed": "pug", "pet_type": ["dog"]}, "offset": 0})
+
+    assert cache.stats()["hits"] == 1 and len(cache) == 1
@@ -0,0 +1,42 @@
+from src.changes import ChangeStream, changes
+from src.classes import Post
+
+
+def test_collections_report_one_item_per_event(shelter, unique):
+    post = Post(shelter, "forum", unique("post "), "content")
+    events = []
+    changes.subscribe(events.append, "Post")
+    try:
+        post.like("ana")
+        post.like("bia")
+        post.dislike("ana")
+    finally:
+        changes.unsubscribe(events.append, "Post")
+
+    assert [(e.field, e.new) for e in events] == [
+        ("likes+", "ana"), ("likes+", "bia"), ("likes-", "ana")]
+
+
+def test_deltas_are_applied_again(shelter, unique):
+    post = Post(shelter, "forum", unique("post "), "content")
+    post._apply("likes+", "ana")
+    post._apply("likes+", "bia")
+    post._apply("likes-", "ana")
+
+    assert not post.user_liked("ana") and post.user_liked("bia")
+
+
+def test_failing_listener_doesnt_stop_the_others():
+    stream = ChangeStream()
+    received = []
+
+    def failing(event):
+        raise RuntimeError("broken subscriber")
+
+    stream.subscribe(failing)
+    stream.subscribe(received.append)
+
+    stream.emit("Pet", "rex", "status", "rescued", "adopted")
+    stream.emit("Pet", "rex", "tutor", None, "ana")
+
+    assert [e.seq for e in received] == [1, 2]
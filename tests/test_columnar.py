@@ -0,0 +1,85 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.query.columnar import PetColumns
+from src.query.index import PetIndex
+from src.query.query import Query
+
+
+@pytest.fixture(scope="module")
+def index():
+    rng = random.Random(7)
+    index = PetIndex()
+    today = date.today()
+
+    def maybe(values):
+        return rng.choice(values + [None])
+
+    for n in range(300):
+        birth = today - timedelta(days=rng.randrange(0, 15 * 365))
+        index.add(f"pet{n}", {
+            "pet_type": rng.choice(["dog", "cat", "bird"]),
+            "shelter": maybe(["s1", "s2", "s3"]),
+            "status": rng.choice(["available", "adopted"]),
+            "birth": None if rng.random() < 0.1 else birth.isoformat(),
+            "city": maybe(["Maceio", "Recife", "Natal"]),
+            "state": maybe(["AL", "PE"]),
+            "breed": maybe(["pug", "akita", "siamese", "mutt"]),
+            "color": maybe(["black", "white"])})
+
+    # removed and re-keyed rows, so both keep holes and stale values
+    for n in range(0, 300, 7):
+        index.remove(f"pet{n}")
+    for n in range(1, 300, 11):
+        if n % 7:
+            index.update(f"pet{n}", {"pet_type": "dog", "breed": "pug",
+                                     "status": "available"})
+
+    return index
+
+
+SPECS = [
+    {},
+    {"where": {"pet_type": "dog"}},
+    {"where": {"breed": ["pug", "akita"], "city": None}},
+    {"where": {"city": {"in": ["Recife"], "null": True}, "state": "PE"}},
+    {"where": {"age": {"min": 2, "max": 6}}},
+    {"where": {"age": [0, 3, 10]}},
+    {"where": {"age": {"max": 4, "null": True}, "pet_type": ["cat", "bird"]}},
+    {"where": {"shelter": "nowhere"}},
+    {"sort": ["age", "-breed"]},
+    {"where": {"status": "available"}, "sort": ["-city", "age"], "limit": 20, "offset": 5},
+    {"where": {"pet_type": "dog"}, "sort": ["-age", "color"], "limit": 7},
+]
+
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_columns_return_what_the_bitmaps_return(index, spec):
+    bitmaps = Query(index=index)
+    columns = Query(index=index, columns=PetColumns(index))
+
+    assert columns.search(spec) == bitmaps.search(spec)
+
+
+def test_columns_follow_later_changes(index):
+    columns = PetColumns(index)
+    index.add("late", {"pet_type": "lizard", "birth": "2020-01-01"})
+
+    spec = {"where": {"pet_type": "lizard"}}
+    assert Query(index=index, columns=columns).search(spec) == ["late"]
+
+    index.remove("late")
+    assert Query(index=index, columns=columns).search(spec) == []
+
+
+def test_vectorized_ages_match_the_index():
+    index = PetIndex()
+    births = ["2000-02-29", "2001-03-01", "2010-12-31", None]
+    for n, birth in enumerate(births):
+        index.add(str(n), {"birth": birth})
+
+    today = date(2023, 2, 28)
+    expected = [-1 if birth is None else PetIndex.age_of(birth, today) for birth in births]
+    assert PetColumns(index).ages(today).tolist() == expected
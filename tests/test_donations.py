@@ -0,0 +1,42 @@
+from datetime import date
+
+from src.classes import Donation
+
+
+def test_running_totals_and_counts(shelter, make_adopter):
+    ana, joe = make_adopter().username, make_adopter().username
+
+    Donation(ana, shelter.username, 10.0, date(2024, 1, 1))
+    Donation(ana, shelter.username, 2.5, date(2024, 1, 2))
+    Donation(joe, shelter.username, 5.0, date(2024, 1, 3))
+
+    assert Donation.ledger.total_donated(ana) == 12.5
+    assert Donation.ledger.count_donated(ana) == 2
+    assert Donation.ledger.total_received(shelter.username) == 17.5
+    assert Donation.ledger.count_received(shelter.username) == 3
+    assert Donation.ledger.total_donated("nobody") == 0.0
+    assert Donation.ledger.count_received("nobody") == 0
+
+
+def test_donations_by_donor_and_receiver(shelter, make_adopter):
+    ana, joe = make_adopter().username, make_adopter().username
+
+    first = Donation(ana, shelter.username, 10.0, date(2024, 1, 1))
+    second = Donation(joe, shelter.username, 5.0, date(2024, 1, 2))
+
+    assert Donation.by_donor(ana) == [first]
+    assert Donation.by_receiver(shelter.username) == [first, second]
+
+
+def test_by_user_merges_given_and_received_in_registration_order(shelter, make_adopter):
+    # a user on both sides of donations, e.g. a shelter giving to another one
+    ana = make_adopter().username
+    user = make_adopter().username
+
+    given = Donation(user, shelter.username, 1.0, date(2024, 1, 1))
+    received = Donation(ana, user, 2.0, date(2024, 1, 2))
+    given_again = Donation(user, shelter.username, 3.0, date(2024, 1, 3))
+    to_self = Donation(user, user, 4.0, date(2024, 1, 4))
+
+    assert Donation.by_user(user) == [given, received, given_again, to_self]
+    assert Donation.by_user(ana) == [received]
@@ -0,0 +1,87 @@
+import gzip
+import time
+
+import pytest
+
+from src.feedback_adapter import BufferedFileFeedbackAdapter
+
+
+@pytest.fixture
+def make_log():
+    logs = []
+
+    def make(**options) -> BufferedFileFeedbackAdapter:
+        # a long interval, so only batches, flushes and close write
+        logs.append(BufferedFileFeedbackAdapter("feedback.txt", interval=60, **options))
+        return logs[-1]
+
+    yield make
+    for log in logs:
+        log.close()
+
+
+def read(path) -> str:
+    with open(path) as file:
+        return file.read()
+
+
+def test_records_wait_in_memory_until_flushed(make_log, workdir):
+    log = make_log(batch_size=100)
+    log.send_feedback("ana", "rex", "sorry")
+
+    assert not (workdir / "feedback.txt").exists()
+    log.flush()
+    assert read(workdir / "feedback.txt") == "ana - rex: sorry\n"
+
+
+def test_close_writes_everything_left(make_log, workdir):
+    log = make_log(batch_size=100)
+    log.send_many([("ana", "rex", "one"), ("bia", "tom", "two")])
+    log.close()
+
+    assert read(workdir / "feedback.txt") == "ana - rex: one\nbia - tom: two\n"
+
+
+def test_full_batch_is_written_by_the_thread(make_log, workdir):
+    log = make_log(batch_size=2)
+    log.send_many([("ana", "rex", "one"), ("bia", "tom", "two")])
+
+    # nothing flushes here, the writer wakes up before its interval ends
+    path = workdir / "feedback.txt"
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if path.exists() and read(path).count("\n") == 2:
+            break
+        time.sleep(0.01)
+
+    assert read(path) == "ana - rex: one\nbia - tom: two\n"
+
+
+def test_log_is_rotated_past_max_bytes(make_log, workdir):
+    log = make_log(batch_size=100, max_bytes=20)
+    log.send_feedback("ana", "rex", "a long enough message")
+    log.flush()
+    log.send_feedback("bia", "tom", "next")
+    log.flush()
+    log.send_feedback("caio", "bob", "a long enough message too")
+    log.close()
+
+    assert read(workdir / "feedback.txt.1") == "ana - rex: a long enough message\n"
+    assert read(workdir / "feedback.txt.2").startswith("bia - tom: next\ncaio")
+    assert not (workdir / "feedback.txt").exists()
+
+
+def test_rotated_segments_are_gzipped(make_log, workdir):
+    log = make_log(compress=True)
+    log.send_feedback("ana", "rex", "one")
+    log.rotate()
+    log.send_feedback("bia", "tom", "two")
+    log.rotate()
+    log.rotate()
+
+    with gzip.open(workdir / "feedback.txt.1.gz", "rt") as segment:
+        assert segment.read() == "ana - rex: one\n"
+    with gzip.open(workdir / "feedback.txt.2.gz", "rt") as segment:
+        assert segment.read() == "bia - tom: two\n"
+    assert not (workdir / "feedback.txt.1").exists()
+    assert not (workdir / "feedback.txt.3.gz").exists()
@@ -0,0 +1,67 @@
+import json
+
+from src.feedback_store import FeedbackStore
+
+
+def test_history_is_stable_across_reopens(workdir):
+    FeedbackStore("history.jsonl").send_feedback("ana", "rex", "sorry")
+
+    for _ in range(3):
+        store = FeedbackStore("history.jsonl")
+        assert [r["feedback"] for r in store.by_adopter("ana")] == ["sorry"]
+
+    with open(workdir / "history.jsonl.idx") as index:
+        assert [json.loads(line) for line in index] == [["ana", "rex", 0]]
+
+
+def test_appends_after_reopen_are_found(workdir):
+    FeedbackStore("history.jsonl").send_many([("ana", "rex", "one"), ("bia", "rex", "two")])
+
+    store = FeedbackStore("history.jsonl")
+    store.send_feedback("ana", "tom", "three")
+
+    reopened = FeedbackStore("history.jsonl")
+    assert [r["feedback"] for r in reopened.by_adopter("ana")] == ["one", "three"]
+    assert [r["feedback"] for r in reopened.by_pet("rex")] == ["one", "two"]
+
+
+def test_tail_missing_from_the_index_is_reindexed_once(workdir):
+    store = FeedbackStore("history.jsonl")
+    store.send_many([("ana", "rex", "one"), ("ana", "tom", "two")])
+
+    # the program stopped before the second line reached the index
+    index = workdir / "history.jsonl.idx"
+    index.write_text(index.read_text().splitlines(keepends=True)[0])
+
+    for _ in range(2):
+        store = FeedbackStore("history.jsonl")
+        assert [r["feedback"] for r in store.by_adopter("ana")] == ["one", "two"]
+
+    assert len(index.read_text().splitlines()) == 2
+
+
+def test_torn_line_is_skipped_and_ended(workdir):
+    FeedbackStore("history.jsonl").send_feedback("ana", "rex", "one")
+    with open(workdir / "history.jsonl", "ab") as data:
+        data.write(b'{"adopter": "ana", "pe')
+
+    store = FeedbackStore("history.jsonl")
+    store.send_feedback("ana", "tom", "two")
+
+    reopened = FeedbackStore("history.jsonl")
+    assert [r["feedback"] for r in reopened.by_adopter("ana")] == ["one", "two"]
+
+
+def test_torn_index_line_is_dropped_once(workdir):
+    FeedbackStore("history.jsonl").send_many([("ana", "rex", "one"), ("ana", "tom", "two")])
+
+    # the program stopped while writing the second index line
+    index = workdir / "history.jsonl.idx"
+    index.write_text(index.read_text()[:-4])
+
+    for _ in range(3):
+        store = FeedbackStore("history.jsonl")
+        assert [r["feedback"] for r in store.by_adopter("ana")] == ["one", "two"]
+
+    entries = [json.loads(line) for line in index.read_text().splitlines()]
+    assert [(adopter, pet) for adopter, pet, _ in entries] == [("ana", "rex"), ("ana", "tom")]
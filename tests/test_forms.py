@@ -0,0 +1,47 @@
+import gc
+
+import pytest
+
+from src.classes import Application, Form, FormVersion, Question
+
+
+def yard() -> Question:
+    return Question("Do you have a yard?", ["yes", "no"], "yes")
+
+
+def test_edits_make_new_versions_and_clones_share_them(unique):
+    form = Form(unique("form"), [yard()], register=False)
+    clone = form.clone()
+    first = form.version
+
+    assert clone.version is first
+    assert Form(unique("form"), [yard()], register=False).version is first
+
+    form.set_preferred("Do you have a yard?", "no")
+    assert form.version is not first and clone.version is first
+    assert form.version.preferred == bytes([1]) and first.preferred == bytes([0])
+
+
+def test_versions_no_form_uses_are_released(unique):
+    form = Form(unique("form"), [Question("Are you home all day?", ["yes", "no"], "yes")],
+                register=False)
+    version_id = form.version.id
+    form.set_preferred("Are you home all day?", "no")
+    assert FormVersion.get(form.version.id) is form.version
+
+    gc.collect()
+    with pytest.raises(KeyError):
+        FormVersion.get(version_id)
+
+
+def test_applications_keep_the_version_they_answered(make_pet, make_adopter):
+    pet = make_pet()
+    pet.add_template_question("Do you work from home?", ["yes", "no"], "yes")
+    app = Application(make_adopter().username, pet.key, pet.form, ["Yes", "no"])
+    version_id = app.form_version
+
+    pet.form.set_preferred("Do you work from home?", "no")
+    gc.collect()
+
+    assert FormVersion.get(version_id).id == version_id
+    assert app.answers == ["Yes", "no"]
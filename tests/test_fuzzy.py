@@ -0,0 +1,37 @@
+import pytest
+
+from src.search.fuzzy import FuzzyIndex
+
+
+@pytest.fixture
+def index():
+    index = FuzzyIndex()
+    for name in ["Rex", "Bob", "Max", "Luna", "Thor"]:
+        index.add(name)
+    return index
+
+
+@pytest.mark.parametrize("query", [None, "", " ", "   ", "\t\n"])
+def test_blank_queries_find_nothing(index, query):
+    assert index.search(query) == []
+
+
+def test_typos_and_padding_are_tolerated(index):
+    assert index.search(" lnua ")[0][0] == "Luna"
+    assert index.search("rex")[0][0] == "Rex"
+
+
+def test_two_typos_fall_back_to_trigrams(index):
+    index.add("Thunderbolt")
+
+    assert index.search("thumderbolk")[0][0] == "Thunderbolt"
+
+
+def test_trigram_ranking_is_bounded(index, monkeypatch):
+    for n in range(1000):
+        index.add(f"Thunder {n}")
+    index.add("Thunderbolt")
+    monkeypatch.setattr(FuzzyIndex, "MAX_COMPARED", 10)
+
+    # only the names sharing the most rare trigrams are compared
+    assert len(index.search("thumderbolk", k=50)) <= 10
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from src.inbox import Inbox
+
+
+def make_inbox(capacity: int = 100) -> Inbox:
+    return Inbox(capacity, clock=lambda: datetime(2024, 5, 1, 9, 30))
+
+
+def test_drain_pages_unread_messages_oldest_first():
+    inbox = make_inbox()
+    for n in range(5):
+        inbox.deliver(f"message {n}")
+
+    assert inbox.unread == 5
+    assert inbox.drain(2) == [("2024-05-01 09:30", "message 0"),
+                              ("2024-05-01 09:30", "message 1")]
+    assert inbox.unread == 3
+    assert [message for _, message in inbox.drain()] == ["message 2", "message 3", "message 4"]
+    assert inbox.unread == 0 and inbox.drain() == []
+
+
+def test_ring_buffer_drops_the_oldest_messages():
+    inbox = make_inbox(capacity=3)
+    for n in range(5):
+        inbox.deliver(f"message {n}")
+
+    assert len(inbox) == 3
+    # unread messages pushed out of the buffer don't count anymore
+    assert inbox.unread == 3
+    assert [message for _, message in inbox.drain()] == ["message 2", "message 3", "message 4"]
+
+
+def test_messages_arriving_after_a_drain_are_unread():
+    inbox = make_inbox(capacity=3)
+    inbox.deliver("old")
+    inbox.drain()
+
+    for n in range(4):
+        inbox.deliver(f"new {n}")
+
+    assert inbox.unread == 3
+    assert [message for _, message in inbox.drain()] == ["new 1", "new 2", "new 3"]
@@ -0,0 +1,91 @@
+from src.query.index import InvertedIndex, bits_to_rows, rows_to_bits
+from src.query.query import Query
+
+
+def items():
+    return [{"name": "rex", "pet_type": "dog", "breed": "pug"},
+            {"name": "tom", "pet_type": "cat", "breed": "siamese"},
+            {"name": "bob", "pet_type": "dog", "breed": None},
+            {"name": "mia", "pet_type": "cat"}]
+
+
+def test_rows_and_bits_round_trip():
+    rows = [0, 3, 8, 9, 64, 200]
+
+    assert rows_to_bits(rows) == sum(1 << row for row in rows)
+    assert list(bits_to_rows(rows_to_bits(rows))) == rows
+    assert list(bits_to_rows(0)) == []
+
+
+def test_match_intersects_keys_and_unions_values():
+    index = InvertedIndex.from_items(items())
+
+    assert index.names(index.match({"pet_type": ["dog"]})) == ["rex", "bob"]
+    assert index.names(index.match({"pet_type": ["dog", "cat"], "breed": ["pug", "siamese"]})) == ["rex", "tom"]
+    assert index.names(index.match({"breed": [None]})) == ["bob", "mia"]
+    assert index.names(index.match({"pet_type": ["bird"]})) == []
+
+
+def test_updates_and_removals_move_rows_between_bitmaps():
+    index = InvertedIndex.from_items(items())
+
+    index.update("rex", {"pet_type": "dog", "breed": "beagle"})
+    index.remove("tom")
+
+    assert index.names(index.match({"breed": ["pug"]})) == []
+    assert index.names(index.match({"breed": ["beagle"]})) == ["rex"]
+    assert index.names(index.match({"pet_type": ["cat"]})) == ["mia"]
+    assert "tom" not in index and len(index) == 3
+    assert index.names(index.all) == ["rex", "bob", "mia"]
+
+
+def test_rows_added_between_reads_are_merged():
+    index = InvertedIndex(["parity"])
+    for n in range(100):
+        index.add(str(n), {"parity": "even" if n % 2 == 0 else "odd"})
+        if n == 50:
+            assert len(index.names(index.match({"parity": ["even"]}))) == 26
+
+    assert index.names(index.match({"parity": ["odd"]})) == [str(n) for n in range(1, 100, 2)]
+
+
+def test_search_filters_items_by_spec():
+    query = Query(items())
+
+    assert query.search({"where": {"pet_type": "cat"}}) == ["tom", "mia"]
+    assert query.search({"where": {"breed": {"in": ["pug"], "null": True}}}) == ["rex", "bob", "mia"]
+    assert query.search({}) == ["rex", "tom", "bob", "mia"]
+
+
+def test_facets_are_counted_and_sorted_as_items_change():
+    index = InvertedIndex.from_items(items())
+
+    assert index.facets() == {"pet_type": [("cat", 2), ("dog", 2)],
+                              "breed": [("pug", 1), ("siamese", 1)]}
+    assert index.missing("breed") == 2
+
+    index.add("zed", {"pet_type": "bird", "breed": "pug"})
+    index.update("bob", {"pet_type": "dog", "breed": "akita"})
+    index.remove("tom")
+
+    assert index.facets() == {"pet_type": [("bird", 1), ("cat", 1), ("dog", 2)],
+                              "breed": [("akita", 1), ("pug", 2)]}
+    assert index.missing("breed") == 1
+    assert index.options() == {"pet_type": ["bird", "cat", "dog"], "breed": ["akita", "pug"]}
+
+
+def test_value_without_items_leaves_the_facets():
+    index = InvertedIndex.from_items(items())
+
+    index.remove("rex")
+
+    assert index.facets()["breed"] == [("siamese", 1)]
+    assert index.missing("unknown") == len(index) == 3
+
+
+def test_filter_form_shows_the_counts():
+    form = Query(items()).make_form()
+
+    breed = next(field for field in form if field["name"] == "breed")
+    assert [choice["name"] for choice in breed["choices"]] == [
+        "[Include pets without breed] (2)", "pug (1)", "siamese (1)"]
@@ -0,0 +1,68 @@
+import gc
+
+from src.observer import NotificationBus, Observer, notification_bus
+
+
+class Recorder(Observer):
+    def __init__(self):
+        self.messages = []
+
+    def update(self, message: str):
+        self.messages.append(message)
+
+
+def test_message_reaches_only_the_topics_subscribers():
+    bus = NotificationBus()
+    ana, bia = Recorder(), Recorder()
+    bus.subscribe(("adopter", "ana"), ana)
+    bus.subscribe(("adopter", "bia"), bia)
+
+    assert bus.publish("hello", ("adopter", "ana"), ("pet", "rex")) == 1
+
+    assert ana.messages == ["hello"] and bia.messages == []
+
+
+def test_subscriber_of_many_topics_gets_the_message_once():
+    bus = NotificationBus()
+    shelter = Recorder()
+    bus.subscribe(("shelter", "s1"), shelter)
+    bus.subscribe(("pet", "rex"), shelter)
+
+    assert bus.publish("new application", ("shelter", "s1"), ("pet", "rex")) == 1
+    assert shelter.messages == ["new application"]
+
+
+def test_unsubscribed_observer_gets_nothing():
+    bus = NotificationBus()
+    ana = Recorder()
+    bus.subscribe(("adopter", "ana"), ana)
+    bus.unsubscribe(("adopter", "ana"), ana)
+    bus.unsubscribe(("adopter", "nobody"), ana)
+
+    assert bus.publish("hello", ("adopter", "ana")) == 0
+    assert ana.messages == [] and bus.subscribers(("adopter", "ana")) == 0
+
+
+def test_subscription_ends_with_the_observer():
+    bus = NotificationBus()
+    kept, dropped = Recorder(), Recorder()
+    bus.subscribe(("pet", "rex"), kept)
+    bus.subscribe(("pet", "rex"), dropped)
+    bus.subscribe(("pet", "tom"), dropped)
+
+    del dropped
+    gc.collect()
+
+    assert bus.subscribers(("pet", "rex")) == 1
+    assert bus.publish("adopted", ("pet", "rex"), ("pet", "tom")) == 1
+    assert kept.messages == ["adopted"]
+
+
+def test_users_get_messages_in_their_inbox(shelter, make_adopter):
+    adopter = make_adopter()
+
+    notification_bus.publish("approved", ("adopter", adopter.username),
+                             ("shelter", shelter.username))
+
+    assert [message for _, message in adopter.inbox.drain()] == ["approved"]
+    assert [message for _, message in shelter.inbox.drain()] == ["approved"]
@@ -0,0 +1,95 @@
+import pytest
+
+from src.query.index import InvertedIndex
+from src.query.percolator import Percolator
+
+
+@pytest.fixture
+def index():
+    index = InvertedIndex(["pet_type", "breed", "city"])
+    for n in range(5):
+        index.add(f"dog{n}", {"pet_type": "dog", "breed": "pug", "city": "Recife"})
+    index.add("cat0", {"pet_type": "cat", "breed": "siamese", "city": "Maceio"})
+    return index
+
+
+@pytest.fixture
+def notified():
+    return []
+
+
+@pytest.fixture
+def percolator(index, notified):
+    return Percolator(index, lambda search, name: notified.append((search.name, name)))
+
+
+def test_new_match_is_notified_once(index, percolator, notified):
+    percolator.save("ana", {"where": {"pet_type": "dog"}}, "dogs")
+
+    index.add("dog5", {"pet_type": "dog", "breed": "pug", "city": "Recife"})
+    index.update("dog5", {"pet_type": "dog", "breed": "beagle", "city": "Recife"})
+    index.add("cat1", {"pet_type": "cat", "breed": "siamese", "city": "Recife"})
+
+    assert notified == [("dogs", "dog5")]
+
+
+def test_paginated_search_doesnt_report_later_pages(index, percolator, notified):
+    percolator.save("ana", {"where": {"pet_type": "dog"}, "limit": 2, "offset": 1}, "dogs")
+
+    # dog4 was past the first page when the search was saved, and still matches
+    index.update("dog4", {"pet_type": "dog", "breed": "pug", "city": "Maceio"})
+
+    assert notified == []
+
+
+def test_item_that_stops_and_starts_matching_is_notified_again(index, percolator, notified):
+    percolator.save("ana", {"where": {"city": "Maceio"}}, "maceio")
+
+    index.update("cat0", {"pet_type": "cat", "breed": "siamese", "city": "Recife"})
+    index.update("cat0", {"pet_type": "cat", "breed": "siamese", "city": "Maceio"})
+
+    assert notified == [("maceio", "cat0")]
+
+
+def test_move_between_wanted_values_is_not_a_new_match(index, percolator, notified):
+    percolator.save("ana", {"where": {"city": ["Maceio", "Recife"]}}, "coast")
+
+    index.update("cat0", {"pet_type": "cat", "breed": "siamese", "city": "Recife"})
+    index.update("dog0", {"pet_type": "dog", "breed": "pug", "city": "Natal"})
+    index.update("dog0", {"pet_type": "dog", "breed": "pug", "city": "Maceio"})
+
+    assert notified == [("coast", "dog0")]
+
+
+def test_listeners_get_old_and_new_values(index):
+    changes = []
+    index.subscribe(lambda row, name, old, new: changes.append(
+        (name, old and old["city"], new and new["city"])))
+
+    index.update("cat0", {"pet_type": "cat", "breed": "siamese", "city": "Recife"})
+    index.add("cat1", {"pet_type": "cat", "breed": "siamese", "city": "Natal"})
+    index.remove("cat1")
+
+    assert changes == [("cat0", "Maceio", "Recife"), ("cat1", None, "Natal"),
+                       ("cat1", "Natal", None)]
+
+
+def test_anchor_is_the_predicate_matching_fewest_items(index, percolator):
+    # both predicates have one value, only one pet is a siamese
+    search = percolator.save("ana", {"where": {"pet_type": "cat", "breed": "siamese"}})
+
+    assert search.id in percolator.candidates({"pet_type": "dog", "breed": "siamese"})
+    assert search.id not in percolator.candidates({"pet_type": "cat", "breed": "pug"})
+
+
+def test_removed_search_is_not_checked(index, percolator, notified):
+    search = percolator.save("ana", {"where": {"pet_type": "dog"}}, "dogs")
+
+    # the counts change, the search is still found where it was filed
+    for n in range(5, 10):
+        index.add(f"cat{n}", {"pet_type": "cat", "breed": "pug", "city": "Recife"})
+    percolator.remove(search.id)
+
+    index.add("dog9", {"pet_type": "dog", "breed": "pug", "city": "Recife"})
+    assert notified == [] and len(percolator) == 0
+    assert percolator.candidates({"pet_type": "dog"}) == set()
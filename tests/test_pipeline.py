@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from src.pipeline import Pipeline
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_jobs_wait_for_their_delay(clock):
+    pipeline = Pipeline(sleep=clock.sleep, clock=clock)
+    ran = []
+    pipeline.submit(ran.append, "late", delay=5)
+
+    assert pipeline.run_due() == 0
+    clock.now = 5
+    assert pipeline.run_due() == 1
+    assert ran == ["late"]
+
+
+def test_jobs_keep_their_order(clock):
+    pipeline = Pipeline(sleep=clock.sleep, clock=clock)
+    ran = []
+    pipeline.submit(ran.append, "first", delay=5)
+    pipeline.submit(ran.append, "second")
+
+    assert pipeline.run_due() == 0
+    pipeline.join()
+    assert ran == ["first", "second"]
+    assert clock.now == 5
+
+
+def test_jobs_run_on_the_calling_thread(clock):
+    pipeline = Pipeline(sleep=clock.sleep, clock=clock)
+    future = pipeline.submit(threading.get_ident)
+
+    pipeline.run_due()
+    assert future.result() == threading.get_ident()
+
+
+def test_failures_are_reported_and_raised_by_join(clock):
+    reported = []
+    pipeline = Pipeline(sleep=clock.sleep, clock=clock, report=reported.append)
+
+    def fail():
+        raise RuntimeError("job failed")
+
+    failed = pipeline.submit(fail)
+    after = pipeline.submit(lambda: "still runs")
+
+    with pytest.raises(RuntimeError):
+        pipeline.join()
+
+    assert after.result() == "still runs"
+    assert [future.exception() for future in reported] == [failed.exception(), None]
+
+
+def test_shutdown_runs_what_is_left_without_waiting(clock):
+    reported = []
+    pipeline = Pipeline(sleep=clock.sleep, clock=clock, report=reported.append)
+
+    def fail():
+        raise RuntimeError("job failed")
+
+    failed = pipeline.submit(fail, delay=3)
+    after = pipeline.submit(lambda: "still runs", delay=5)
+
+    pipeline.shutdown()
+
+    assert clock.now == 0 and len(pipeline) == 0
+    assert after.result() == "still runs"
+    assert [future.exception() for future in reported] == [failed.exception(), None]
@@ -0,0 +1,83 @@
+import pytest
+
+from src.exceptions import InvalidQueryError
+from src.query.index import InvertedIndex, PetIndex
+from src.query.plan import normalize, search
+
+
+def test_sort_and_paging_are_normalized():
+    where, sort, limit, offset = normalize({"sort": ["age", "-breed"], "limit": 10})
+
+    assert sort == (("age", False), ("breed", True))
+    assert (limit, offset) == (10, 0)
+
+
+@pytest.mark.parametrize("spec", [
+    {"limit": "10"},
+    {"limit": 2.5},
+    {"limit": True},
+    {"limit": -1},
+    {"offset": "1"},
+    {"offset": -3},
+    {"sort": "age"},
+    {"sort": ["age", 3]},
+    {"sort": ["-"]},
+    {"sort": [""]},
+])
+def test_malformed_specs_are_rejected(spec):
+    with pytest.raises(InvalidQueryError):
+        normalize(spec)
+
+
+@pytest.mark.parametrize("spec", [
+    ["pet_type"],
+    {"where": ["pet_type", "dog"]},
+    {"where": "dog"},
+    {"where": {1: "dog"}},
+])
+def test_malformed_where_is_rejected(spec):
+    with pytest.raises(InvalidQueryError):
+        normalize(spec)
+
+
+@pytest.fixture
+def pets():
+    index = PetIndex()
+    index.add("rex", {"pet_type": "dog", "birth": "2020-01-01", "breed": "pug"})
+    return index
+
+
+@pytest.mark.parametrize("spec", [
+    {"where": {"age": "x"}},
+    {"where": {"age": 2.5}},
+    {"where": {"age": ["1", "two"]}},
+    {"where": {"age": {"in": ["x"]}}},
+])
+def test_ages_must_be_whole_numbers(pets, spec):
+    with pytest.raises(InvalidQueryError):
+        search(pets, spec)
+
+
+@pytest.mark.parametrize("spec", [
+    {"where": {"name": "rex"}},
+    {"where": {"weight": {"min": 3}}},
+    {"sort": ["name"]},
+    {"sort": ["-weight"]},
+])
+def test_keys_the_index_cant_query_are_rejected(pets, spec):
+    with pytest.raises(InvalidQueryError):
+        search(pets, spec)
+
+
+def test_valid_specs_run_on_the_index(pets):
+    assert search(pets, {"where": {"pet_type": "dog", "age": {"min": 0.5}},
+                         "sort": ["-age", "breed"]}) == ["rex"]
+    assert set(search(pets, {"where": {"age": [1, "2", None]}})) <= {"rex"}
+
+
+def test_generic_index_accepts_its_own_keys():
+    index = InvertedIndex.from_items([{"name": "rex", "size": "small"}])
+
+    assert search(index, {"where": {"size": "small"}, "sort": ["size"]}) == ["rex"]
+    with pytest.raises(InvalidQueryError):
+        search(index, {"where": {"age": 3}})
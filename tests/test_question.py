@@ -0,0 +1,38 @@
+import gc
+
+import pytest
+
+from src.classes import Form, Question
+from src.exceptions import InvalidAnswerError
+
+
+def test_equal_questions_are_the_same_object():
+    first = Question("Do you have a yard", ["yes", "no"], "yes")
+
+    assert Question("Do you have a yard?", ("yes", "no"), "yes") is first
+    assert Question("Do you have a yard?", ("yes", "no"), "no") is not first
+
+
+def test_unused_questions_are_not_kept():
+    key = ("Is anyone allergic to cats?", ("yes", "no"), "no")
+    question = Question(*key)
+    assert Question._Question__interned.get(key) is question
+
+    del question
+    gc.collect()
+    assert Question._Question__interned.get(key) is None
+
+
+def test_form_rejects_questions_that_cant_be_packed(unique):
+    form = Form(unique("form"), register=False)
+    form.add_question("Do you have a yard?", ["yes", "no"], "yes")
+    version = form.version
+
+    with pytest.raises(InvalidAnswerError):
+        form.add_question("Which number is best?", [str(n) for n in range(257)], "1")
+    with pytest.raises(InvalidAnswerError):
+        form.add_question("Do you have other pets?", ["yes", "no"], "maybe")
+    with pytest.raises(InvalidAnswerError):
+        form.set_preferred("Do you have a yard?", "maybe")
+
+    assert form.version is version
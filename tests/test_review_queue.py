@@ -0,0 +1,65 @@
+from src.classes import Application
+from src.review_queue import ReviewQueue
+
+
+class App:
+    def __init__(self, score, submitted):
+        self.score = score
+        self.submitted = submitted
+
+
+def queue_of(*apps):
+    queue = ReviewQueue()
+    for app in apps:
+        queue.add(app)
+    return queue
+
+
+def test_best_score_first_then_earliest_submitted():
+    low, first, second, best = App(0.2, 0), App(0.5, 1), App(0.5, 2), App(0.9, 3)
+    queue = queue_of(second, low, best, first)
+
+    assert list(queue) == [best, first, second, low]
+    assert queue.top(2) == [best, first]
+
+
+def test_remove_takes_out_only_that_application():
+    first, twin, other = App(0.5, 1), App(0.5, 2), App(0.1, 3)
+    queue = queue_of(first, twin, other)
+
+    queue.remove(twin)
+    queue.remove(twin)
+    queue.remove(App(0.5, 1))
+
+    assert list(queue) == [first, other]
+
+
+def test_pages_continue_after_a_reviewed_application():
+    apps = [App(1 - n / 10, n) for n in range(7)]
+    queue = queue_of(*apps)
+
+    first = queue.page(3)
+    assert first == apps[:3]
+
+    # the last one of the page leaves the queue before the next page
+    queue.remove(first[-1])
+
+    assert queue.page(3, after=first[-1]) == apps[3:6]
+    assert queue.page(3, after=apps[5]) == apps[6:]
+    assert queue.page(3, after=apps[6]) == []
+
+
+def test_applications_queue_per_pet_and_per_shelter(shelter, make_pet, make_adopter):
+    rex, bob = make_pet(), make_pet()
+    weak = Application(make_adopter().username, rex.key, rex.form, ["No"])
+    strong = Application(make_adopter().username, rex.key, rex.form, ["Yes"])
+    other = Application(make_adopter().username, bob.key, bob.form, ["Yes"])
+
+    assert list(Application.review_queue(rex.key)) == [strong, weak]
+    assert list(Application.shelter_review_queue(shelter.username)) == [strong, other, weak]
+
+    strong.approve()
+    weak.deny("sorry")
+
+    assert list(Application.review_queue(rex.key)) == []
+    assert list(Application.shelter_review_queue(shelter.username)) == [other]
@@ -0,0 +1,33 @@
+from datetime import date
+
+import pytest
+
+from src.classes import (Address, Answer, Application, Donation, PetProfile,
+                         Question)
+
+
+@pytest.fixture
+def instances(shelter, make_pet, make_adopter):
+    adopter = make_adopter()
+    pet = make_pet()
+    question = Question("Do you have a yard?", ["yes", "no"], "yes")
+
+    return [
+        question,
+        Answer(question, "no"),
+        Address("Rua A", "Centro", "10", 57000000, "Maceio", "AL"),
+        PetProfile("Rex", date(2020, 1, 1), breed="pug", color="black"),
+        Donation(adopter.username, shelter.username, 5.0, date(2024, 1, 1)),
+        Application(adopter.username, pet.key, pet.form, ["Yes"]),
+    ]
+
+
+def test_small_objects_have_no_instance_dict(instances):
+    for instance in instances:
+        assert not hasattr(instance, "__dict__"), type(instance).__name__
+
+
+def test_small_objects_refuse_unknown_attributes(instances):
+    for instance in instances:
+        with pytest.raises(AttributeError):
+            instance.misspelled = 1
@@ -0,0 +1,88 @@
+import pytest
+
+from src.classes import Application
+from src.exceptions import ApplicationAlreadyExistsError, InvalidFormError
+from src.mediator import ConcreteAdoptionMediator
+
+
+@pytest.fixture
+def pet(make_pet):
+    pet = make_pet()
+    pet.form.add_question("Do you have a yard?", ["yes", "no"], "yes")
+    return pet
+
+
+def test_scores_every_submission(pet, make_adopter):
+    first, second = make_adopter().username, make_adopter().username
+
+    apps = Application.submit_many(pet.key, pet.form, [
+        (first, ["Yes", "yes"]), (second, ["Yes", "no"])])
+
+    assert [app.score for app in apps] == [1.0, 0.5]
+    assert [app.answers for app in apps] == [["Yes", "yes"], ["Yes", "no"]]
+    assert [app.applicant for app in Application.review_queue(pet.key)] == [first, second]
+
+
+def test_applicant_repeated_in_the_batch_files_nothing(pet, make_adopter):
+    first, second = make_adopter().username, make_adopter().username
+
+    with pytest.raises(ApplicationAlreadyExistsError):
+        Application.submit_many(pet.key, pet.form, [
+            (first, ["Yes", "yes"]), (second, ["Yes", "yes"]), (first, ["No", "no"])])
+
+    assert Application.get_apps_pet(pet.key) == []
+    assert len(Application.review_queue(pet.key)) == 0
+
+
+def test_applicant_who_already_applied_files_nothing(pet, make_adopter):
+    first, second = make_adopter().username, make_adopter().username
+    Application(first, pet.key, pet.form, ["Yes", "yes"])
+
+    with pytest.raises(ApplicationAlreadyExistsError):
+        Application.submit_many(pet.key, pet.form, [
+            (second, ["Yes", "yes"]), (first, ["Yes", "no"])])
+
+    assert [app.applicant for app in Application.get_apps_pet(pet.key)] == [first]
+
+
+def test_invalid_answers_file_nothing(pet, make_adopter):
+    with pytest.raises(InvalidFormError):
+        Application.submit_many(pet.key, pet.form, [
+            (make_adopter().username, ["Yes", "yes"]), (make_adopter().username, ["Yes"])])
+
+    assert Application.get_apps_pet(pet.key) == []
+
+
+class Bus:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, message, *topics):
+        self.published.append((message, topics))
+        return 0
+
+
+def test_mediator_files_a_batch_with_counts_and_notifications(pet, make_adopter):
+    mediator = ConcreteAdoptionMediator()
+    mediator.notifier = Bus()
+    first, second = make_adopter(), make_adopter()
+
+    apps = mediator.create_applications(pet.key, [
+        (first.username, ["Yes", "yes"]), (second.username, ["Yes", "no"])])
+    mediator.create_application(make_adopter().username, pet.key, ["No", "no"])
+
+    assert [app.score for app in apps] == [1.0, 0.5]
+    assert pet.applications == len(Application.get_apps_pet(pet.key)) == 3
+    adopters = [topics[0] for _, topics in mediator.notifier.published if topics[0][0] == "adopter"]
+    assert adopters[:2] == [("adopter", first.username), ("adopter", second.username)]
+    assert len(mediator.notifier.published) == 6
+
+
+def test_mediator_rejects_unknown_adopters_before_filing(pet, make_adopter):
+    mediator = ConcreteAdoptionMediator()
+
+    with pytest.raises(ValueError):
+        mediator.create_applications(pet.key, [
+            (make_adopter().username, ["Yes", "yes"]), ("nobody", ["Yes", "yes"])])
+
+    assert Application.get_apps_pet(pet.key) == [] and pet.applications == 0
@@ -0,0 +1,62 @@
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+
+from src.classes import Adopter
+from src.search.trie import PrefixTrie
+from src.ui.completer import TrieCompleter
+
+
+def trie(*names):
+    trie = PrefixTrie()
+    for name in names:
+        trie.insert(name)
+    return trie
+
+
+def test_completes_in_order_ignoring_case():
+    names = trie("Rex", "rexy", "Bob", "bobby", "robin", "ro")
+
+    assert names.complete("re") == ["Rex", "rexy"]
+    assert names.complete("BO") == ["Bob", "bobby"]
+    assert names.complete("r") == ["Rex", "rexy", "ro", "robin"]
+    assert names.complete("") == ["Bob", "bobby", "Rex", "rexy", "ro", "robin"]
+    assert names.complete("x") == []
+
+
+def test_prefix_ending_halfway_into_an_edge():
+    names = trie("alexandra", "alexander")
+
+    assert names.complete("alexa") == ["alexander", "alexandra"]
+    assert names.complete("alexo") == []
+    assert "alexa" not in names
+
+
+def test_completion_stops_at_the_limit():
+    names = trie(*(f"pet{n:03}" for n in range(500)))
+
+    assert names.complete("pet", limit=3) == ["pet000", "pet001", "pet002"]
+    assert names.complete("pet49", limit=20) == [f"pet{n}" for n in range(490, 500)]
+
+
+def test_names_differing_in_case_are_kept_apart():
+    names = trie("Rex", "rex", "Rex")
+
+    assert len(names) == 2
+    assert "Rex" in names and "rex" in names and "REX" not in names
+    assert names.complete("rex") == ["Rex", "rex"]
+
+
+def test_completer_replaces_the_typed_text():
+    completer = TrieCompleter(trie("Rex", "rexy", "bob"), limit=1, meta=str.upper)
+
+    completions = list(completer.get_completions(Document("rE"), CompleteEvent()))
+
+    assert [(c.text, c.start_position, c.display_meta_text) for c in completions] == [
+        ("Rex", -2, "REX")]
+
+
+def test_registered_users_can_be_completed(unique):
+    username = unique("trie_adopter")
+    Adopter(username, "Test Adopter")
+
+    assert Adopter.prefixes.complete(username) == [username]
@@ -0,0 +1,170 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# every run starts a new interpreter, as a restart of the program would
+OPEN = """
+import json, sys
+from src.wal import MODELS, WriteAheadLog
+wal = WriteAheadLog(path=sys.argv[1], snapshot_every=int(sys.argv[2]), interval=0.01)
+restored = wal.open()
+"""
+
+CHANGES = """
+import initial_info
+from src.classes import Application, Event, Pet, Post, Shelter
+from src.mediator import ConcreteAdoptionMediator
+from src.pipeline import Pipeline
+
+initial_info.create_data()
+
+pet = Pet.data["shiro"]
+pet.profile.name = "Shiro II"
+pet.form.add_question("Do you have a yard?", ["yes", "no"], "yes")
+next(iter(Event.data.values())).cancel()
+
+post = next(iter(Post.data.values()))
+post.like("wgcv")
+post.like("gio")
+post.dislike("wgcv")
+
+mediator = ConcreteAdoptionMediator(Pipeline(sleep=lambda seconds: None))
+mediator.feedback_sender.send_many = lambda records: None
+mediator.approve_and_deny_rest(Application.data["shiro-wgcv"], "sorry $adopter")
+Shelter.data["csf"].add_allowed_pet_type("cat")
+"""
+
+STATE = """
+from src.classes import Application, Pet
+state = {f"{name}:{key}": [str(line) for line in model.formatted_list()] + [str(model)]
+         for name, cls in MODELS.items() for key, model in cls.data.items()}
+state["applications"] = {key: [app.status, app.feedback, app.score, app.answers, app.submitted]
+                         for key, app in Application.data.items()}
+state["tutor"] = Pet.data["shiro"].tutor.username
+state["form"] = [question.name for question in Pet.data["shiro"].form]
+state["queues"] = {pet: [app.key for app in Application.review_queue(pet)] for pet in Pet.data}
+wal.close()
+print(json.dumps({"restored": restored, "state": state}, default=str))
+"""
+
+
+def run(code: str, path, snapshot_every: int = 10_000) -> dict:
+    script = textwrap.dedent(code)
+    result = subprocess.run([sys.executable, "-c", script, str(path), str(snapshot_every)],
+                            cwd=path.parent, env={**os.environ, "PYTHONPATH": ROOT},
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.fixture
+def path(workdir):
+    return workdir / "adoptions.wal"
+
+
+def test_log_is_replayed_after_a_restart(path):
+    written = run(OPEN + CHANGES + STATE, path)
+    restored = run(OPEN + STATE, path)
+
+    assert written["restored"] == 0
+    assert restored["restored"] > 0
+    assert restored["state"] == written["state"]
+
+
+def test_snapshot_and_tail_are_replayed_after_a_restart(path):
+    written = run(OPEN + CHANGES + STATE, path, snapshot_every=7)
+
+    snapshot = path.with_name("adoptions.wal.snapshot")
+    assert snapshot.exists()
+    with open(snapshot) as file:
+        covered = json.loads(file.readline())["lsn"]
+    with open(path) as log:
+        assert all(json.loads(line)[0] > covered for line in log)
+
+    restored = run(OPEN + STATE, path, snapshot_every=7)
+    assert restored["state"] == written["state"]
+
+
+def test_torn_last_line_is_dropped(path):
+    written = run(OPEN + CHANGES + STATE, path)
+    with open(path, "ab") as log:
+        log.write(b'[999, "Pet", "shiro", "sta')
+
+    restored = run(OPEN + STATE, path)
+    assert restored["state"] == written["state"]
+    assert path.read_bytes().endswith(b"\n")
+
+
+def test_changes_logged_after_the_snapshot_started_replay_idempotently(shelter, unique):
+    from src.classes import Post
+
+    post = Post(shelter, "forum", unique("post "), "content")
+    post.like("ana")
+
+    # the snapshot already has the like, and the log has it again
+    post._apply("likes", ("ana",))
+    post._apply("likes+", "ana")
+    shelter._apply("allowed_pet_types+", "dog")
+
+    assert post.likes == 1
+    assert shelter.allowed_pet_types == "dog"
+
+
+def test_restored_application_keeps_its_submission_order(make_pet, make_adopter):
+    from src.classes import Application
+
+    pet = make_pet()
+    values = {"applicant": make_adopter().username, "pet": pet.key,
+              "version": pet.form.version, "answers": b"\x00",
+              "score": 1.0, "submitted": 10_000}
+
+    restored = Application._create(f"{pet.key}-{values['applicant']}", values)
+    later = Application(make_adopter().username, pet.key, pet.form, ["Yes"])
+
+    assert restored.submitted == 10_000
+    assert later.submitted > restored.submitted
+
+
+def test_form_versions_are_logged_once(path):
+    run(OPEN + CHANGES + """
+for app in list(Application.data.values()):
+    Application.rescore(app.pet)
+""" + STATE, path)
+
+    forms = [json.loads(line) for line in path.with_name("adoptions.wal.forms").open()]
+    assert [form_id for form_id, _ in forms] == list(range(len(forms)))
+    # no version is written twice
+    assert len({json.dumps(questions) for _, questions in forms}) == len(forms)
+
+    with open(path) as log:
+        lines = [json.loads(line) for line in log]
+    applications = [line for line in lines if line[1] == "Application"]
+    assert applications
+    # applications refer to the versions, the questions aren't repeated
+    assert all("$question" not in json.dumps(line) for line in applications)
+    assert all(line[4]["version"]["$form"] < len(forms)
+               for line in applications if line[3] is None)
+
+
+def test_form_versions_survive_restarts_and_snapshots(path):
+    written = run(OPEN + CHANGES + STATE, path, snapshot_every=7)
+    forms = path.with_name("adoptions.wal.forms").read_text()
+
+    restored = run(OPEN + """
+from src.classes import Application, Pet
+pet = Pet.data["becky"]
+question = pet.form.version[0]
+pet.form.set_preferred(question.name, question.options[1])
+Application.rescore("becky")
+""" + STATE, path, snapshot_every=7)
+    again = run(OPEN + STATE, path, snapshot_every=7)
+
+    assert restored["state"]["applications"] != written["state"]["applications"]
+    assert again["state"] == restored["state"]
+    # versions logged before are found again, only the new one is added
+    assert path.with_name("adoptions.wal.forms").read_text().startswith(forms)